@@ -1,18 +1,22 @@
 # backend/app/app.py
-from flask import Flask,request,jsonify
+# 앱 팩토리. import 시점에는 앱을 만들지 않는다 (wsgi.py / run.py / 스크립트가 create_app() 을 부른다)
+# 라우터/모델/캐시 모듈은 create_app() 안에서 import → 워커 준비 시간, DB 연결 시점은 팩토리 호출에만 묶인다
+import time
+
+from flask import Flask
 from flask_cors import CORS
+
+from . import config
 from .db import db, init_db
-from .routers.auth import bp as auth_bp
-from .routers.shelters import bp as shelters_bp
-from .routers.reviews import bp as reviews_bp
-from .routers.addshelter import bp_shelter as addshelters_bp
-from .routers.favorites import bp as favorites_bp
-from .config import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_TRACK_MODIFICATIONS
-
-def create_app():
+
+
+def create_app(overrides: dict | None = None):
+    """overrides: config.py 값 위에 덮어쓸 설정 (예: wsgi.py 의 {"DB_CREATE_ALL": False})"""
+    started = time.perf_counter()
     app = Flask(__name__)
-    app.config["SQLALCHEMY_DATABASE_URI"] = SQLALCHEMY_DATABASE_URI
+    app.config.from_object(config)  # config.py의 대문자 설정 전체 (인덱스/캐시 등)
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config.update(overrides or {})
 
     # 개발 프론트 주소에 맞게 origins를 넣어주세요.
     CORS(
@@ -26,20 +30,65 @@ def create_app():
     init_db(app)
 
     # 모델 등록 보장
-    from .models import user, shelter_review  # noqa: F401
+    from .models import user, favorite, shelter_extra, shelter_review, shelter_review_stats, shelter_canonical, shelter_catalog  # noqa: F401
+
+    # 개발 편의용. 운영은 DB_CREATE_ALL=0 + `python -m backend.app.db.create_schema` 로 따로 실행
+    if app.config.get("DB_CREATE_ALL", True):
+        with app.app_context():
+            db.create_all()
+
+    from .utils.spatial_index import spatial_index
+    from .utils.nearby_cache import nearby_cache
+    from .utils.parallel_nearby import parallel_nearby
+    from .utils.cluster_index import cluster_index
+    from .utils.dedup import canonical_map
+    from .utils.catalog import catalog
+    from .utils.ranking import ranker
+    from .utils.review_writer import review_writer
+    from .utils.metrics import metrics
+    from .utils.http_pipeline import pipeline
+    from .utils.schema_registry import schema_registry
+    from .utils.table_watch import table_watch
+
+    spatial_index.init_app(app)  # 켜져 있으면 시작 시 전체 적재
+    nearby_cache.init_app(app)
+    parallel_nearby.init_app(app)
+    cluster_index.init_app(app)  # 켜져 있으면 스냅샷 적재 또는 빌드
+    canonical_map.init_app(app)  # 중복 쉼터 매핑 (build_canonical 결과)
+    catalog.init_app(app)  # 통합 카탈로그 읽기 여부 (table_watch 틱마다 워터마크 확인)
+    ranker.init_app(app)  # nearby ?rank=1 가중치
+    review_writer.init_app(app)  # 켜져 있으면 리뷰를 모아서 커밋 (첫 리뷰 때 스레드 시작)
+    table_watch.init_app(app)  # 테이블 변경 감시 (구독자가 있으면 첫 요청 때 스레드 시작)
+
+    metrics.init_app(app)  # 요청/SQL 계측 + /metrics
+    metrics.register_collector("schema_registry", schema_registry.stats)
+    metrics.register_collector("nearby_cache", nearby_cache.stats)
+    metrics.register_collector("spatial_index", spatial_index.stats)
+    metrics.register_collector("table_watch", table_watch.stats)
+    metrics.register_collector("cluster_index", cluster_index.stats)
+    metrics.register_collector("canonical_map", canonical_map.stats)
+    metrics.register_collector("catalog", catalog.stats)
+    metrics.register_collector("review_writer", review_writer.stats)
+    # metrics 다음에 등록 → after_request 는 역순이라 압축이 먼저, metrics 는 압축 후 크기를 본다
+    pipeline.init_app(app)
 
-    with app.app_context():
-        db.create_all()
+    from .routers.auth import bp as auth_bp
+    from .routers.shelters import bp as shelters_bp
+    from .routers.reviews import bp as reviews_bp
+    from .routers.addshelter import bp_shelter as addshelters_bp
+    from .routers.favorites import bp as favorites_bp
 
     app.register_blueprint(auth_bp, url_prefix="/auth")  # 인증 기능
-    app.register_blueprint(shelters_bp)  # 쉼터 조회 기능 
+    app.register_blueprint(shelters_bp)  # 쉼터 조회 기능
     app.register_blueprint(reviews_bp)   # 리뷰 기능
     app.register_blueprint(addshelters_bp)  # 쉼터 추가 기능
-    app.register_blueprint(favorites_bp)    # 즐겨찾기 기능 
+    app.register_blueprint(favorites_bp)    # 즐겨찾기 기능
 
+    app.config["STARTUP_SECONDS"] = time.perf_counter() - started
+    metrics.register_collector("startup", lambda: {"seconds": app.config["STARTUP_SECONDS"]})
+    app.logger.info("app ready in %.1f ms", app.config["STARTUP_SECONDS"] * 1000)
     return app
 
-app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
@@ -21,7 +21,144 @@ def _build_db_url():
 SQLALCHEMY_DATABASE_URI = _build_db_url()
 SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+# 2) 커넥션 풀. 모든 엔진(primary/replica)에 공통 적용
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))      # 풀 고갈 시 대기(초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))    # MySQL wait_timeout 보다 짧게
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"   # 끊긴 연결을 체크아웃 시 걸러냄
+
+def _engine_options(url: str) -> dict:
+    opts = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    if not url.startswith("sqlite"):  # sqlite 풀은 크기 옵션을 받지 않는다
+        opts.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    return opts
+
+SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+
+# 3) 읽기 복제본. 있으면 @read_replica 라우트(nearby/detail/리뷰·즐겨찾기 목록)의 SELECT 가 여기로
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "")
+SQLALCHEMY_BINDS = (
+    {"replica": {"url": DATABASE_REPLICA_URL, **_engine_options(DATABASE_REPLICA_URL)}}
+    if DATABASE_REPLICA_URL else {}
+)
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))  # 쓴 user 는 이 시간 동안 primary 에서 읽음
+# "최근에 쓴 user" 기록: memory(개발/단일 워커) | redis(운영, 워커 여럿 — 다음 요청이 다른 워커로 가도 보임) | fakeredis
+DB_REPLICA_STICKY_BACKEND = os.getenv("DB_REPLICA_STICKY_BACKEND", "memory")
+DB_REPLICA_STICKY_REDIS_URL = os.getenv("DB_REPLICA_STICKY_REDIS_URL",
+                                        os.getenv("NEARBY_CACHE_REDIS_URL", "redis://localhost:6379/0"))
+# 앱 시작 시 db.create_all() (개발용). 운영(wsgi.py)은 끄고 create_schema 명령으로 따로 실행
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "1") == "1"
+
 JWT_SECRET = os.getenv("JWT_SECRET", "change-this-to-a-long-random-secret")
 JWT_ALGORITHM = "HS256"
 JWT_ACCESS_TTL_SECONDS = 60 * 60 * 2      # 2시간
-JWT_REFRESH_TTL_SECONDS = 60 * 60 * 24*7  # 7일
\ No newline at end of file
+JWT_REFRESH_TTL_SECONDS = 60 * 60 * 24*7  # 7일
+
+# 인증 캐시: 디코딩된 토큰 claims / User 행 (프로세스 내 LRU+TTL)
+AUTH_CLAIMS_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CLAIMS_CACHE_TTL_SECONDS", "60"))
+AUTH_CLAIMS_CACHE_SIZE = int(os.getenv("AUTH_CLAIMS_CACHE_SIZE", "10000"))
+AUTH_USER_CACHE_TTL_SECONDS = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "300"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+# 1이면 user id만 필요한 라우트도 매 요청 User 존재를 확인 (엄격 모드)
+AUTH_ALWAYS_LOAD_USER = os.getenv("AUTH_ALWAYS_LOAD_USER", "0") == "1"
+
+# 인메모리 공간 인덱스 (/shelters/nearby). 끄면 항상 SQL(union_all) 경로
+SPATIAL_INDEX_ENABLED = os.getenv("SPATIAL_INDEX_ENABLED", "0") == "1"
+SPATIAL_INDEX_MAX_AGE_SECONDS = int(os.getenv("SPATIAL_INDEX_MAX_AGE_SECONDS", "3600"))  # 이보다 오래되면 SQL 폴백 + 백그라운드 재적재
+SPATIAL_INDEX_CELL_DEG = float(os.getenv("SPATIAL_INDEX_CELL_DEG", "0.01"))  # 격자 한 칸 ≈ 1.1km
+# 쉼터 테이블 변경 감시 주기 (워커마다 백그라운드 스레드, utils/table_watch.py). 이 주기로 kind별 MAX(id)를 읽어
+# 다른 워커가 추가한 쉼터를 공간 인덱스에 반영하고, 카탈로그 워터마크와 비교한다. 컬럼이 바뀐 테이블은
+# 스키마 캐시(리플렉션/nearby 문장)를 비운다
+# (그 사이엔 최대 이 시간만큼 늦게 보임, 0 이면 첫 요청 때 한 번만)
+TABLE_WATCH_SECONDS = float(os.getenv("TABLE_WATCH_SECONDS", "5"))
+
+# nearby 타일 캐시. 백엔드: memory(기본, 개발/단일 워커) | redis(운영, 워커 여럿) | fakeredis(로컬 대역)
+# memory 는 워커마다 따로라 다른 워커의 /add_shelter 무효화를 못 본다 (최대 TTL 동안 옛 결과)
+NEARBY_CACHE_ENABLED = os.getenv("NEARBY_CACHE_ENABLED", "0") == "1"
+NEARBY_CACHE_BACKEND = os.getenv("NEARBY_CACHE_BACKEND", "memory")
+NEARBY_CACHE_REDIS_URL = os.getenv("NEARBY_CACHE_REDIS_URL", "redis://localhost:6379/0")
+NEARBY_CACHE_TTL_SECONDS = int(os.getenv("NEARBY_CACHE_TTL_SECONDS", "300"))
+NEARBY_CACHE_MAX_TILES = int(os.getenv("NEARBY_CACHE_MAX_TILES", "4096"))  # memory 백엔드 LRU 크기
+NEARBY_CACHE_TILE_DEG = float(os.getenv("NEARBY_CACHE_TILE_DEG", "0.01"))
+NEARBY_CACHE_MAX_RADIUS_M = float(os.getenv("NEARBY_CACHE_MAX_RADIUS_M", "3000"))  # 이보다 큰 반경은 캐시 우회
+NEARBY_CACHE_SUPERSET_LIMIT = int(os.getenv("NEARBY_CACHE_SUPERSET_LIMIT", "2000"))
+
+# nearby SQL 실행 방식: union(한 문장 union_all) | parallel(kind별 동시 실행 + 마감 시간, 부분 결과)
+NEARBY_EXEC_MODE = os.getenv("NEARBY_EXEC_MODE", "union")
+NEARBY_KIND_TIMEOUT_MS = int(os.getenv("NEARBY_KIND_TIMEOUT_MS", "800"))  # 요청 예산. 넘긴 kind는 timeout
+NEARBY_PARALLEL_WORKERS = int(os.getenv("NEARBY_PARALLEL_WORKERS", "8"))  # 풀 크기(DB_POOL_SIZE) 이하로
+NEARBY_QUEUE_TIMEOUT_MS = int(os.getenv("NEARBY_QUEUE_TIMEOUT_MS", "1000"))  # 워커 풀 대기 한도 (KIND_TIMEOUT 은 시작 후부터)
+
+# 쉼터 상세 (/shelters/detail, /shelters/details)
+DETAIL_CACHE_TTL_SECONDS = int(os.getenv("DETAIL_CACHE_TTL_SECONDS", "60"))  # SHELTER_CACHE_MAX_AGE 와 같게: 적재 후 최대 이만큼 옛 값
+DETAIL_CACHE_SIZE = int(os.getenv("DETAIL_CACHE_SIZE", "50000"))
+DETAIL_BATCH_MAX_KEYS = int(os.getenv("DETAIL_BATCH_MAX_KEYS", "200"))
+
+# POST /shelters/nearby/batch
+NEARBY_BATCH_MAX_POINTS = int(os.getenv("NEARBY_BATCH_MAX_POINTS", "200"))
+NEARBY_BATCH_MAX_GROUP_M = float(os.getenv("NEARBY_BATCH_MAX_GROUP_M", "5000"))  # 후보를 같이 가져올 묶음의 최대 반경
+NEARBY_BATCH_CANDIDATE_CAP = int(os.getenv("NEARBY_BATCH_CANDIDATE_CAP", "5000"))  # 묶음당 후보 상한
+
+# 계측 (/metrics, /metrics/slow, /metrics/profiles)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")  # 있으면 Authorization: Bearer <token> 필요. 없으면 /metrics/slow, /metrics/profiles 는 404
+METRICS_SLOW_QUERY_MS = float(os.getenv("METRICS_SLOW_QUERY_MS", "200"))
+METRICS_SLOW_QUERY_PARAMS = os.getenv("METRICS_SLOW_QUERY_PARAMS", "0") == "1"  # 1이면 느린 쿼리 샘플에 바인드 값까지 (비밀번호 등 개인정보 주의)
+METRICS_SLOW_QUERY_SAMPLES = int(os.getenv("METRICS_SLOW_QUERY_SAMPLES", "50"))  # 최근 N개만 보관
+METRICS_PROFILE_SAMPLE_RATE = float(os.getenv("METRICS_PROFILE_SAMPLE_RATE", "0"))  # 0~1, 요청 단위 cProfile
+METRICS_PROFILE_HEADER = os.getenv("METRICS_PROFILE_HEADER", "0") == "1"  # 1이면 X-Profile: 1 요청도 프로파일
+METRICS_PROFILE_KEEP = int(os.getenv("METRICS_PROFILE_KEEP", "20"))
+
+# 응답 파이프라인: orjson 인코딩(설치돼 있으면), gzip/br 압축, 쉼터 조회 GET 의 Cache-Control
+JSON_FAST_ENCODER = os.getenv("JSON_FAST_ENCODER", "1") == "1"
+COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "1") == "1"
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_BR_QUALITY = int(os.getenv("COMPRESS_BR_QUALITY", "4"))  # 0~11, 동적 응답은 낮게
+SHELTER_CACHE_MAX_AGE = int(os.getenv("SHELTER_CACHE_MAX_AGE", "60"))  # nearby/detail/details 의 max-age(초)
+
+# GET /shelters/export (스트리밍, 서버 사이드 커서에서 한 번에 꺼내는 행 수 = ndjson chunk / packed frame 크기)
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", "1000"))
+
+# 클러스터 인덱스 (/shelters/clusters). 켜면 시작 시 스냅샷 적재 또는 DB 에서 빌드
+CLUSTER_INDEX_ENABLED = os.getenv("CLUSTER_INDEX_ENABLED", "0") == "1"
+CLUSTER_SNAPSHOT_PATH = os.getenv("CLUSTER_SNAPSHOT_PATH", "")  # build_clusters 가 만든 파일 (없으면 DB 에서 빌드)
+CLUSTER_MIN_ZOOM = int(os.getenv("CLUSTER_MIN_ZOOM", "0"))
+CLUSTER_MAX_ZOOM = int(os.getenv("CLUSTER_MAX_ZOOM", "16"))  # 이보다 확대하면 원본 점
+CLUSTER_RADIUS_PX = float(os.getenv("CLUSTER_RADIUS_PX", "60"))  # 타일 좌표계(CLUSTER_EXTENT) 기준 반경
+CLUSTER_EXTENT = int(os.getenv("CLUSTER_EXTENT", "512"))
+CLUSTER_MAX_ITEMS = int(os.getenv("CLUSTER_MAX_ITEMS", "2000"))  # kind별 응답 상한 (넘으면 큰 클러스터부터)
+
+# 데이터셋 간 중복 쉼터 (build_canonical → shelter_canonical, /shelters/nearby 에서 합치기)
+DEDUP_RADIUS_M = float(os.getenv("DEDUP_RADIUS_M", "50"))     # 같은 시설로 볼 최대 거리
+DEDUP_MIN_SCORE = float(os.getenv("DEDUP_MIN_SCORE", "0.8"))   # 정규화한 이름/도로명주소 유사도 하한
+NEARBY_DEDUP_ENABLED = os.getenv("NEARBY_DEDUP_ENABLED", "1") == "1"  # 매핑을 메모리에 적재
+NEARBY_DEDUP_DEFAULT = os.getenv("NEARBY_DEDUP_DEFAULT", "1") == "1"  # ?dedupe= 가 없을 때
+NEARBY_DEDUP_OVERFETCH = float(os.getenv("NEARBY_DEDUP_OVERFETCH", "2"))  # 합칠 몫만큼 limit 배수로 더 가져옴
+NEARBY_DEDUP_RELOAD_SECONDS = int(os.getenv("NEARBY_DEDUP_RELOAD_SECONDS", "3600"))
+
+# 통합 쉼터 카탈로그 (shelters_all). 동기화된 kind 만 nearby/detail/favorites 가 카탈로그 한 쿼리로 읽는다
+CATALOG_READS = os.getenv("CATALOG_READS", "1") == "1"
+
+# POST /favorites/sync (한 요청에 담을 수 있는 add/remove 항목 수)
+FAVORITES_SYNC_MAX_ITEMS = int(os.getenv("FAVORITES_SYNC_MAX_ITEMS", "200"))
+
+# 운영시간 필터 (?open_now=1 / ?open_at=ISO 시각). 카탈로그가 있으면 SQL 조건, 없으면 limit 배수만큼 더 가져와서 거름
+NEARBY_OPEN_OVERFETCH = int(os.getenv("NEARBY_OPEN_OVERFETCH", "5"))
+
+# nearby ?rank=1 개인화 점수 (utils/ranking.py). 가중치는 "특성=값" 목록, 빠진 특성은 0
+RANKING_WEIGHTS = os.getenv("RANKING_WEIGHTS", "distance=0.4,rating=0.2,comfort=0.1,hvac=0.1,capacity=0.1,kind=0.1")
+RANKING_CANDIDATE_FACTOR = int(os.getenv("RANKING_CANDIDATE_FACTOR", "4"))  # limit 의 몇 배를 후보로
+RANKING_MAX_CANDIDATES = int(os.getenv("RANKING_MAX_CANDIDATES", "200"))
+RANKING_PRIOR_REVIEWS = float(os.getenv("RANKING_PRIOR_REVIEWS", "3"))  # 리뷰가 이 정도 쌓여야 사전값만큼 반영
+RANKING_PRIOR_RATING = float(os.getenv("RANKING_PRIOR_RATING", "3.5"))
+RANKING_CAPACITY_REF = int(os.getenv("RANKING_CAPACITY_REF", "100"))  # 이 인원 이상이면 수용인원 점수 1
+
+# 리뷰 쓰기 버퍼 (utils/review_writer.py). 켜면 create_review 가 배치로 모아 커밋
+REVIEW_WRITE_BEHIND = os.getenv("REVIEW_WRITE_BEHIND", "0") == "1"
+REVIEW_ACK = os.getenv("REVIEW_ACK", "commit")  # commit: 커밋 후 201 / queued: 큐에 넣고 바로 202
+REVIEW_BATCH_SIZE = int(os.getenv("REVIEW_BATCH_SIZE", "100"))
+REVIEW_FLUSH_MS = int(os.getenv("REVIEW_FLUSH_MS", "5"))  # 배치가 안 차도 첫 행이 이만큼 기다리면 커밋
+REVIEW_ACK_TIMEOUT_MS = int(os.getenv("REVIEW_ACK_TIMEOUT_MS", "5000"))  # commit 모드에서 기다리는 최대 시간 (넘으면 202)
+REVIEW_QUEUE_MAX = int(os.getenv("REVIEW_QUEUE_MAX", "10000"))  # 넘으면 그 요청은 동기 경로
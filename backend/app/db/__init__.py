@@ -1,9 +1,13 @@
 # backend/app/db/__init__.py
 from flask_sqlalchemy import SQLAlchemy
-db = SQLAlchemy()
+from . import routing
+
+# RoutingSession: @read_replica 뷰의 SELECT 는 replica bind 로 (설정돼 있을 때만)
+db = SQLAlchemy(session_options={"class_": routing.RoutingSession})
 
 def init_db(app):
     app.config.setdefault("SQLALCHEMY_TRACK_MODIFICATIONS", False)
     db.init_app(app)  # 여기서만 앱에 바인딩!!!
+    routing.init_app(app, db)
 
 __all__ = ["db", "init_db"]
\ No newline at end of file
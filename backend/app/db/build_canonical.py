@@ -0,0 +1,64 @@
+"""데이터셋 간 중복 쉼터를 찾아 shelter_canonical 매핑을 다시 만드는 스크립트
+
+heat/climate/finedust 등에 같은 시설이 겹쳐 있으면 /shelters/nearby 가 하나로 합쳐 보여준다.
+원본 데이터를 다시 적재(ingest)한 뒤 실행. 실행 중인 앱은 NEARBY_DEDUP_RELOAD_SECONDS 안에 새 매핑을 읽는다.
+    python -m backend.app.db.build_canonical
+    python -m backend.app.db.build_canonical --radius-m 30 --min-score 0.85 --dry-run
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+
+from ..config import DEDUP_MIN_SCORE, DEDUP_RADIUS_M, SQLALCHEMY_DATABASE_URI
+from ..models.shelter_canonical import ShelterCanonical
+from ..models.shelters_map import KIND_TO_TABLE
+from ..utils.dedup import find_duplicates, replace_mapping
+from ..utils.shelter_export import EXPORT, WORLD_BBOX
+
+
+def load_points(conn, kinds) -> list[dict]:
+    points = []
+    existing = set(inspect(conn).get_table_names())
+    for kind in kinds:
+        if KIND_TO_TABLE[kind] not in existing:
+            print(f"{kind}: 테이블 없음, 건너뜀")
+            continue
+        for r in conn.execute(EXPORT[kind], WORLD_BBOX).mappings():
+            if r["latitude"] is None or r["longitude"] is None or r["id"] is None:
+                continue
+            points.append({"kind": kind, **r, "latitude": float(r["latitude"]), "longitude": float(r["longitude"])})
+    return points
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="중복 쉼터 → 대표 쉼터 매핑 재생성")
+    ap.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URI)
+    ap.add_argument("--radius-m", type=float, default=DEDUP_RADIUS_M, help="같은 시설로 볼 최대 거리")
+    ap.add_argument("--min-score", type=float, default=DEDUP_MIN_SCORE, help="이름/주소 유사도 하한 (0~1)")
+    ap.add_argument("--kinds", nargs="*", default=list(KIND_TO_TABLE), choices=list(KIND_TO_TABLE))
+    ap.add_argument("--dry-run", action="store_true", help="저장하지 않고 통계만 출력")
+    args = ap.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    ShelterCanonical.__table__.create(engine, checkfirst=True)
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        points = load_points(conn, args.kinds)
+    rows = find_duplicates(points, args.radius_m, args.min_score)
+    groups = Counter((r["canonical_type"], r["canonical_id"]) for r in rows)
+    print(f"쉼터 {len(points)}곳 중 {len(rows)}곳이 중복 묶음 {len(groups)}개에 속함")
+    print("kind별:", dict(Counter(r["shelter_type"] for r in rows)))
+    if not args.dry_run:
+        with Session(engine) as session, session.begin():
+            replace_mapping(session, rows)
+    print(f"완료 ({time.perf_counter() - started:.2f}s)" + (" (dry-run)" if args.dry_run else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
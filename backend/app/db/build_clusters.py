@@ -0,0 +1,42 @@
+"""쉼터 테이블에서 클러스터 인덱스(/shelters/clusters)를 만들어 스냅샷 파일로 저장하는 스크립트
+
+앱은 CLUSTER_SNAPSHOT_PATH 의 스냅샷을 시작 시 적재한다 (파라미터가 같을 때만, extra 는 DB 에서 다시).
+원본 데이터를 다시 적재(ingest)한 뒤 실행.
+    python -m backend.app.db.build_clusters --out /var/lib/safeon/clusters.pkl
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import create_engine
+
+from ..config import (CLUSTER_EXTENT, CLUSTER_MAX_ZOOM, CLUSTER_MIN_ZOOM, CLUSTER_RADIUS_PX,
+                      CLUSTER_SNAPSHOT_PATH, SQLALCHEMY_DATABASE_URI)
+from ..models.shelters_map import KIND_TO_TABLE
+from ..utils.cluster_index import ClusterIndex
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="클러스터 인덱스 스냅샷 생성")
+    ap.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URI)
+    ap.add_argument("--out", default=CLUSTER_SNAPSHOT_PATH, help="기본: CLUSTER_SNAPSHOT_PATH")
+    ap.add_argument("--kinds", nargs="*", default=list(KIND_TO_TABLE), choices=list(KIND_TO_TABLE))
+    args = ap.parse_args(argv)
+    if not args.out:
+        ap.error("--out 또는 CLUSTER_SNAPSHOT_PATH 필요")
+
+    index = ClusterIndex()
+    index.min_zoom, index.max_zoom = CLUSTER_MIN_ZOOM, CLUSTER_MAX_ZOOM
+    index.radius_px, index.extent = CLUSTER_RADIUS_PX, CLUSTER_EXTENT
+    started = time.perf_counter()
+    built = index.build(create_engine(args.database_url), args.kinds)
+    index.save_snapshot(args.out)
+    for kind, c in built.items():
+        print(f"{kind}: 점 {len(c.ids)}개, 줌 {c.min_zoom} 레벨 {len(c.levels[c.min_zoom])}개")
+    print(f"{args.out} 저장 ({time.perf_counter() - started:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""모델 테이블 + 누락된 인덱스를 만드는 스키마 명령 (운영에서는 앱 시작 시 create_all 대신 이것을 실행)
+
+- db.create_all() 과 같은 DDL: 없는 테이블만 만든다 (이미 있는 테이블은 그대로)
+- 이어서 ensure_indexes 로 기존 테이블에 새로 선언된 인덱스를 추가
+- 쉼터 원본 테이블(shelters_heat 등)은 ingest.py 가 만든다
+
+사용법 (repo 루트에서):
+    python -m backend.app.db.create_schema
+    python -m backend.app.db.create_schema --database-url mysql+pymysql://user:pw@host:3306/safe_on
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import create_engine, inspect
+
+from ..config import SQLALCHEMY_DATABASE_URI
+from . import db
+from ..models import user, favorite, shelter_extra, shelter_review, shelter_review_stats, shelter_canonical, shelter_catalog  # noqa: F401  (메타데이터 등록)
+from .ensure_indexes import ensure_indexes
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="모델 테이블/인덱스 생성")
+    ap.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URI)
+    args = ap.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    started = time.perf_counter()
+    before = set(inspect(engine).get_table_names())
+    db.metadata.create_all(engine)
+    created = [t.name for t in db.metadata.sorted_tables if t.name not in before]
+    indexes = ensure_indexes(engine)
+    for name in created:
+        print(f"created table {name}")
+    for name in indexes:
+        print(f"created index {name}")
+    print(f"완료 ({time.perf_counter() - started:.2f}s)" if created or indexes else "변경 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""모델에 선언된 인덱스 중 DB에 없는 것만 만드는 스크립트
+
+db.create_all() 은 이미 있는 테이블에 새 인덱스를 추가하지 않는다.
+모델에 Index 를 추가한 뒤 기존 DB에 한 번 실행:
+    python -m backend.app.db.ensure_indexes
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import create_engine, inspect
+
+from ..config import SQLALCHEMY_DATABASE_URI
+from . import db
+from ..models import user, favorite, shelter_review, shelter_review_stats  # noqa: F401  (메타데이터 등록)
+
+
+def ensure_indexes(engine) -> list[str]:
+    insp = inspect(engine)
+    created = []
+    for table in db.metadata.sorted_tables:
+        if not insp.has_table(table.name):
+            continue
+        existing = {i["name"] for i in insp.get_indexes(table.name)}
+        for idx in table.indexes:
+            if idx.name not in existing:
+                idx.create(engine)
+                created.append(f"{table.name}.{idx.name}")
+    return created
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="누락된 모델 인덱스 생성")
+    ap.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URI)
+    args = ap.parse_args(argv)
+    created = ensure_indexes(create_engine(args.database_url))
+    print("\n".join(f"created {n}" for n in created) or "변경 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
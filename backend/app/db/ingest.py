@@ -0,0 +1,418 @@
+"""data/ 폴더의 쉼터 데이터셋을 KIND_TO_TABLE 테이블에 배치 upsert 하는 스크립트
+
+- 파일은 스트리밍으로 읽고(batch_size 단위), 배치마다 다중 행 upsert 한 번 + 커밋 한 번
+- (shelter_name, road_address) 자연키로 upsert 하므로 여러 번 돌려도 행이 중복되지 않는다
+- 배치 하나가 실패해도 전체를 롤백하지 않고, 실패한 배치/행을 모아 마지막에 보고한다
+- 기존 테이블에 자연키 유니크 인덱스를 처음 붙일 때 같은 자연키 행(또는 자연키 NULL 행)이 있으면
+  기본은 인덱스를 붙이지 않고 그 kind 를 건너뛴다. --dry-run 으로 충돌 id 를 먼저 확인하고,
+  --dedupe-existing 을 줘야 NULL 을 "" 로 맞추고 id 가 가장 작은 행만 남긴다
+  (지워진 id 를 가리키던 즐겨찾기/리뷰는 not_found 가 되므로 되돌릴 수 없다)
+- 적재가 끝난 kind 는 통합 카탈로그(shelters_all)도 다시 동기화한다 (--no-catalog 로 끔)
+
+사용법 (repo 루트에서):
+    python -m backend.app.db.ingest
+    python -m backend.app.db.ingest --kinds heat climate --batch-size 2000
+    python -m backend.app.db.ingest --file heat=/path/to/shelters_heat.json --json
+    python -m backend.app.db.ingest --kinds finedust --file finedust=data/shelters_finedust.csv --recompute-coords
+    python -m backend.app.db.ingest --dry-run            # 기존 테이블의 자연키 충돌만 보고
+    python -m backend.app.db.ingest --dedupe-existing    # 충돌 행을 지우고 유니크 인덱스 추가
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from sqlalchemy import (Column, Float, Integer, MetaData, String, Table, UniqueConstraint,
+                        create_engine, inspect)
+from sqlalchemy.engine import Engine
+
+from ..config import SQLALCHEMY_DATABASE_URI
+from ..models.shelters_map import KIND_TO_TABLE
+from ..utils.catalog import ensure_catalog_table, sync_kind
+from ..utils.upsert import upsert_stmt
+from . import transform
+
+DATA_DIR = Path(__file__).resolve().parents[3] / "data"
+NATURAL_KEY = ("shelter_name", "road_address")
+
+
+@dataclass
+class Source:
+    file: str
+    columns: dict  # 컬럼명 -> SQLAlchemy 타입
+    natural_key: tuple = NATURAL_KEY
+    projected: str | None = None  # x_coord/y_coord 좌표계. 있으면 배치마다 위경도 변환
+
+
+def _cols(*names, ints=(), floats=()):
+    return {n: Integer if n in ints else Float if n in floats else String(225) for n in names}
+
+
+# kind별 원본 파일과 컬럼. smart/extra는 원본 파일이 없으므로 건너뛴다
+SOURCES = {
+    "heat": Source("shelters_heat.json", _cols(
+        "facility_type_1", "facility_type_2", "shelter_name", "road_address", "lot_address",
+        "facility_area", "capacity", "note", "longitude", "latitude",
+        ints=("capacity",), floats=("facility_area", "longitude", "latitude"))),
+    "climate": Source("shelters_climate.json", _cols(
+        "facility_name", "shelter_name", "sigungu", "road_address", "x_coord", "y_coord",
+        "time", "longitude", "latitude",
+        floats=("x_coord", "y_coord", "longitude", "latitude")), projected=transform.SRC_CRS),
+    "finedust": Source("shelters_finedust.json", _cols(
+        "sigungu", "shelter_name", "road_address", "facility_name", "capacity", "time",
+        "x_coord", "y_coord", "longitude", "latitude",
+        ints=("capacity",), floats=("x_coord", "y_coord", "longitude", "latitude")), projected=transform.SRC_CRS),
+}
+
+
+@dataclass
+class Report:
+    kind: str
+    table: str
+    rows_read: int = 0
+    rows_written: int = 0
+    coords_transformed: int = 0
+    duplicates_removed: int = 0  # 유니크 인덱스를 붙이기 전에 지운 기존 중복 행
+    rejected: list = field(default_factory=list)        # 값 변환 실패 행
+    failed_batches: list = field(default_factory=list)  # DB 오류 배치
+    seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_written / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind, "table": self.table,
+            "rows_read": self.rows_read, "rows_written": self.rows_written,
+            "coords_transformed": self.coords_transformed, "duplicates_removed": self.duplicates_removed,
+            "rejected": self.rejected, "failed_batches": self.failed_batches,
+            "seconds": round(self.seconds, 3), "rows_per_sec": round(self.rows_per_sec, 1),
+        }
+
+
+# ---- 파일 스트리밍 ----
+def iter_json_array(f, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """[{...}, {...}] 형태 JSON을 조금씩 읽으며 원소를 하나씩 yield (파일 전체를 올리지 않음)"""
+    dec = json.JSONDecoder()
+    buf, pos, started, eof = "", 0, False, False
+    while True:
+        if not eof:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,\ufeff":
+                pos += 1
+            if pos >= len(buf):
+                break
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("JSON 배열 형식이 아닙니다")
+                started, pos = True, pos + 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                obj, pos = dec.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                break  # 원소가 청크 경계에 걸림 → 더 읽는다
+            yield obj
+        if eof:
+            if started:
+                raise ValueError("JSON 배열이 닫히지 않았습니다")
+            return
+
+
+def iter_records(path: Path) -> Iterator[dict]:
+    """.json(배열) / .jsonl·.ndjson / .csv 를 한 행씩"""
+    suffix = path.suffix.lower()
+    with open(path, encoding="utf-8-sig", newline="" if suffix == ".csv" else None) as f:
+        if suffix == ".csv":
+            yield from csv.DictReader(f)
+        elif suffix in (".jsonl", ".ndjson"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f)
+
+
+def batched(it: Iterable, n: int) -> Iterator[list]:
+    it = iter(it)
+    while batch := list(islice(it, n)):
+        yield batch
+
+
+def clean_row(row: dict, source: Source) -> dict:
+    """스펙에 있는 컬럼만, 빈 문자열은 None, 숫자 컬럼은 형 변환 (실패 시 ValueError)"""
+    out = {}
+    for name, typ in source.columns.items():
+        v = row.get(name)
+        if isinstance(v, str):
+            v = v.strip()
+        if v is None or v == "":
+            # 자연키는 NULL이면 유니크 인덱스가 중복을 못 막으므로 빈 문자열로 둔다
+            out[name] = "" if name in source.natural_key else None
+        elif typ is Integer:
+            out[name] = int(float(v))
+        elif typ is Float:
+            out[name] = float(v)
+        else:
+            out[name] = str(v)
+    return out
+
+
+# ---- 테이블 ----
+class NaturalKeyConflict(Exception):
+    """기존 행이 자연키 유니크 인덱스와 충돌해서 --dedupe-existing 없이는 진행하지 않음"""
+
+    def __init__(self, table: str, conflicts: dict):
+        super().__init__(f"{table}: 자연키 중복 {len(conflicts['groups'])}묶음, NULL {conflicts['null_rows']}행")
+        self.table = table
+        self.conflicts = conflicts
+
+
+def _missing_unique_index(engine: Engine, tname: str, key: tuple) -> bool:
+    """테이블은 있는데 자연키 유니크 인덱스가 아직 없음"""
+    insp = inspect(engine)
+    if not insp.has_table(tname):
+        return False
+    uniques = [set(u["column_names"]) for u in insp.get_unique_constraints(tname)]
+    uniques += [set(i["column_names"]) for i in insp.get_indexes(tname) if i.get("unique")]
+    return set(key) not in uniques
+
+
+def natural_key_conflicts(engine: Engine, tname: str, key: tuple) -> dict:
+    """유니크 인덱스를 막는 기존 행 (NULL 과 "" 는 같은 키로 본다)
+
+    {"groups": [{"key": [...], "ids": [가장 작은 id(남길 행), ...]}], "null_rows": 자연키 NULL 행 수}
+    """
+    q = engine.dialect.identifier_preparer.quote
+    t = q(tname)
+    coalesced = [f"COALESCE({q(c)}, '')" for c in key]
+    dup = (f"SELECT {', '.join(f'{e} AS k{i}' for i, e in enumerate(coalesced))} FROM {t} "
+           f"GROUP BY {', '.join(coalesced)} HAVING COUNT(*) > 1")
+    on = " AND ".join(f"{e.replace(q(c), f'src.{q(c)}')} = d.k{i}"
+                      for i, (c, e) in enumerate(zip(key, coalesced)))
+    ks = ", ".join(f"d.k{i}" for i in range(len(key)))
+    groups: dict[tuple, list[int]] = {}
+    with engine.connect() as conn:
+        for row in conn.exec_driver_sql(
+            f"SELECT src.id, {ks} FROM {t} AS src JOIN ({dup}) AS d ON {on} ORDER BY {ks}, src.id"
+        ):
+            groups.setdefault(tuple(row[1:]), []).append(row[0])
+        nulls = conn.exec_driver_sql(
+            f"SELECT COUNT(*) FROM {t} WHERE {' OR '.join(f'{q(c)} IS NULL' for c in key)}"
+        ).scalar()
+    return {"groups": [{"key": list(k), "ids": ids} for k, ids in groups.items()], "null_rows": nulls or 0}
+
+
+def dedupe_natural_key(engine: Engine, tname: str, key: tuple) -> int:
+    """자연키 NULL → "" (새 적재 행과 같은 값이 되도록), 같은 자연키 중복은 MIN(id) 만 남기고 삭제. 지운 행 수"""
+    q = engine.dialect.identifier_preparer.quote
+    t = q(tname)
+    coalesced = ", ".join(f"COALESCE({q(c)}, '')" for c in key)
+    with engine.begin() as conn:
+        # NULL 과 "" 를 같은 키로 보고 먼저 중복을 지워야 NULL → "" 갱신이 새 중복을 만들지 않는다
+        # (MySQL 은 DELETE 대상 테이블을 서브쿼리에서 바로 못 읽어서 파생 테이블로 한 번 감싼다)
+        removed = conn.exec_driver_sql(
+            f"DELETE FROM {t} WHERE id NOT IN "
+            f"(SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM {t} GROUP BY {coalesced}) AS keep)"
+        ).rowcount
+        for c in key:
+            conn.exec_driver_sql(f"UPDATE {t} SET {q(c)} = '' WHERE {q(c)} IS NULL")
+    return max(removed or 0, 0)
+
+
+def ensure_table(engine: Engine, kind: str, source: Source, report: "Report | None" = None,
+                 dedupe_existing: bool = False) -> Table:
+    """테이블이 없으면 만들고, 자연키 유니크 인덱스가 없으면 추가
+
+    기존 행이 인덱스와 충돌하면 dedupe_existing 일 때만 정리하고, 아니면 NaturalKeyConflict
+    """
+    tname = KIND_TO_TABLE[kind]
+    if not inspect(engine).has_table(tname):
+        md = MetaData()
+        t = Table(tname, md,
+                  Column("id", Integer, primary_key=True, autoincrement=True),
+                  *[Column(n, typ) for n, typ in source.columns.items()],
+                  UniqueConstraint(*source.natural_key, name=f"uq_{tname}_natural"))
+        md.create_all(engine)
+        return t
+
+    if _missing_unique_index(engine, tname, source.natural_key):
+        conflicts = natural_key_conflicts(engine, tname, source.natural_key)
+        if conflicts["groups"] or conflicts["null_rows"]:
+            if not dedupe_existing:
+                raise NaturalKeyConflict(tname, conflicts)
+            removed = dedupe_natural_key(engine, tname, source.natural_key)
+            if report is not None:
+                report.duplicates_removed = removed
+        cols = ", ".join(f"`{c}`" if engine.dialect.name == "mysql" else c for c in source.natural_key)
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"CREATE UNIQUE INDEX uq_{tname}_natural ON {tname} ({cols})")
+    return Table(tname, MetaData(), autoload_with=engine)
+
+
+def _print_conflicts(kind: str, conflicts: dict, limit: int = 20):
+    groups = conflicts["groups"]
+    extra = sum(len(g["ids"]) - 1 for g in groups)
+    print(f"[{kind}] 자연키 중복 {len(groups)}묶음 (정리 시 삭제 {extra}행), 자연키 NULL {conflicts['null_rows']}행",
+          file=sys.stderr)
+    for g in groups[:limit]:
+        print(f"    {tuple(g['key'])}: ids {', '.join(map(str, g['ids']))} ({g['ids'][0]} 남김)", file=sys.stderr)
+    if len(groups) > limit:
+        print(f"    ... 외 {len(groups) - limit}묶음 (--dry-run --json 으로 전체 확인)", file=sys.stderr)
+
+
+# ---- 적재 ----
+def ingest_kind(engine: Engine, kind: str, path: Path, batch_size: int,
+                retry_rows: bool = True, recompute_coords: bool = False, dedupe_existing: bool = False) -> Report:
+    source = SOURCES[kind]
+    report = Report(kind, KIND_TO_TABLE[kind])
+    table = ensure_table(engine, kind, source, report, dedupe_existing=dedupe_existing)
+    cols = [c for c in source.columns if c in table.c]
+    stmt = upsert_stmt(table, engine.dialect.name, source.natural_key,
+                       [c for c in cols if c not in source.natural_key])
+
+    started = time.perf_counter()
+    for bno, raw_rows in enumerate(batched(iter_records(path), batch_size)):
+        if source.projected:
+            # 위경도가 없는(또는 다시 계산할) 행만 골라 배치 전체를 한 번에 변환
+            report.coords_transformed += transform.apply_to_rows(
+                raw_rows, source.projected, overwrite=recompute_coords)
+        rows = []
+        for i, raw in enumerate(raw_rows):
+            try:
+                rows.append({k: v for k, v in clean_row(raw, source).items() if k in cols})
+            except (TypeError, ValueError) as e:
+                report.rejected.append({"row": report.rows_read + i, "error": str(e)})
+        report.rows_read += len(raw_rows)
+        if not rows:
+            continue
+        try:
+            with engine.begin() as conn:
+                conn.execute(stmt, rows)
+            report.rows_written += len(rows)
+        except Exception as e:
+            failed = {"batch": bno, "rows": len(rows), "error": str(e).splitlines()[0]}
+            if retry_rows:
+                # 배치 안에서 문제 행만 골라내고 나머지는 살린다
+                bad = 0
+                for row in rows:
+                    try:
+                        with engine.begin() as conn:
+                            conn.execute(stmt, [row])
+                        report.rows_written += 1
+                    except Exception:
+                        bad += 1
+                failed["rows_failed"] = bad
+            report.failed_batches.append(failed)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _parse_file_overrides(values: list[str]) -> dict[str, Path]:
+    out = {}
+    for v in values or []:
+        kind, _, path = v.partition("=")
+        out[kind] = Path(path)
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="쉼터 데이터셋 배치 upsert")
+    ap.add_argument("--kinds", nargs="*", default=list(KIND_TO_TABLE), help="적재할 kind (기본: 전부)")
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ap.add_argument("--file", action="append", metavar="KIND=PATH", help="kind별 입력 파일 지정")
+    ap.add_argument("--batch-size", type=int, default=1000)
+    ap.add_argument("--no-retry-rows", action="store_true", help="실패 배치를 행 단위로 재시도하지 않음")
+    ap.add_argument("--recompute-coords", action="store_true",
+                    help="투영 좌표가 있는 데이터셋은 위경도를 항상 다시 계산")
+    ap.add_argument("--no-catalog", action="store_true", help="적재 후 shelters_all 동기화 생략")
+    ap.add_argument("--dry-run", action="store_true",
+                    help="적재하지 않고 기존 테이블의 자연키 충돌(유니크 인덱스를 막는 id)만 보고")
+    ap.add_argument("--dedupe-existing", action="store_true",
+                    help="유니크 인덱스를 붙일 때 자연키 중복 행을 MIN(id)만 남기고 삭제, NULL 은 \"\" 로 (되돌릴 수 없음)")
+    ap.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URI)
+    ap.add_argument("--echo", action="store_true", help="SQL 로그 출력")
+    ap.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = ap.parse_args(argv)
+
+    engine = create_engine(args.database_url, echo=args.echo)
+    if args.dry_run:
+        return _dry_run(engine, args)
+    overrides = _parse_file_overrides(args.file)
+    reports, conflicted = [], []
+    for kind in args.kinds:
+        if kind not in KIND_TO_TABLE:
+            print(f"[skip] 알 수 없는 kind: {kind}", file=sys.stderr)
+            continue
+        if kind not in SOURCES:
+            print(f"[skip] {kind}: 원본 데이터셋 정의 없음", file=sys.stderr)
+            continue
+        path = overrides.get(kind) or args.data_dir / SOURCES[kind].file
+        if not path.exists():
+            print(f"[skip] {kind}: {path} 없음", file=sys.stderr)
+            continue
+        try:
+            r = ingest_kind(engine, kind, path, args.batch_size, retry_rows=not args.no_retry_rows,
+                            recompute_coords=args.recompute_coords, dedupe_existing=args.dedupe_existing)
+        except NaturalKeyConflict as e:
+            _print_conflicts(kind, e.conflicts)
+            print(f"[skip] {kind}: 기존 행이 자연키 유니크 인덱스와 충돌 → 확인 후 --dedupe-existing 으로 다시 실행",
+                  file=sys.stderr)
+            conflicted.append(kind)
+            continue
+        reports.append(r)
+        if not args.no_catalog and r.rows_written:
+            ensure_catalog_table(engine)
+            synced = sync_kind(engine, kind, args.batch_size)
+            if not args.json:
+                print(f"[{kind}] 카탈로그 {synced}행 동기화")
+        if not args.json:
+            print(f"[{kind}] {r.rows_written}/{r.rows_read}행 적재, {r.seconds:.2f}s "
+                  f"({r.rows_per_sec:,.0f} rows/s), 좌표 변환 {r.coords_transformed}행, "
+                  f"기존 중복 삭제 {r.duplicates_removed}행, "
+                  f"변환 실패 {len(r.rejected)}행, "
+                  f"실패 배치 {len(r.failed_batches)}개")
+            for fb in r.failed_batches:
+                print(f"    batch #{fb['batch']}: {fb['error']}")
+
+    if args.json:
+        print(json.dumps([r.as_dict() for r in reports], ensure_ascii=False, indent=2))
+    return 1 if conflicted or any(r.failed_batches for r in reports) else 0
+
+
+def _dry_run(engine: Engine, args) -> int:
+    """유니크 인덱스가 아직 없는 기존 테이블의 충돌 행만 보고 (아무것도 쓰지 않음)"""
+    found = {}
+    for kind in args.kinds:
+        if kind not in SOURCES:
+            continue
+        tname, key = KIND_TO_TABLE[kind], SOURCES[kind].natural_key
+        if not _missing_unique_index(engine, tname, key):
+            continue
+        conflicts = natural_key_conflicts(engine, tname, key)
+        if conflicts["groups"] or conflicts["null_rows"]:
+            found[kind] = conflicts
+            if not args.json:
+                _print_conflicts(kind, conflicts)
+        elif not args.json:
+            print(f"[{kind}] 충돌 없음 (적재 시 유니크 인덱스를 바로 추가)")
+    if args.json:
+        print(json.dumps(found, ensure_ascii=False, indent=2))
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""KIND_TO_TABLE 테이블마다 공간 컬럼(geom) + SPATIAL INDEX 를 추가하는 마이그레이션 (MySQL 8.0.17+)
+
+- geom 은 위경도 컬럼에서 계산되는 STORED 생성 컬럼(POINT SRID 4326, NOT NULL)
+  → ALTER 시점에 기존 행이 모두 채워지고(backfill), 이후 INSERT/UPDATE 도 자동으로 따라간다
+- 좌표 규칙은 repositories 와 같다: ST_SRID(POINT(경도, 위도), 4326)
+- 위경도가 없는 행은 POINT(0 0) 으로 들어가 어떤 nearby bbox 에도 걸리지 않는다
+- repositories 는 geom 컬럼이 보이면 MBRContains/ST_Distance_Sphere 를 geom 에 직접 건다
+  (실행 중인 앱은 table_watch 가 TABLE_WATCH_SECONDS 안에 컬럼 변경을 보고 리플렉션/문장 캐시를 다시 만든다)
+
+사용법 (repo 루트에서):
+    python -m backend.app.db.migrate_spatial             # 모든 테이블
+    python -m backend.app.db.migrate_spatial --dry-run   # 실행할 SQL만 출력
+    python -m backend.app.db.migrate_spatial --kinds heat --drop
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import create_engine, inspect
+
+from ..config import SQLALCHEMY_DATABASE_URI
+from ..models.shelters_map import KIND_TO_TABLE
+
+GEOM_COL = "geom"
+LAT_NAMES = ["latitude", "lat", "y", "위도"]
+LNG_NAMES = ["longitude", "lng", "x", "경도"]
+
+
+def _pick(cols: list[str], candidates: list[str]):
+    m = {c.lower(): c for c in cols}
+    return next((m[n.lower()] for n in candidates if n.lower() in m), None)
+
+
+def plan_for_table(insp, tname: str, drop: bool = False) -> list[str]:
+    """테이블 하나에 필요한 DDL 목록 (이미 적용된 부분은 생략)"""
+    if not insp.has_table(tname):
+        return []
+    cols = [c["name"] for c in insp.get_columns(tname)]
+    has_geom = any(c.lower() == GEOM_COL for c in cols)
+    idx_name = f"sx_{tname}_{GEOM_COL}"
+    has_idx = any(i["name"] == idx_name for i in insp.get_indexes(tname))
+
+    if drop:
+        sql = []
+        if has_idx:
+            sql.append(f"ALTER TABLE `{tname}` DROP INDEX `{idx_name}`")
+        if has_geom:
+            sql.append(f"ALTER TABLE `{tname}` DROP COLUMN `{GEOM_COL}`")
+        return sql
+
+    lat, lng = _pick(cols, LAT_NAMES), _pick(cols, LNG_NAMES)
+    if lat is None or lng is None:
+        raise ValueError(f"[{tname}] 위도/경도 컬럼을 찾지 못했습니다. columns={cols}")
+    sql = []
+    if not has_geom:
+        sql.append(
+            f"ALTER TABLE `{tname}` ADD COLUMN `{GEOM_COL}` POINT "
+            f"GENERATED ALWAYS AS (ST_SRID(POINT("
+            f"COALESCE(CAST(`{lng}` AS DOUBLE), 0), COALESCE(CAST(`{lat}` AS DOUBLE), 0)), 4326)) "
+            f"STORED SRID 4326 NOT NULL"
+        )
+    if not has_idx:
+        sql.append(f"ALTER TABLE `{tname}` ADD SPATIAL INDEX `{idx_name}` (`{GEOM_COL}`)")
+    return sql
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="쉼터 테이블 공간 컬럼/인덱스 마이그레이션")
+    ap.add_argument("--kinds", nargs="*", default=list(KIND_TO_TABLE))
+    ap.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URI)
+    ap.add_argument("--dry-run", action="store_true", help="SQL만 출력하고 실행하지 않음")
+    ap.add_argument("--drop", action="store_true", help="geom 컬럼/인덱스 제거 (되돌리기)")
+    args = ap.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    if engine.dialect.name != "mysql":
+        print(f"MySQL 전용 마이그레이션입니다 (현재: {engine.dialect.name})", file=sys.stderr)
+        return 2
+
+    insp = inspect(engine)
+    changed = []
+    for kind in args.kinds:
+        tname = KIND_TO_TABLE.get(kind)
+        if tname is None:
+            print(f"[skip] 알 수 없는 kind: {kind}", file=sys.stderr)
+            continue
+        statements = plan_for_table(insp, tname, drop=args.drop)
+        if not statements:
+            print(f"[{kind}] 변경 없음")
+            continue
+        for sql in statements:
+            print(f"[{kind}] {sql}")
+            if args.dry_run:
+                continue
+            started = time.perf_counter()
+            with engine.begin() as conn:
+                conn.exec_driver_sql(sql)
+            print(f"[{kind}]   완료 ({time.perf_counter() - started:.2f}s)")
+        if not args.dry_run:
+            changed.append(kind)
+    if changed:
+        print(f"스키마 변경됨 ({', '.join(changed)}): 실행 중인 앱은 TABLE_WATCH_SECONDS 안에 geom 경로로 바뀝니다")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""shelter_reviews 전체를 집계해 shelter_review_stats 를 다시 채우는 스크립트
+
+평소에는 create_review 가 증분으로 갱신한다. 초기 구축, 리뷰 일괄 삭제/수정 후, 집계가 의심될 때 실행.
+    python -m backend.app.db.rebuild_review_stats
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from ..config import SQLALCHEMY_DATABASE_URI
+from ..models.shelter_review_stats import ShelterReviewStats
+from ..utils.review_stats import rebuild
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="리뷰 집계 일괄 재계산")
+    ap.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URI)
+    args = ap.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    ShelterReviewStats.__table__.create(engine, checkfirst=True)
+    started = time.perf_counter()
+    with Session(engine) as session, session.begin():
+        n = rebuild(session)
+    print(f"쉼터 {n}곳 집계 완료 ({time.perf_counter() - started:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
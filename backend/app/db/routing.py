@@ -0,0 +1,148 @@
+# backend/app/db/routing.py
+# 읽기 전용 라우트를 읽기 복제본(replica bind)으로 보내는 세션
+# - @read_replica 가 붙은 뷰 안에서의 SELECT 만 replica 로, flush/DML 은 항상 primary
+# - 자기 쓰기 직후 읽기(read-your-writes): 쓰기를 한 user 는 DB_REPLICA_STICKY_SECONDS 동안 primary 로 읽는다
+#   쓰기 판정은 primary 엔진 이벤트에서: SELECT 가 아닌 문장(ORM flush, text(), exec_driver_sql 모두) 또는 커밋
+# - "최근에 쓴 user" 기록은 DB_REPLICA_STICKY_BACKEND 에 둔다. memory 는 워커마다 따로라 다음 요청이
+#   다른 워커로 가면 못 본다 → 워커가 여럿이면 redis (nearby 타일 캐시와 같은 서버를 써도 된다)
+#   redis 가 안 되면 그 요청은 primary 로 읽는다 (복제 지연 쪽으로 틀리지 않게)
+# - SQLALCHEMY_BINDS 에 replica 가 없으면 전부 primary (개발/단일 DB 환경 그대로, 기록도 안 함)
+
+import logging
+from functools import wraps
+
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+from ..utils.ttl_cache import TTLCache
+
+log = logging.getLogger(__name__)
+
+REPLICA_BIND = "replica"
+# 이 키워드로 시작하는 문장만 읽기로 본다 (나머지 INSERT/UPDATE/DELETE/REPLACE/SAVEPOINT/DDL… 은 쓰기)
+READ_KEYWORDS = ("SELECT", "SHOW", "EXPLAIN", "DESCRIBE", "PRAGMA")
+
+
+class MemoryWriters:
+    """워커 하나 안에서만 보이는 기록 (개발/단일 워커)"""
+
+    def __init__(self, ttl: float):
+        self._cache = TTLCache(maxsize=100_000, ttl=ttl)
+
+    def mark(self, uid):
+        self._cache.set(uid, True)
+
+    def recent(self, uid) -> bool:
+        return uid in self._cache
+
+
+class RedisWriters:
+    """모든 워커가 보는 기록. 만료는 서버 TTL 로"""
+
+    def __init__(self, client, ttl: float, prefix: str = "safeon:wrote:"):
+        self.client = client
+        self.ttl_ms = max(int(ttl * 1000), 1)
+        self.prefix = prefix
+
+    def mark(self, uid):
+        self.client.set(f"{self.prefix}{uid}", 1, px=self.ttl_ms)
+
+    def recent(self, uid) -> bool:
+        return bool(self.client.exists(f"{self.prefix}{uid}"))
+
+
+def make_writers(config):
+    ttl = float(config.get("DB_REPLICA_STICKY_SECONDS", 5))
+    kind = config.get("DB_REPLICA_STICKY_BACKEND", "memory")
+    if kind == "redis":
+        import redis  # 선택 의존성: redis 백엔드를 쓸 때만 필요
+        return RedisWriters(redis.Redis.from_url(config["DB_REPLICA_STICKY_REDIS_URL"]), ttl)
+    if kind == "fakeredis":
+        import fakeredis  # 로컬/테스트용 Redis 대역
+        return RedisWriters(fakeredis.FakeRedis(), ttl)
+    return MemoryWriters(ttl)
+
+
+_writers = MemoryWriters(5)
+_replica_enabled = False
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            if self._flushing or getattr(clause, "is_dml", False):
+                g._db_wrote = True
+            elif g.get("_db_route") == REPLICA_BIND:
+                engine = self._db.engines.get(REPLICA_BIND)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _on_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and not statement.lstrip().upper().startswith(READ_KEYWORDS):
+        g._db_wrote = True
+
+
+def _on_commit(conn):
+    if has_request_context():
+        g._db_wrote = True
+
+
+def _request_user_id():
+    from ..utils.security import user_id_from_request  # security → db 순환 import 방지
+    uid = g.get("current_user_id")
+    return uid if uid is not None else user_id_from_request()
+
+
+def _recent_writer(uid) -> bool:
+    try:
+        return _writers.recent(uid)
+    except Exception as e:  # 기록을 못 읽으면 최근에 썼다고 본다
+        log.warning("replica sticky lookup failed, reading from primary: %s", e)
+        return True
+
+
+def read_replica(fn):
+    """읽기 전용 뷰 데코레이터. 최근에 쓴 user 의 요청은 primary 에 남긴다"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _replica_enabled:
+            uid = _request_user_id()
+            if uid is None or not _recent_writer(uid):
+                g._db_route = REPLICA_BIND
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def _mark_writer(response):
+    if g.pop("_db_wrote", False) and _replica_enabled:
+        uid = _request_user_id()
+        if uid is not None:
+            try:
+                _writers.mark(uid)
+            except Exception as e:
+                log.warning("replica sticky mark failed for user %s: %s", uid, e)
+    return response
+
+
+def init_app(app, db):
+    global _writers, _replica_enabled
+    with app.app_context():
+        engines = dict(db.engines)
+    _replica_enabled = REPLICA_BIND in engines
+    if not _replica_enabled:
+        return
+    _writers = make_writers(app.config)
+    if isinstance(_writers, MemoryWriters):
+        from ..utils.nearby_cache import _worker_count
+        if _worker_count() > 1:
+            log.warning("DB_REPLICA_STICKY_BACKEND=memory with %d workers: a user's next request may land on "
+                        "another worker and read its own write from the replica. "
+                        "Use DB_REPLICA_STICKY_BACKEND=redis", _worker_count())
+    for name, engine in engines.items():
+        if name != REPLICA_BIND:
+            event.listen(engine, "before_cursor_execute", _on_statement)
+            event.listen(engine, "commit", _on_commit)
+    app.after_request(_mark_writer)
@@ -0,0 +1,43 @@
+"""shelters_* 원본 테이블로 통합 카탈로그(shelters_all)를 다시 채우는 스크립트
+
+ingest 는 적재한 kind 를 자동으로 동기화한다. 초기 구축, 원본 테이블을 직접 고친 뒤, 카탈로그가 의심될 때 실행.
+실행 중인 앱은 TABLE_WATCH_SECONDS 안에 새 kind 를 카탈로그 경로로 읽기 시작한다.
+원본 테이블의 MAX(id) 가 동기화 때와 달라진 kind 는 다시 실행할 때까지 kind별 테이블로 읽는다.
+    python -m backend.app.db.sync_catalog
+    python -m backend.app.db.sync_catalog --kinds heat climate
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import create_engine, inspect
+
+from ..config import SQLALCHEMY_DATABASE_URI
+from ..models.shelters_map import KIND_TO_TABLE
+from ..utils.catalog import ensure_catalog_table, sync_kind
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="통합 쉼터 카탈로그 동기화")
+    ap.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URI)
+    ap.add_argument("--kinds", nargs="*", default=list(KIND_TO_TABLE), choices=list(KIND_TO_TABLE))
+    ap.add_argument("--batch-size", type=int, default=1000)
+    args = ap.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    if ensure_catalog_table(engine):
+        print("shelters_all 생성 (스키마 변경 시 다시 만듦)")
+    existing = set(inspect(engine).get_table_names())
+    for kind in args.kinds:
+        if KIND_TO_TABLE[kind] not in existing:
+            print(f"[skip] {kind}: 테이블 없음")
+            continue
+        started = time.perf_counter()
+        n = sync_kind(engine, kind, args.batch_size)
+        print(f"[{kind}] {n}행 동기화 ({time.perf_counter() - started:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
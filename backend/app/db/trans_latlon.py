@@ -1,19 +1,18 @@
-""" x, y 좌표만 있는 데이터에 위도, 경도 column을 추가하는 코드입니다."""
+""" x, y 좌표만 있는 데이터에 위도, 경도 column을 추가하는 코드입니다.
 
-import pandas as pd
-from pyproj import Transformer
+배열 단위 변환/청크 처리는 transform.py 에 있고, 여기서는 기본 데이터셋들에 적용만 한다.
+    python -m backend.app.db.trans_latlon                 # climate, finedust CSV 모두
+    python -m backend.app.db.trans_latlon shelters_finedust.csv
+"""
 
-# CSV 읽기
-df = pd.read_csv("C:/Users/chloe/safe-on-project/data/shelters_finedust.csv")
+import sys
 
-# 변환기 설정
-transformer = Transformer.from_crs("EPSG:5186", "EPSG:4326", always_xy=True)
+from .ingest import DATA_DIR
+from .transform import main
 
-# 위도, 경도 열 추가
-df[['longitude', 'latitude']] = df.apply(
-    lambda row: pd.Series(transformer.transform(row['x_coord'], row['y_coord'])),
-    axis=1
-)
+DEFAULT_FILES = ["shelters_climate.csv", "shelters_finedust.csv"]
 
-# 저장
-df.to_csv("shelters_finedust_with_latlon.csv", index=False)
+if __name__ == "__main__":
+    for name in sys.argv[1:] or DEFAULT_FILES:
+        src = DATA_DIR / name
+        main([str(src), "-o", str(src.with_name(f"{src.stem}_with_latlon.csv"))])
@@ -0,0 +1,111 @@
+"""투영 좌표(EPSG:5186, x_coord/y_coord)를 위경도(EPSG:4326)로 바꾸는 변환 단계
+
+- 행마다 transformer.transform 을 부르지 않고, 배치/청크의 좌표 배열을 한 번에 변환
+- 큰 CSV/JSON도 청크 단위로 읽고 써서 메모리는 청크 크기만큼만 쓴다
+- ingest.py 가 climate/finedust 배치에 그대로 적용한다 (SOURCES[kind].projected)
+
+사용법 (repo 루트에서):
+    python -m backend.app.db.transform data/shelters_finedust.csv -o data/shelters_finedust_with_latlon.csv
+    python -m backend.app.db.transform data/shelters_climate.json -o /tmp/climate.jsonl --chunk-size 100000
+"""
+
+import argparse
+import json
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+SRC_CRS = "EPSG:5186"  # 중부원점 (서울시 공공데이터 x/y 좌표)
+DST_CRS = "EPSG:4326"
+
+
+@lru_cache(maxsize=None)
+def get_transformer(src: str = SRC_CRS, dst: str = DST_CRS):
+    from pyproj import Transformer  # 변환 단계를 쓸 때만 필요
+    return Transformer.from_crs(src, dst, always_xy=True)
+
+
+def to_lonlat(xs, ys, src: str = SRC_CRS):
+    """좌표 배열 → (경도 배열, 위도 배열). 한 번의 호출로 전체 변환"""
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    return get_transformer(src).transform(xs, ys)
+
+
+def _num(v):
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return np.nan
+    return f
+
+
+def apply_to_rows(rows: list[dict], src: str = SRC_CRS, overwrite: bool = False,
+                  x_key: str = "x_coord", y_key: str = "y_coord") -> int:
+    """dict 행 배치에 longitude/latitude를 채운다 (제자리 수정). 변환한 행 수를 돌려준다.
+    overwrite=False면 위경도가 이미 있는 행은 건드리지 않는다."""
+    if not rows:
+        return 0
+    xs = np.fromiter((_num(r.get(x_key)) for r in rows), dtype=np.float64, count=len(rows))
+    ys = np.fromiter((_num(r.get(y_key)) for r in rows), dtype=np.float64, count=len(rows))
+    todo = ~(np.isnan(xs) | np.isnan(ys))
+    if not overwrite:
+        has = np.fromiter((r.get("latitude") not in (None, "") and r.get("longitude") not in (None, "")
+                           for r in rows), dtype=bool, count=len(rows))
+        todo &= ~has
+    idx = np.flatnonzero(todo)
+    if idx.size == 0:
+        return 0
+    lons, lats = to_lonlat(xs[idx], ys[idx], src)
+    for i, lon, lat in zip(idx.tolist(), lons.tolist(), lats.tolist()):
+        rows[i]["longitude"] = lon
+        rows[i]["latitude"] = lat
+    return int(idx.size)
+
+
+def transform_csv(src_path: Path, dst_path: Path, chunk_size: int, src: str = SRC_CRS) -> int:
+    import pandas as pd
+    total = 0
+    for i, df in enumerate(pd.read_csv(src_path, chunksize=chunk_size, encoding="utf-8-sig")):
+        lons, lats = to_lonlat(df["x_coord"].to_numpy(), df["y_coord"].to_numpy(), src)
+        df["longitude"], df["latitude"] = lons, lats
+        df.to_csv(dst_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        total += len(df)
+    return total
+
+
+def transform_records(src_path: Path, dst_path: Path, chunk_size: int, src: str = SRC_CRS) -> int:
+    """JSON 배열/JSONL 입력 → JSONL 출력 (청크 단위 스트리밍)"""
+    from .ingest import batched, iter_records
+    total = 0
+    with open(dst_path, "w", encoding="utf-8") as out:
+        for rows in batched(iter_records(src_path), chunk_size):
+            apply_to_rows(rows, src, overwrite=True)
+            out.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+            total += len(rows)
+    return total
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="x_coord/y_coord → longitude/latitude 변환")
+    ap.add_argument("input", type=Path)
+    ap.add_argument("-o", "--output", type=Path, required=True)
+    ap.add_argument("--chunk-size", type=int, default=50_000)
+    ap.add_argument("--src-crs", default=SRC_CRS)
+    args = ap.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.input.suffix.lower() == ".csv":
+        n = transform_csv(args.input, args.output, args.chunk_size, args.src_crs)
+    else:
+        n = transform_records(args.input, args.output, args.chunk_size, args.src_crs)
+    sec = time.perf_counter() - started
+    print(f"{n}행 변환 → {args.output} ({sec:.2f}s, {n / sec if sec else 0:,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+# backend/app/models/shelter_canonical.py
+# 데이터셋 간 중복 쉼터 → 대표(canonical) 쉼터 매핑 (build_canonical 이 통째로 다시 채운다)
+# 중복 묶음에 속한 쉼터만 행이 있다 (대표 자신도 자기 자신을 가리키는 행). 없는 쉼터는 단독
+from sqlalchemy import Index, func
+from ..db import db
+
+class ShelterCanonical(db.Model):
+    __tablename__ = "shelter_canonical"
+
+    shelter_type = db.Column(db.String(20), primary_key=True)
+    shelter_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    canonical_type = db.Column(db.String(20), nullable=False)
+    canonical_id = db.Column(db.Integer, nullable=False)
+    distance_m = db.Column(db.Float, nullable=False, default=0)  # 대표까지 거리
+    score = db.Column(db.Float, nullable=False, default=1)       # 이름/주소 유사도 (0~1)
+    updated_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_canonical_target", "canonical_type", "canonical_id"),
+    )
@@ -0,0 +1,50 @@
+# backend/app/models/shelter_catalog.py
+# 모든 kind 를 한 스키마로 모은 쉼터 카탈로그 (shelters_all)
+# 원본은 shelters_* 테이블. sync_catalog / ingest / add_shelter 가 채운다 (utils/catalog.py)
+# shelters_all_sync: kind 별로 마지막 동기화 때 원본 테이블의 (행 수, MAX(id)) — 읽기 경로가 비교한다
+from sqlalchemy import Index, func
+from ..db import db
+
+class ShelterCatalog(db.Model):
+    __tablename__ = "shelters_all"
+
+    kind = db.Column(db.String(20), primary_key=True)
+    source_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # shelters_<kind>.id
+    name = db.Column(db.String(255))
+    road_address = db.Column(db.String(255))
+    capacity = db.Column(db.Integer)
+    latitude = db.Column(db.Float, nullable=False)
+    longitude = db.Column(db.Float, nullable=False)
+    hours = db.Column(db.String(255))  # 원본 time/openclose 문자열 그대로
+    # hours 를 적재 시 파싱한 값 (utils/hours.py). 요일별 open/close 는 자정부터 분, 쉬는 날 NULL
+    hours_unknown = db.Column(db.Boolean, nullable=False, default=True)
+    mon_open = db.Column(db.SmallInteger)
+    mon_close = db.Column(db.SmallInteger)
+    tue_open = db.Column(db.SmallInteger)
+    tue_close = db.Column(db.SmallInteger)
+    wed_open = db.Column(db.SmallInteger)
+    wed_close = db.Column(db.SmallInteger)
+    thu_open = db.Column(db.SmallInteger)
+    thu_close = db.Column(db.SmallInteger)
+    fri_open = db.Column(db.SmallInteger)
+    fri_close = db.Column(db.SmallInteger)
+    sat_open = db.Column(db.SmallInteger)
+    sat_close = db.Column(db.SmallInteger)
+    sun_open = db.Column(db.SmallInteger)
+    sun_close = db.Column(db.SmallInteger)
+    props = db.Column(db.Text, nullable=False)  # 좌표를 뺀 원본 행 전체 JSON (nearby props / 상세 응답 재구성용)
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        # nearby: kind IN (...) + 위도 범위 → kind별 범위 스캔, 경도는 인덱스 안에서 거른다
+        Index("ix_all_kind_lat_lng", "kind", "latitude", "longitude"),
+    )
+
+
+class ShelterCatalogSync(db.Model):
+    __tablename__ = "shelters_all_sync"
+
+    kind = db.Column(db.String(20), primary_key=True)
+    source_rows = db.Column(db.Integer, nullable=False)  # 동기화 시점 shelters_<kind> 행 수 (카탈로그에 못 넣은 행 포함)
+    source_max_id = db.Column(db.Integer)
+    synced_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,6 +1,6 @@
 # backend/app/models/shelter_review.py
 from enum import Enum
-from sqlalchemy import func, Numeric
+from sqlalchemy import func, Numeric, Index
 from ..db import db
 
 class ShelterType(Enum):
@@ -37,4 +37,9 @@ class ShelterReview(db.Model):
     comfort = db.Column(db.Enum(Comfort))
     accessibility_rating = db.Column(db.Enum(Accessibility))
     heating_cooling_status = db.Column(db.Enum(HVACStatus))
-    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        # list_reviews 키셋 페이지네이션: (타입, 쉼터) 필터 + created_at/id 역순 seek
+        Index('ix_review_type_shelter_created', 'shelter_type', 'shelter_id', 'created_at', 'id'),
+    )
\ No newline at end of file
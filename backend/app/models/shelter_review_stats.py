@@ -0,0 +1,26 @@
+# backend/app/models/shelter_review_stats.py
+# 쉼터별 리뷰 집계 (create_review 시 증분 갱신, rebuild_review_stats 로 일괄 재계산)
+from sqlalchemy import Numeric, func
+from ..db import db
+from .shelter_review import ShelterType
+
+class ShelterReviewStats(db.Model):
+    __tablename__ = "shelter_review_stats"
+
+    shelter_type = db.Column(db.Enum(ShelterType), primary_key=True)
+    shelter_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(Numeric(12, 1), nullable=False, default=0)
+    # 평균은 DB가 계산하는 생성 컬럼 → 증분 upsert 시 방언별 갱신 순서를 신경 쓸 필요 없음
+    # (* 1.0: SQLite 는 정수로 저장된 합계를 정수 나눗셈하므로 실수로 올린 뒤 나눈다)
+    rating_avg = db.Column(Numeric(3, 2), db.Computed("rating_sum * 1.0 / NULLIF(review_count, 0)", persisted=True))
+    # Comfort / Accessibility / HVACStatus 분포
+    comfort_easy = db.Column(db.Integer, nullable=False, default=0)
+    comfort_normal = db.Column(db.Integer, nullable=False, default=0)
+    comfort_crowded = db.Column(db.Integer, nullable=False, default=0)
+    access_high = db.Column(db.Integer, nullable=False, default=0)
+    access_mid = db.Column(db.Integer, nullable=False, default=0)
+    access_low = db.Column(db.Integer, nullable=False, default=0)
+    hvac_on = db.Column(db.Integer, nullable=False, default=0)
+    hvac_off = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
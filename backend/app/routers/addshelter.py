@@ -2,6 +2,10 @@
 from flask import Blueprint, request, jsonify, current_app
 from backend.app.db import db
 from backend.app.models.shelter_extra import Shelter
+from backend.app.utils.spatial_index import spatial_index
+from backend.app.utils.nearby_cache import nearby_cache
+from backend.app.utils.cluster_index import cluster_index
+from backend.app.utils.catalog import upsert_rows as upsert_catalog
 
 bp_shelter = Blueprint("shelter", __name__, url_prefix="/")
 
@@ -29,11 +33,26 @@ def add_shelter():
         )
 
         db.session.add(new_shelter)
+        db.session.flush()  # id 확정 → 카탈로그도 같은 트랜잭션에서
+        db.session.refresh(new_shelter)  # 폼 문자열이 아닌 DB 에 저장된 타입으로 (props 가 SQL 경로와 같도록)
+        row = {c.name: getattr(new_shelter, c.name) for c in Shelter.__table__.columns}
+        upsert_catalog(db.session, "extra", [row])
         db.session.commit()
 
-        return jsonify({"message": "저장 성공", "shelter_id": new_shelter.id}), 201
-
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"쉼터 저장 실패: {e}")
         return jsonify({"error": str(e)}), 500
+
+    # 커밋 이후: 인메모리 인덱스/캐시 반영 (꺼져 있으면 no-op).
+    # 여기서 실패해도 저장은 끝났으므로 로그만 남기고 201 (인덱스는 다음 재적재 때 맞춰진다)
+    try:
+        spatial_index.add("extra", row)
+        if new_shelter.latitude is not None and new_shelter.longitude is not None:
+            nearby_cache.invalidate_point("extra", new_shelter.latitude, new_shelter.longitude)
+        cluster_index.add("extra", new_shelter.id, new_shelter.shelter_name,
+                          new_shelter.latitude, new_shelter.longitude, new_shelter.time)
+    except Exception as e:
+        current_app.logger.error(f"쉼터 저장 후 인덱스 갱신 실패 (id={new_shelter.id}): {e}")
+
+    return jsonify({"message": "저장 성공", "shelter_id": new_shelter.id}), 201
@@ -2,7 +2,7 @@
 from flask import Blueprint, request, jsonify
 from ..db import db as sa_db
 from ..models.user import User
-from ..utils.security import create_access_token, create_refresh_token, decode_token, require_auth, get_current_user_id
+from ..utils.security import create_access_token, create_refresh_token, decode_token, require_auth, get_current_user
 import jwt
 
 bp = Blueprint("auth", __name__)
@@ -54,8 +54,7 @@ def login():
 @bp.get("/me")
 @require_auth
 def me():
-    uid = get_current_user_id()
-    u = sa_db.session.get(User, uid)
+    u = get_current_user()  # require_auth가 캐시에서 채운 스냅샷
     return jsonify({"id": u.id, "email": u.email, "age": u.age, "health_type": u.health_type})
 
 @bp.post("/refresh")
@@ -1,27 +1,29 @@
 # backend/app/routers/favorites.py
 from flask import Blueprint, request, jsonify, current_app
 from ..db import db
+from ..db.routing import read_replica
 from ..models.favorite import Favorite 
 from ..models.shelters_map import KIND_TO_TABLE
-import jwt
-from sqlalchemy import text, bindparam
+from sqlalchemy import and_, column, delete, or_, select, table, text
+from ..utils.pagination import keyset_page
+from ..utils.catalog import catalog, catalog_table
+from ..utils.security import user_id_from_request
+from ..utils.shelter_details import fetch_summaries_multi
+from ..utils.ttl_cache import TTLCache
+from ..utils.upsert import insert_ignore_stmt
 
 bp = Blueprint('favorites', __name__)
 
+# ?total=cached 용 사용자별 즐겨찾기 개수 (추가/해제 시 무효화)
+_total_cache = TTLCache(maxsize=10_000, ttl=60)
+
 # 안전한 화이트리스트 매핑만 허용
 def _valid_kind(kind: str) -> bool:
     return kind in KIND_TO_TABLE
 
 def _user_id_from_auth():
-    auth = request.headers.get('Authorization', '')
-    if not auth.startswith('Bearer '):
-        return None
-    try:
-        token = auth.split(' ', 1)[1]
-        payload = jwt.decode(token, current_app.config.get('JWT_SECRET', 'dev-secret'), algorithms=['HS256'])
-        return int(payload['sub'])
-    except Exception:
-        return None
+    # 공용 인증 계층(security) 사용: 토큰 디코딩 캐시, DB 조회 없음
+    return user_id_from_request()
 
 def _shelter_exists(kind: str, shelter_id: int) -> bool:
     if not _valid_kind(kind):
@@ -31,48 +33,33 @@ def _shelter_exists(kind: str, shelter_id: int) -> bool:
     row = db.session.execute(sql, {"id": shelter_id}).first()
     return row is not None
 
-def _fetch_shelters_by_ids(kind: str, ids: set[int]) -> dict[int, dict]:
-    """
-    id 집합으로 해당 kind 테이블에서 배치 조회.
-    컬럼 스키마가 약간 달라도 공통 필드는 최대한 뽑아 직렬화.
-    """
-    if not ids:
-        return {}
-    table = KIND_TO_TABLE[kind]
+def _existing_shelters(ids_by_kind: dict[str, set[int]]) -> set[tuple[str, int]]:
+    """{kind: ids} 중 실제 있는 (kind, id). 카탈로그가 덮으면 한 쿼리, 아니면 kind별 IN 한 번"""
+    ids_by_kind = {k: ids for k, ids in ids_by_kind.items() if ids}
+    if not ids_by_kind:
+        return set()
+    if catalog.covers(ids_by_kind):
+        t = catalog_table
+        rows = db.session.execute(select(t.c.kind, t.c.source_id).where(or_(*[
+            and_(t.c.kind == k, t.c.source_id.in_(list(ids))) for k, ids in ids_by_kind.items()
+        ]))).all()
+        return {(k, int(i)) for k, i in rows}
+    found = set()
+    for kind, ids in ids_by_kind.items():
+        t = table(KIND_TO_TABLE[kind], column('id'))
+        found.update((kind, int(i)) for i in db.session.execute(
+            select(t.c.id).where(t.c.id.in_(list(ids)))).scalars())
+    return found
 
-    stmt = text(f"""
-        SELECT
-            id,
-            /* 컬럼이 없다면 이 라인을 테이블별로 맞게 조정하거나 SELECT * 사용 */
-            shelter_name,
-            road_address,
-            lot_address,
-            capacity,
-            latitude,
-            longitude,
-            facility_type_1,
-            facility_type_2
-        FROM {table}
-        WHERE id IN :ids
-    """).bindparams(bindparam("ids", expanding=True))
-
-    rows = db.session.execute(stmt, {"ids": list(ids)}).mappings().all()
-
-    result = {}
-    for r in rows:
-        # r는 MappingResult(row) → dict처럼 접근 가능
-        result[r["id"]] = {
-            "id": r.get("id"),
-            "name": r.get("shelter_name"),
-            "road_address": r.get("road_address"),
-            "lot_address": r.get("lot_address"),
-            "capacity": r.get("capacity"),
-            "latitude": r.get("latitude"),
-            "longitude": r.get("longitude"),
-            "facility_type_1": r.get("facility_type_1"),
-            "facility_type_2": r.get("facility_type_2"),
-        }
-    return result
+def _user_favorites_among(user_id: int, ids_by_kind: dict[str, set[int]]) -> set[tuple[str, int]]:
+    """요청에 나온 쉼터 중 이미 즐겨찾기된 것 (uq_user_type_shelter 로 한 번)"""
+    t = Favorite.__table__
+    conds = [and_(t.c.shelter_type == k, t.c.shelter_id.in_(list(ids))) for k, ids in ids_by_kind.items() if ids]
+    if not conds:
+        return set()
+    rows = db.session.execute(
+        select(t.c.shelter_type, t.c.shelter_id).where(t.c.user_id == user_id, or_(*conds))).all()
+    return {(k, int(i)) for k, i in rows}
 
 @bp.post('/shelters/<string:shelter_type>/<int:shelter_id>/favorite')
 def add_favorite(shelter_type, shelter_id):
@@ -96,6 +83,7 @@ def add_favorite(shelter_type, shelter_id):
     fav = Favorite(user_id=user_id, shelter_type=shelter_type, shelter_id=shelter_id)
     db.session.add(fav)
     db.session.commit()
+    _total_cache.delete(user_id)
     return jsonify({'ok': True, 'favoriteId': fav.id})
 
 @bp.delete('/shelters/<string:shelter_type>/<int:shelter_id>/favorite')
@@ -113,13 +101,28 @@ def remove_favorite(shelter_type, shelter_id):
         .delete()
     )
     db.session.commit()
+    _total_cache.delete(user_id)
     return jsonify({'ok': True, 'removed': removed})
 
+def _favorites_total(user_id: int, mode: str | None):
+    if mode not in ('exact', 'cached'):
+        return None
+    if mode == 'cached':
+        total = _total_cache.get(user_id)
+        if total is not None:
+            return total
+    total = Favorite.query.filter(Favorite.user_id == user_id).count()
+    _total_cache.set(user_id, total)
+    return total
+
 @bp.get('/favorites')
+@read_replica
 def list_favorites():
     """
     통합 즐겨찾기 목록
-    - 쿼리: ?limit=20&offset=0
+    - 쿼리: ?limit=20&offset=0  (기존)
+    - 커서: ?cursor=&limit=20 → next_cursor 로 다음 페이지 (ix_fav_user_created 로 seek)
+    - ?total=exact|cached 이면 total 포함 (cached: 60초 캐시, 추가/해제 시 무효화)
     - 각 항목: favorite_id, created_at, shelter_type, shelter_id, shelter({...})
     """
     user_id = _user_id_from_auth()
@@ -130,26 +133,30 @@ def list_favorites():
     offset = int(request.args.get('offset', 0))
 
     # 1) favorites만 페이징해서 가져오기
-    fav_rows = (
-        Favorite.query
-        .filter(Favorite.user_id == user_id)
-        .order_by(Favorite.created_at.desc())
-        .limit(limit)
-        .offset(offset)
-        .all()
-    )
+    base = Favorite.query.filter(Favorite.user_id == user_id)
+    next_cursor = None
+    if 'cursor' in request.args:
+        try:
+            fav_rows, next_cursor = keyset_page(base, Favorite.created_at, Favorite.id,
+                                                request.args['cursor'] or None, limit)
+        except ValueError:
+            return jsonify({'message': 'Invalid cursor'}), 400
+    else:
+        fav_rows = (
+            base
+            .order_by(Favorite.created_at.desc(), Favorite.id.desc())
+            .limit(limit)
+            .offset(offset)
+            .all()
+        )
 
     # 2) kind별 id 모으기 → 테이블별 배치 조회(N+1 방지)
     ids_by_kind: dict[str, set[int]] = {}
     for f in fav_rows:
         ids_by_kind.setdefault(f.shelter_type, set()).add(f.shelter_id)
 
-    shelters_by_kind: dict[str, dict[int, dict]] = {}
-    for kind, idset in ids_by_kind.items():
-        if not _valid_kind(kind):
-            shelters_by_kind[kind] = {}
-            continue
-        shelters_by_kind[kind] = _fetch_shelters_by_ids(kind, idset)
+    # 통합 카탈로그가 있으면 kind 가 섞여도 한 쿼리 (모르는 kind 는 빈 dict)
+    shelters_by_kind = fetch_summaries_multi(db.session, ids_by_kind)
 
     # 3) 직렬화
     items = []
@@ -163,4 +170,101 @@ def list_favorites():
             "shelter": info if info is not None else None
         })
 
-    return jsonify({"items": items, "limit": limit, "offset": offset})
\ No newline at end of file
+    body = {"items": items, "limit": limit, "offset": offset, "next_cursor": next_cursor}
+    total = _favorites_total(user_id, request.args.get('total'))
+    if total is not None:
+        body["total"] = total
+    return jsonify(body)
+
+def _parse_sync_item(raw):
+    """{"op": "add"|"remove", "shelter_type": .., "shelter_id": ..} → (op, kind, id). 틀리면 ValueError"""
+    if not isinstance(raw, dict):
+        raise ValueError('item must be an object')
+    op = str(raw.get('op', '')).lower()
+    kind = str(raw.get('shelter_type', '')).strip().lower()
+    if op not in ('add', 'remove'):
+        raise ValueError('op must be add or remove')
+    if not _valid_kind(kind):
+        raise ValueError('Invalid shelter_type')
+    sid = raw.get('shelter_id')
+    # int("1.0")/True/12.7 같은 값이 조용히 다른 id 로 바뀌지 않도록 정수 또는 숫자 문자열만
+    if isinstance(sid, bool) or not (isinstance(sid, int) or (isinstance(sid, str) and sid.isascii() and sid.isdigit())):
+        raise ValueError('shelter_id must be an integer')
+    return op, kind, int(sid)
+
+@bp.post('/favorites/sync')
+def sync_favorites():
+    """
+    즐겨찾기 일괄 추가/해제 (오프라인 동기화)
+    - body: {"items": [{"op": "add"|"remove", "shelter_type": "heat", "shelter_id": 12}, ...]}
+    - 한 트랜잭션: 존재 확인(kind별 IN 한 번) → 기존 즐겨찾기 조회 한 번 → INSERT IGNORE 한 번 → DELETE 한 번
+    - 같은 쉼터가 여러 번 나오면 마지막 op 만 적용, 앞선 항목은 superseded
+    - results[i].status: added | already | removed | absent | not_found | invalid | superseded
+    """
+    user_id = _user_id_from_auth()
+    if not user_id:
+        return jsonify({'message': 'Unauthorized'}), 401
+    raw_items = (request.get_json(silent=True) or {}).get('items')
+    if not isinstance(raw_items, list) or not raw_items:
+        return jsonify({'message': 'items required'}), 400
+    max_items = int(current_app.config.get('FAVORITES_SYNC_MAX_ITEMS', 200))
+    if len(raw_items) > max_items:
+        return jsonify({'message': f'items 는 최대 {max_items}개'}), 400
+
+    results: list[dict] = []
+    final: dict[tuple[str, int], int] = {}  # (kind, id) → 마지막 항목 인덱스
+    for i, raw in enumerate(raw_items):
+        try:
+            op, kind, sid = _parse_sync_item(raw)
+        except (TypeError, ValueError) as e:
+            results.append({'index': i, 'status': 'invalid', 'error': str(e)})
+            continue
+        results.append({'index': i, 'op': op, 'shelter_type': kind, 'shelter_id': sid})
+        if (kind, sid) in final:
+            results[final[(kind, sid)]]['status'] = 'superseded'
+        final[(kind, sid)] = i
+
+    adds: dict[str, set[int]] = {}
+    removes: dict[str, set[int]] = {}
+    for (kind, sid), i in final.items():
+        (adds if results[i]['op'] == 'add' else removes).setdefault(kind, set()).add(sid)
+
+    touched = {k: adds.get(k, set()) | removes.get(k, set()) for k in set(adds) | set(removes)}
+    existing = _existing_shelters(adds)
+    before = _user_favorites_among(user_id, touched)
+
+    fav = Favorite.__table__
+    new_rows = [{'user_id': user_id, 'shelter_type': k, 'shelter_id': sid}
+                for k, ids in adds.items() for sid in ids
+                if (k, sid) in existing and (k, sid) not in before]
+    raced = set()  # 조회 이후 다른 요청이 먼저 넣어 건너뛴 키 → added 가 아니라 already
+    if new_rows:
+        # uq_user_type_shelter: 그 사이 다른 요청이 넣었어도 충돌 없이 건너뛴다
+        stmt = insert_ignore_stmt(fav, db.session.get_bind().dialect.name)
+        savepoint = db.session.begin_nested()
+        if db.session.execute(stmt, new_rows).rowcount == len(new_rows):
+            savepoint.commit()
+        else:  # 몇 행이 건너뛰어졌는지만 알 수 있으므로 되돌리고 한 행씩 (경합 시에만)
+            savepoint.rollback()
+            for row in new_rows:
+                if db.session.execute(stmt, row).rowcount == 0:
+                    raced.add((row['shelter_type'], row['shelter_id']))
+    gone = [and_(fav.c.shelter_type == k, fav.c.shelter_id.in_(sorted(ids)))
+            for k, ids in removes.items() if ids]
+    if gone:
+        db.session.execute(delete(fav).where(fav.c.user_id == user_id, or_(*gone)))
+    db.session.commit()
+    if new_rows or gone:
+        _total_cache.delete(user_id)
+
+    for key, i in final.items():
+        item = results[i]
+        if item['op'] == 'add':
+            item['status'] = 'already' if key in before or key in raced else 'added' if key in existing else 'not_found'
+        else:
+            item['status'] = 'removed' if key in before else 'absent'
+
+    summary = {}
+    for item in results:
+        summary[item['status']] = summary.get(item['status'], 0) + 1
+    return jsonify({'ok': True, 'results': results, 'summary': summary})
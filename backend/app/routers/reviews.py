@@ -1,10 +1,16 @@
 # backend/app/routers/reviews.py
+from concurrent.futures import TimeoutError as FutureTimeout
 from decimal import Decimal
 from flask import Blueprint, request, jsonify
 from ..db import db
+from ..db.routing import read_replica
 from ..models.shelter_review import ShelterReview, ShelterType
+from ..models.shelter_review_stats import ShelterReviewStats
 from ..utils.schemas import CreateReviewSchema, ReviewOutSchema
 from ..utils.security import require_auth, get_current_user_id
+from ..utils.review_stats import apply_reviews
+from ..utils.review_writer import review_writer
+from ..utils.pagination import keyset_page, encode_cursor
 
 bp = Blueprint("reviews", __name__, url_prefix="/shelters")
 _create_schema = CreateReviewSchema()
@@ -22,7 +28,7 @@ def parse_shelter_type(s: str) -> ShelterType | None:
         return None
 
 @bp.post("/<string:shelter_type>/<int:shelter_id>/reviews")
-@require_auth
+@require_auth(load_user_row=False)  # user id만 필요 → 인증에서 DB 조회 없음
 def create_review(shelter_type: str, shelter_id: int):
     st = parse_shelter_type(shelter_type)
     if not st:
@@ -32,7 +38,7 @@ def create_review(shelter_type: str, shelter_id: int):
     data = request.get_json(force=True) or {}
     payload = _create_schema.load(data)
 
-    review = ShelterReview(
+    row = dict(
         shelter_id=shelter_id,
         shelter_type=st,  # ← path에서 받은 타입
         user_id=user_id,
@@ -43,26 +49,67 @@ def create_review(shelter_type: str, shelter_id: int):
         accessibility_rating=payload.get("accessibility_rating"),
         heating_cooling_status=payload.get("heating_cooling_status"),
     )
+    # REVIEW_WRITE_BEHIND=1: 버퍼에 넣고 배치로 커밋 (큐가 가득이면 None → 아래 동기 경로)
+    fut = review_writer.submit(row)
+    if fut is not None:
+        if not review_writer.durable:  # REVIEW_ACK=queued
+            return jsonify({"status": "queued"}), 202
+        try:
+            saved = fut.result(timeout=review_writer.ack_timeout_s)
+        except FutureTimeout:  # 아직 큐에 있음 → 곧 커밋된다
+            return jsonify({"status": "queued"}), 202
+        return jsonify(_out_schema.dump(saved)), 201
+
+    review = ShelterReview(**row)
     db.session.add(review)
+    apply_reviews(db.session, [review])  # 집계도 같은 트랜잭션에서 증분 갱신
     db.session.commit()
     return jsonify(_out_schema.dump(review)), 201
 
+def _review_total(q, st: ShelterType, shelter_id: int, mode: str):
+    """exact: count() / approx: 집계 테이블의 review_count (PK 조회 한 번) / 그 외: None"""
+    if mode == "exact":
+        return q.with_entities(db.func.count()).scalar()
+    if mode == "approx":
+        stats = db.session.get(ShelterReviewStats, (st, shelter_id))
+        return stats.review_count if stats else 0
+    return None
+
 @bp.get("/<string:shelter_type>/<int:shelter_id>/reviews")
+@read_replica
 def list_reviews(shelter_type: str, shelter_id: int):
+    """
+    리뷰 목록 (최신순)
+    - 기존: ?page=1&size=10 → page/size/total 포함 (total은 ?total=approx|none 으로 바꿀 수 있음)
+    - 커서: ?cursor=&size=10 → next_cursor 로 다음 페이지. total은 ?total=approx|exact 일 때만
+    """
     st = parse_shelter_type(shelter_type)
     if not st:
         return jsonify({"error": "validation_error", "message": "invalid shelter_type"}), 400
 
-    page = max(int(request.args.get("page", 1)), 1)
     size = min(max(int(request.args.get("size", 10)), 1), 100)
+    total_mode = request.args.get("total")
 
-    q = (ShelterReview.query
-         .filter_by(shelter_id=shelter_id, shelter_type=st)  # ← 타입+id로 필터
-         .order_by(ShelterReview.created_at.desc()))
-    items = q.limit(size).offset((page - 1) * size).all()
-    total = q.with_entities(db.func.count()).scalar()
+    q = ShelterReview.query.filter_by(shelter_id=shelter_id, shelter_type=st)  # ← 타입+id로 필터
+
+    if "cursor" in request.args:
+        try:
+            items, next_cursor = keyset_page(q, ShelterReview.created_at, ShelterReview.id,
+                                             request.args["cursor"] or None, size)
+        except ValueError:
+            return jsonify({"error": "validation_error", "message": "invalid cursor"}), 400
+        body = {"size": size, "next_cursor": next_cursor, "items": _out_schema.dump(items, many=True)}
+        if total_mode:
+            body["total"] = _review_total(q, st, shelter_id, total_mode)
+        return jsonify(body)
+
+    page = max(int(request.args.get("page", 1)), 1)
+    items = (q.order_by(ShelterReview.created_at.desc(), ShelterReview.id.desc())
+             .limit(size).offset((page - 1) * size).all())
+    total = _review_total(q, st, shelter_id, total_mode or "exact")
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(items) == size else None
 
     return jsonify({
-        "page": page, "size": size, "total": total,
+        "page": page, "size": size, "total": total, "next_cursor": next_cursor,
         "items": _out_schema.dump(items, many=True)
-    })
\ No newline at end of file
+    })
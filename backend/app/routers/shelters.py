@@ -1,13 +1,25 @@
 # backend/app/routers/shelters.py
-from flask import Blueprint, request, jsonify
-from sqlalchemy import text
-from ..utils.repositories import get_nearby_multi_dynamic
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from ..utils.repositories import get_nearby
+from ..utils.batch_nearby import nearby_for_points, nearby_along_route
+from ..utils.review_stats import attach_ratings, ratings_for
+from ..utils.shelter_details import DETAIL, fetch_details, parse_key
 from ..db import db as sa_db
+from ..db.routing import read_replica
+from ..utils.http_pipeline import cacheable, compress_stream, json_line
+from ..utils.cluster_index import cluster_index
+from ..utils.catalog import catalog
+from ..utils.hours import parse_open_at
+from ..utils.ranking import HEALTH_PROFILES, profile_for, ranker
+from ..utils.security import load_user, user_id_from_request
+from ..utils.shelter_export import EXPORT, iter_batches, ndjson_lines, packed_frames, parse_bbox
 
 bp_dyn = Blueprint("shelters_dyn", __name__, url_prefix="/shelters")
 bp = bp_dyn
 
 @bp_dyn.get("/nearby")
+@cacheable
+@read_replica
 def nearby_multi():
     q = request.args
     try:
@@ -19,62 +31,240 @@ def nearby_multi():
     radius = float(q.get("radius", 1500))  # 반경
     limit  = int(q.get("limit", 20))  # 출력 개수 제한 
 
+    include = {x.strip() for x in q.get("include", "").split(",") if x.strip()}
+    # 데이터셋 간 중복 합치기 (기본값 NEARBY_DEDUP_DEFAULT, ?dedupe=0 이면 원본 그대로)
+    dedupe = q.get("dedupe", "1" if current_app.config.get("NEARBY_DEDUP_DEFAULT", True) else "0") == "1"
+    try:  # ?open_now=1 / ?open_at=2026-07-01T14:30 → 그 시각 운영 중인 곳만
+        open_at, include_unknown = _parse_open(q)
+    except ValueError:
+        return jsonify({"error": "open_at 은 ISO 시각 (예: 2026-07-01T14:30)"}), 400
+    # ?rank=1: 거리순 후보를 더 가져와서 개인화 점수 순 limit 개 (explain=1 이면 점수 구성)
+    rank = q.get("rank") == "1"
+    try:
+        health_type = int(q["health_type"]) if q.get("health_type") else None
+    except ValueError:
+        health_type = -1
+    if health_type is not None and health_type not in HEALTH_PROFILES:
+        return jsonify({"error": "health_type 은 1~9"}), 400
+
     s = sa_db.session
     try:
-        items = get_nearby_multi_dynamic(s, kinds, lat, lng, radius, limit)
+        status = {}
+        items = get_nearby(s, kinds, lat, lng, radius, ranker.candidates(limit) if rank else limit,
+                           status=status, dedupe=dedupe, open_at=open_at, include_unknown=include_unknown)
+        profile = None
+        if rank:  # ?health_type= 이 있으면 그것, 없으면 로그인 사용자의 건강 유형/나이
+            user = load_user(uid) if health_type is None and (uid := user_id_from_request()) else None
+            if user and user.health_type not in (None, *HEALTH_PROFILES):  # 저장된 값이 이상하면 나이로만
+                current_app.logger.warning(f"user {user.id} has unknown health_type {user.health_type}")
+                profile = profile_for(None, user.age)
+            else:
+                profile = profile_for(user.health_type, user.age) if user else profile_for(health_type)
+            items = ranker.rank(s, items, profile, limit, explain=q.get("explain") == "1",
+                                attach_ratings="ratings" in include)
+        elif "ratings" in include:  # 리뷰 집계(개수/평균/분포) 포함
+            attach_ratings(s, items)
         # 응답 예시: id(string), kind, latitude, longitude, distance_m, name(null 또는 값), props(json)
-        return jsonify({"count": len(items), "items": items})
+        # rank=1 이면 항목에 score (explain=1 이면 score_breakdown)
+        body = {"count": len(items), "items": items}
+        if profile is not None and q.get("explain") == "1":
+            body["ranking"] = ranker.describe(profile)
+        if status:  # NEARBY_EXEC_MODE=parallel: kind별 ok/timeout/error, 하나라도 빠지면 partial
+            body["partial"] = any(v["status"] != "ok" for v in status.values())
+            body["kinds_status"] = status
+        return jsonify(body)
     finally:
         s.close()
 
-@bp_dyn.get("/detail/<table>/<int:shelter_id>")
-def detail(table, shelter_id):
+def _parse_kinds(v) -> list[str]:
+    if isinstance(v, str):
+        v = v.split(",")
+    return [str(k).strip() for k in (v or []) if str(k).strip()]
+
+def _parse_open(q):
+    """(open_at, include_unknown). open_at 은 (요일, 분) 또는 None, 형식 오류는 ValueError"""
+    return parse_open_at(q), q.get("include_unknown") in ("1", "true")
+
+def _parse_latlng(p):
+    # {"lat":..,"lng":..} 또는 [lat, lng]
+    if isinstance(p, dict):
+        return float(p["lat"]), float(p["lng"])
+    lat, lng = p
+    return float(lat), float(lng)
+
+@bp_dyn.post("/nearby/batch")
+@read_replica
+def nearby_batch():
+    """
+    여러 지점 / 경로 주변 쉼터를 한 번에 조회
+    - 지점: {"kinds": "heat,climate", "radius": 500, "limit": 10, "points": [{"lat":..,"lng":..}, ...]}
+      → shelters(key→행, 중복 없이) + points[i].items([{key, distance_m}])
+    - 경로: {"kinds": [...], "polyline": [[lat,lng], ...], "corridor_m": 200, "limit": 50}
+      → 경로에서 corridor_m 이내 쉼터, 경로 진행 순서(route_offset_m) 정렬
+    """
+    cfg = current_app.config
+    body = request.get_json(silent=True) or {}
+    kinds = _parse_kinds(body.get("kinds"))
+    max_points = int(cfg.get("NEARBY_BATCH_MAX_POINTS", 200))
+    max_group_m = float(cfg.get("NEARBY_BATCH_MAX_GROUP_M", 5000))
+    cap = int(cfg.get("NEARBY_BATCH_CANDIDATE_CAP", 5000))
+    try:
+        points = [_parse_latlng(p) for p in body.get("points") or []]
+        polyline = [_parse_latlng(p) for p in body.get("polyline") or []]
+        radius = float(body.get("radius", 1500))
+        corridor = float(body.get("corridor_m", 200))
+        limit = int(body.get("limit", 20))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "points/polyline 좌표 형식 오류"}), 400
+    if bool(points) == bool(polyline):
+        return jsonify({"error": "points 또는 polyline 중 하나만 필요"}), 400
+    if len(points) > max_points or len(polyline) > max_points:
+        return jsonify({"error": f"좌표는 최대 {max_points}개"}), 400
+    if polyline and len(polyline) < 2:
+        return jsonify({"error": "polyline은 2개 이상의 좌표 필요"}), 400
+    limit = min(max(limit, 1), 100)
+
     s = sa_db.session
+    try:
+        if points:
+            shelters, results, truncated = nearby_for_points(
+                s, kinds, points, radius, limit, max_group_m, cap)
+            return jsonify({
+                "count": len(shelters),
+                "shelters": shelters,
+                "points": [{"lat": lat, "lng": lng, "items": res}
+                           for (lat, lng), res in zip(points, results)],
+                "truncated": truncated,
+            })
+        items, truncated = nearby_along_route(s, kinds, polyline, corridor, limit, max_group_m, cap)
+        return jsonify({"count": len(items), "items": items, "truncated": truncated})
+    finally:
+        s.close()
 
-    if table =="heat":
-        query=""" 
-                SELECT id, facility_type_2, shelter_name, road_address, capacity, latitude, longitude
-                FROM shelters_heat
-                WHERE id = :id
-            """
-
-    elif table=="smart":
-        query="""
-                SELECT id, facility_name, detailed_address, latitude, longitude
-                FROM shelters_smart
-                WHERE id = :id
-            """
-
-    elif table=="finedust":
-        query="""
-            SELECT id, shelter_name, road_address, capacity, `time` AS openclose, latitude, longitude
-            FROM shelters_finedust
-            WHERE id = :id
-            """
-
-    elif table=="climate":
-        query="""
-            SELECT id, facility_name, shelter_name, road_address, `time` AS openclose, latitude, longitude
-            FROM shelters_climate
-            WHERE id = :id
-            """
-    elif table=="extra":
-        query="""
-            SELECT id, shelter_name, road_address, facility_type, time, capacity, latitude, longitude, note
-            FROM shelters_extra
-            WHERE id = :id
-            """
-    else:
+@bp_dyn.get("/detail/<table>/<int:shelter_id>")
+@cacheable
+@read_replica
+def detail(table, shelter_id):
+    if table not in DETAIL:
         return jsonify({"error": "Invalid table"}),400
-        
-    row = s.execute(text(query), {"id": shelter_id}).fetchone()
+
+    s = sa_db.session
+    row = fetch_details(s, [(table, shelter_id)]).get((table, shelter_id))
     if row is None:
         return jsonify({"error": "Not found"}), 404
-        
-    # SQLAlchemy 2.x Row → dict
+
+    data = dict(row)
+    if "ratings" in request.args.get("include", "").split(","):
+        data["ratings"] = ratings_for(s, [(table, shelter_id)]).get((table, shelter_id))
+
+    return jsonify(data)
+
+@bp_dyn.get("/details")
+@cacheable
+@read_replica
+def details_batch():
+    """
+    여러 쉼터 상세를 한 번에: ?keys=heat:1,climate:20,smart:3 (&include=ratings)
+    - kind별 IN 쿼리 한 번 (상세 캐시에 있으면 DB 안 탐)
+    - items: {"kind:id": 상세}, missing: 없는 쉼터 키, invalid: 형식이 틀린 키
+    - ETag / If-None-Match 지원 (바뀐 게 없으면 304)
+    """
+    raw = [k for k in request.args.get("keys", "").split(",") if k.strip()]
+    max_keys = current_app.config.get("DETAIL_BATCH_MAX_KEYS", 200)
+    if not raw:
+        return jsonify({"error": "keys 필요"}), 400
+    if len(raw) > max_keys:
+        return jsonify({"error": f"keys 는 최대 {max_keys}개"}), 400
+
+    parsed, invalid = [], []
+    for k in raw:
+        key = parse_key(k)
+        if key is None:
+            invalid.append(k.strip())
+        else:
+            parsed.append(key)
+    parsed = list(dict.fromkeys(parsed))
+
+    s = sa_db.session
+    found = fetch_details(s, parsed)
+    ratings = ratings_for(s, found) if "ratings" in request.args.get("include", "").split(",") else None
+    items = {}
+    for key in parsed:
+        row = found.get(key)
+        if row is not None:
+            items[f"{key[0]}:{key[1]}"] = dict(row, ratings=ratings.get(key)) if ratings is not None else row
+    missing = [f"{k}:{i}" for k, i in parsed if (k, i) not in found]
+    return jsonify({"items": items, "missing": missing, "invalid": invalid})
+
+@bp_dyn.get("/export")
+@read_replica
+def export():
+    """
+    뷰포트 안 쉼터 전체 스트리밍: ?bbox=minLng,minLat,maxLng,maxLat&kinds=heat,smart&format=ndjson|packed
+    - 서버 사이드 커서로 EXPORT_YIELD_PER 행씩 읽어 바로 내보낸다 (limit 없음, 서버 메모리 일정)
+    - open_now=1 / open_at=ISO 시각: 운영 중인 곳만 (운영시간 모름은 include_unknown=1 일 때만)
+    - ndjson: 한 줄에 쉼터 하나 / packed: 배치 하나가 한 줄(좌표 델타 배열 + 문자열 사전), 마지막 줄 done
+    - Accept-Encoding 에 gzip/br 이 있으면 chunk 단위로 압축
+    """
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in ("ndjson", "packed"):
+        return jsonify({"error": "format 은 ndjson 또는 packed"}), 400
+    try:
+        bbox = parse_bbox(request.args.get("bbox", ""))
+    except ValueError:
+        return jsonify({"error": "bbox=minLng,minLat,maxLng,maxLat 필요"}), 400
+    kinds = [k for k in dict.fromkeys(_parse_kinds(request.args.get("kinds", "").lower())) if k in EXPORT]
+    if not kinds:
+        return jsonify({"error": "kinds 필요"}), 400
+    try:
+        open_at, include_unknown = _parse_open(request.args)
+    except ValueError:
+        return jsonify({"error": "open_at 은 ISO 시각 (예: 2026-07-01T14:30)"}), 400
+    indexed = open_at is not None and catalog.covers(kinds)
+
+    s = sa_db.session
+    yield_per = int(current_app.config.get("EXPORT_YIELD_PER", 1000))
+    encode = packed_frames if fmt == "packed" else ndjson_lines
+
+    def generate():
+        try:
+            yield from encode(iter_batches(s, kinds, bbox, yield_per, open_at, include_unknown, indexed), json_line)
+        finally:
+            s.close()
+
+    body, coding = compress_stream(generate(), request.headers.get("Accept-Encoding", ""))
+    resp = Response(stream_with_context(body), mimetype="application/x-ndjson")
+    resp.vary.add("Accept-Encoding")
+    if coding:
+        resp.headers["Content-Encoding"] = coding
+    return resp
+
+@bp_dyn.get("/clusters")
+@cacheable
+def clusters():
+    """
+    지도 축소 화면용 클러스터: ?bbox=minLng,minLat,maxLng,maxLat&zoom=11&kinds=heat,climate
+    - 미리 만든 줌별 클러스터 인덱스에서 뷰포트 안 항목만 (DB 안 탐)
+    - items: {"type":"cluster", count, expansion_zoom, ...} 또는 {"type":"point", id, name, ...}
+    - kind별 CLUSTER_MAX_ITEMS 초과 시 큰 클러스터부터 자르고 truncated=true
+    - open_now=1 / open_at=ISO 시각: 운영 중인 점만 다시 센 count (0개 클러스터는 빠짐)
+    - 인덱스가 꺼져 있거나 아직 준비 전이면 503
+    """
+    try:
+        bbox = parse_bbox(request.args.get("bbox", ""))
+        zoom = int(request.args["zoom"])
+    except (KeyError, ValueError):
+        return jsonify({"error": "bbox=minLng,minLat,maxLng,maxLat, zoom 필요"}), 400
+    kinds = [k for k in dict.fromkeys(_parse_kinds(request.args.get("kinds", "").lower())) if k in EXPORT]
+    if not kinds:
+        return jsonify({"error": "kinds 필요"}), 400
     try:
-        data = dict(row._mapping)
-    except AttributeError:
-        data = dict(row)
+        open_at, include_unknown = _parse_open(request.args)
+    except ValueError:
+        return jsonify({"error": "open_at 은 ISO 시각 (예: 2026-07-01T14:30)"}), 400
+    if not cluster_index.ready(kinds):
+        return jsonify({"error": "cluster index not ready"}), 503
 
-    return jsonify(data)  
\ No newline at end of file
+    items, truncated = cluster_index.query(kinds, bbox, zoom, int(current_app.config.get("CLUSTER_MAX_ITEMS", 2000)),
+                                           open_at, include_unknown)
+    return jsonify({"zoom": zoom, "count": len(items), "items": items, "truncated": truncated})
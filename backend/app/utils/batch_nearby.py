@@ -0,0 +1,132 @@
+# backend/app/utils/batch_nearby.py
+# 여러 지점 / 경로(polyline) 주변 쉼터를 한 번에 조회
+# - 가까운 지점들의 bbox를 묶어(group) 그룹마다 후보를 한 번만 가져온다 (get_nearby: 인덱스/캐시/SQL)
+# - 지점별 거리, 경로까지의 거리는 후보 배열에 대해 numpy로 계산
+# - 응답 행은 get_nearby_multi_dynamic 과 같은 id/kind/latitude/longitude/name/props 형식
+
+import math
+
+import numpy as np
+
+from .geo import M_PER_DEG_LAT, bbox, haversine_m
+from .repositories import get_nearby
+
+
+def shelter_key(item: dict) -> str:
+    return f"{item['kind']}:{item['id']}"
+
+
+def _circle_of(box) -> tuple[float, float, float]:
+    """bbox를 감싸는 원 (중심 lat, lng, 반지름 m)"""
+    min_lat, max_lat, min_lng, max_lng = box
+    c_lat, c_lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+    corners_lat = np.array([min_lat, min_lat, max_lat, max_lat])
+    corners_lng = np.array([min_lng, max_lng, min_lng, max_lng])
+    return c_lat, c_lng, float(haversine_m(c_lat, c_lng, corners_lat, corners_lng).max())
+
+
+def group_points(points: list[tuple[float, float]], radius_m: float, max_group_m: float):
+    """입력 순서대로 bbox를 이어 붙이다가, 감싸는 원이 max_group_m을 넘으면 새 그룹.
+    경로처럼 이어진 지점들은 겹치는 bbox가 한 그룹으로 묶여 후보 조회를 공유한다."""
+    groups = []  # [(bbox, [point index...])]
+    for i, (lat, lng) in enumerate(points):
+        b = bbox(lat, lng, radius_m)
+        if groups:
+            gb, members = groups[-1]
+            merged = (min(gb[0], b[0]), max(gb[1], b[1]), min(gb[2], b[2]), max(gb[3], b[3]))
+            if _circle_of(merged)[2] <= max_group_m:
+                groups[-1] = (merged, members + [i])
+                continue
+        groups.append((b, [i]))
+    return groups
+
+
+def _fetch_group(session, kinds, box, cap: int):
+    c_lat, c_lng, r = _circle_of(box)
+    items = get_nearby(session, kinds, c_lat, c_lng, r, cap)
+    return items, len(items) >= cap
+
+
+def nearby_for_points(session, kinds, points, radius_m: float, limit: int,
+                      max_group_m: float, candidate_cap: int):
+    """지점별 상위 limit개. 쉼터 본문은 shelters에 한 번만, 지점별로는 key + 거리만"""
+    shelters: dict[str, dict] = {}
+    results: list[list[dict]] = [[] for _ in points]
+    truncated = False
+    for box, members in group_points(points, radius_m, max_group_m):
+        cands, cut = _fetch_group(session, kinds, box, candidate_cap)
+        truncated |= cut
+        if not cands:
+            continue
+        lats = np.fromiter((float(c["latitude"]) for c in cands), dtype=np.float64, count=len(cands))
+        lngs = np.fromiter((float(c["longitude"]) for c in cands), dtype=np.float64, count=len(cands))
+        for pi in members:
+            lat, lng = points[pi]
+            d = haversine_m(lat, lng, lats, lngs)
+            idx = np.flatnonzero(d <= radius_m)
+            idx = idx[np.argsort(d[idx], kind="stable")][:limit]
+            for i in idx.tolist():
+                key = shelter_key(cands[i])
+                if key not in shelters:
+                    shelters[key] = {k: v for k, v in cands[i].items() if k != "distance_m"}
+                results[pi].append({"key": key, "distance_m": float(d[i])})
+    return shelters, results, truncated
+
+
+# ---- 경로(corridor) ----
+def _local_xy(lats, lngs, lat0: float, lng0: float):
+    """기준점 주변 등장방형 근사 (m). 경로 몇 km 범위에서는 오차가 무시할 만하다"""
+    k = M_PER_DEG_LAT
+    return (np.asarray(lngs) - lng0) * k * math.cos(math.radians(lat0)), (np.asarray(lats) - lat0) * k
+
+
+def densify(polyline: list[tuple[float, float]], step_m: float):
+    """선분을 step_m 이하 간격의 점들로 쪼갠다 (후보 조회용 샘플)"""
+    out = [polyline[0]]
+    for (a_lat, a_lng), (b_lat, b_lng) in zip(polyline, polyline[1:]):
+        seg = float(haversine_m(a_lat, a_lng, np.array([b_lat]), np.array([b_lng]))[0])
+        n = max(1, math.ceil(seg / step_m))
+        for s in range(1, n + 1):
+            t = s / n
+            out.append((a_lat + (b_lat - a_lat) * t, a_lng + (b_lng - a_lng) * t))
+    return out
+
+
+def nearby_along_route(session, kinds, polyline, corridor_m: float, limit: int,
+                       max_group_m: float, candidate_cap: int):
+    """경로에서 corridor_m 이내 쉼터 (중복 없이), 경로 진행 순서(route_offset_m)로 정렬"""
+    step = max(corridor_m, 50.0)
+    samples = densify(polyline, step)
+    # 경로 위 임의 점은 가장 가까운 샘플에서 step/2 안 → 샘플 반경을 그만큼 늘리면 빠짐없음
+    reach = corridor_m + step / 2
+
+    cands: dict[str, dict] = {}
+    truncated = False
+    for box, _ in group_points(samples, reach, max_group_m):
+        items, cut = _fetch_group(session, kinds, box, candidate_cap)
+        truncated |= cut
+        for it in items:
+            cands.setdefault(shelter_key(it), it)
+    if not cands:
+        return [], truncated
+
+    rows = list(cands.values())
+    lat0, lng0 = polyline[0]
+    px, py = _local_xy([float(r["latitude"]) for r in rows], [float(r["longitude"]) for r in rows], lat0, lng0)
+    vx, vy = _local_xy([p[0] for p in polyline], [p[1] for p in polyline], lat0, lng0)
+    ax, ay, bx, by = vx[:-1], vy[:-1], vx[1:], vy[1:]
+    dx, dy = bx - ax, by - ay
+    seg_len = np.hypot(dx, dy)
+    seg_len2 = np.where(seg_len > 0, seg_len ** 2, 1.0)
+    # (후보 × 선분) 행렬로 점-선분 거리를 한 번에
+    t = ((px[:, None] - ax) * dx + (py[:, None] - ay) * dy) / seg_len2
+    t = np.clip(t, 0.0, 1.0)
+    dist = np.hypot(px[:, None] - (ax + t * dx), py[:, None] - (ay + t * dy))
+    best = dist.argmin(axis=1)
+    d = dist[np.arange(len(rows)), best]
+    offset = np.concatenate(([0.0], np.cumsum(seg_len)))[best] + t[np.arange(len(rows)), best] * seg_len[best]
+
+    idx = np.flatnonzero(d <= corridor_m)
+    idx = idx[np.argsort(offset[idx], kind="stable")][:limit]
+    out = [dict(rows[i], distance_m=float(d[i]), route_offset_m=float(offset[i])) for i in idx.tolist()]
+    return out, truncated
@@ -0,0 +1,192 @@
+# backend/app/utils/catalog.py
+# 통합 쉼터 카탈로그 (shelters_all) 동기화 + 읽기 가능 여부
+# - 테이블마다 다른 이름/주소 컬럼을 여기 한 곳에서 통일 컬럼(name, road_address, capacity, hours)으로 옮긴다
+# - props 에는 좌표를 뺀 원본 행 전체를 JSON 으로 (nearby 의 props 와 같은 내용 → 요청마다 json_object 를 안 만든다)
+# - sync_kind: kind 하나를 통째로 다시 채움 (delete + upsert, 한 트랜잭션) — ingest / sync_catalog 명령
+# - upsert_rows: 한두 건 반영 — add_shelter (같은 트랜잭션)
+# - hours 문자열은 여기서 요일별 open/close 컬럼으로 파싱해 둔다 (open_now 필터가 SQL 조건이 되도록)
+# - 읽기 쪽(nearby/detail/favorites)은 covers(kinds) 가 참일 때만 카탈로그를 쓴다
+#   동기화 때 원본 테이블의 워터마크(MAX(id), 참고용 행 수)를 shelters_all_sync 에 남기고,
+#   table_watch(백그라운드 스레드, 공간 인덱스와 같은 틱)가 읽은 원본 MAX(id) 와 비교한다.
+#   다르면(원본에 직접 넣음, 동기화 누락) 그 kind 는 다시 동기화될 때까지 기존 kind별 경로
+#   (동기화된 적 없는 kind 도 마찬가지). covers() 자체는 DB 를 읽지 않는다
+
+import json
+import logging
+import time
+from typing import Iterable
+
+from sqlalchemy import MetaData, Table, case, column, delete, func, inspect, select, table, update
+
+from ..models.shelter_catalog import ShelterCatalog, ShelterCatalogSync
+from ..models.shelters_map import KIND_TO_TABLE
+from .hours import columns as hours_columns
+from .spatial_index import LAT_NAMES, LNG_NAMES, _pick_name, props_json
+from .upsert import upsert_stmt
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # 선택 의존성
+    _loads = json.loads
+
+log = logging.getLogger(__name__)
+
+catalog_table = ShelterCatalog.__table__
+sync_table = ShelterCatalogSync.__table__
+
+# kind → 통일 컬럼의 원본 컬럼 (없으면 NULL)
+SOURCE_COLUMNS = {
+    "heat": {"name": "shelter_name", "road_address": "road_address", "capacity": "capacity"},
+    "climate": {"name": "shelter_name", "road_address": "road_address", "hours": "time"},
+    "finedust": {"name": "shelter_name", "road_address": "road_address", "capacity": "capacity",
+                 "hours": "time"},
+    "smart": {"name": "facility_name", "road_address": "detailed_address"},
+    "extra": {"name": "shelter_name", "road_address": "road_address", "capacity": "capacity", "hours": "time"},
+}
+
+
+def _int_or_none(v):
+    try:
+        return int(float(v)) if v not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def catalog_row(kind: str, row: dict) -> dict | None:
+    """원본 행(dict) → shelters_all 행. id 나 좌표가 없으면 None (카탈로그에 못 넣음)"""
+    keys = list(row.keys())
+    lat_key, lng_key = _pick_name(keys, LAT_NAMES), _pick_name(keys, LNG_NAMES)
+    try:
+        lat, lng = float(row[lat_key]), float(row[lng_key])
+        sid = int(row["id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    src = SOURCE_COLUMNS.get(kind, {})
+    hours = row.get(src.get("hours", ""))
+    return {
+        "kind": kind,
+        "source_id": sid,
+        "name": row.get(src.get("name", "")),
+        "road_address": row.get(src.get("road_address", "")),
+        "capacity": _int_or_none(row.get(src.get("capacity", ""))),
+        "latitude": lat,
+        "longitude": lng,
+        "hours": hours,
+        **hours_columns(hours),
+        "props": props_json(row),
+    }
+
+
+def ensure_catalog_table(engine):
+    """shelters_all 이 없으면 만들고, 컬럼이 모델과 다르면 지우고 다시 만든다 (원본에서 언제든 다시 채울 수 있는 파생 테이블)"""
+    insp = inspect(engine)
+    sync_table.create(engine, checkfirst=True)
+    if insp.has_table(catalog_table.name):
+        have = {c["name"] for c in insp.get_columns(catalog_table.name)}
+        if have == {c.name for c in catalog_table.c}:
+            return False
+        log.warning("shelters_all schema changed, recreating (re-sync every kind)")
+        catalog_table.drop(engine)
+    with engine.begin() as conn:  # 비운 카탈로그에 옛 워터마크가 남으면 covers 가 참이 된다
+        conn.execute(delete(sync_table))
+    catalog_table.create(engine)
+    return True
+
+
+def source_watermark(conn, kind: str) -> tuple[int, int | None]:
+    """원본 shelters_<kind> 의 (행 수, MAX(id)). 동기화 작업용 (읽기 쪽은 table_watch 의 MAX(id) 만 본다)"""
+    t = table(KIND_TO_TABLE[kind], column("id"))
+    count, max_id = conn.execute(select(func.count(), func.max(t.c.id)).select_from(t)).one()
+    return int(count), (int(max_id) if max_id is not None else None)
+
+
+def upsert_rows(conn, kind: str, rows: Iterable[dict]) -> int:
+    """원본 행들을 카탈로그에 upsert (conn 은 Connection 또는 Session, 커밋은 호출부)"""
+    out = [r for r in (catalog_row(kind, dict(row)) for row in rows) if r is not None]
+    if out:
+        dialect = conn.get_bind().dialect if hasattr(conn, "get_bind") else conn.dialect  # Session / Connection
+        conn.execute(upsert_stmt(catalog_table, dialect.name, ("kind", "source_id")), out)
+    # 원본에 rows 가 막 들어갔으므로 워터마크도 같이 올린다 (안 그러면 다음 확인 때 이 kind 가 빠진다)
+    ids = [r["source_id"] for r in out]
+    if ids:
+        new_max = max(ids)
+        conn.execute(update(sync_table).where(sync_table.c.kind == kind).values(
+            source_rows=sync_table.c.source_rows + len(ids),
+            source_max_id=case((func.coalesce(sync_table.c.source_max_id, 0) < new_max, new_max),
+                               else_=sync_table.c.source_max_id)))
+    return len(out)
+
+
+def sync_kind(engine, kind: str, batch_size: int = 1000) -> int:
+    """shelters_<kind> 전체 → 카탈로그의 그 kind 를 통째로 교체. 커밋 전까지 읽는 쪽은 이전 내용을 본다"""
+    source = Table(KIND_TO_TABLE[kind], MetaData(), autoload_with=engine)
+    n = 0
+    with engine.begin() as conn:
+        rows, max_id = source_watermark(conn, kind)
+        conn.execute(delete(sync_table).where(sync_table.c.kind == kind))
+        conn.execute(delete(catalog_table).where(catalog_table.c.kind == kind))
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(select(source))
+        for part in result.mappings().partitions():
+            n += upsert_rows(conn, kind, part)
+        conn.execute(sync_table.insert().values(kind=kind, source_rows=rows, source_max_id=max_id))
+    catalog.invalidate()
+    return n
+
+
+def props_of(row) -> dict:
+    """카탈로그 행 → 원본 컬럼 dict (좌표는 통일 컬럼에서)"""
+    data = _loads(row["props"]) if row["props"] else {}
+    data["latitude"], data["longitude"] = row["latitude"], row["longitude"]
+    return data
+
+
+class Catalog:
+    """읽기 경로가 카탈로그를 써도 되는지 (kind별 워터마크 비교). table_watch 틱마다 갱신"""
+
+    def __init__(self):
+        self.enabled = True
+        self.counts: dict[str, int] = {}  # 동기화 시점 원본 행 수
+        self.current: set[str] = set()  # 워터마크가 원본 MAX(id) 와 같은 kind
+        self.stale: set[str] = set()  # 동기화는 됐지만 원본이 그 뒤로 바뀐 kind
+        self.checked_at: float | None = None
+
+    def init_app(self, app):
+        self.enabled = bool(app.config.get("CATALOG_READS", True))
+        if self.enabled:
+            from .table_watch import table_watch
+            table_watch.subscribe(self.on_tables)
+
+    def invalidate(self):
+        """다음 감시 틱을 기다리지 않고 다시 확인"""
+        from .table_watch import table_watch
+        table_watch.poke()
+
+    def on_tables(self, conn, max_ids: dict, schema_changed: set):
+        """table_watch 틱 (백그라운드 스레드): shelters_all_sync 만 읽는다 (원본 MAX(id) 는 감시 스레드가 읽음)"""
+        try:
+            marks = conn.execute(
+                select(sync_table.c.kind, sync_table.c.source_rows, sync_table.c.source_max_id)).all()
+        except Exception as e:  # 테이블이 아직 없으면 전부 기존 경로
+            conn.rollback()
+            log.warning("catalog status check failed: %s", e)
+            marks = []
+        current = {k for k, _, max_id in marks if k in max_ids and max_ids[k] == max_id}
+        stale = {k for k, *_ in marks} - current
+        if stale - self.stale:  # 틱마다 같은 경고를 반복하지 않도록 새로 어긋난 kind 만
+            log.warning("catalog out of date for %s, using per-kind tables until re-sync", sorted(stale))
+        self.counts = {k: n for k, n, _ in marks}
+        self.current, self.stale = current, stale
+        self.checked_at = time.time()
+
+    def covers(self, kinds: Iterable[str]) -> bool:
+        if not self.enabled:
+            return False
+        kinds = list(kinds)
+        return bool(kinds) and all(k in self.current for k in kinds)
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "checked_at": self.checked_at, "kinds": dict(self.counts),
+                "current": sorted(self.current), "stale": sorted(self.stale)}
+
+
+catalog = Catalog()
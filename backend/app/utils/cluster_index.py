@@ -0,0 +1,374 @@
+# backend/app/utils/cluster_index.py
+# 지도 축소 화면용 계층 클러스터 인덱스 (/shelters/clusters, supercluster 방식)
+# - kind별로 좌표를 Web Mercator [0,1] 평면에 올리고, max_zoom+1(원본 점)부터 min_zoom 까지
+#   한 단계씩 "반경 radius 픽셀 안의 이웃을 묶기"를 반복해 줌별 레벨을 미리 만든다
+# - 레벨마다 x 정렬 배열 → 뷰포트 조회는 searchsorted 두 번 + y 필터 (쿼리 시 DB/클러스터링 없음)
+# - 빌드는 시작 시(CLUSTER_INDEX_ENABLED) 또는 `python -m backend.app.db.build_clusters` 로 만든 스냅샷 적재
+# - /add_shelter 로 점이 하나 늘면 다시 묶지 않고 레벨마다 그 점만 끼워 넣는다 (with_point):
+#   위 줌부터 내려가며 반경 안 가장 가까운 항목에 합치고, 한 번 합쳐지면 아래 줌은 그 항목을 품은 클러스터에 합친다.
+#   탐욕적이라 전체 재빌드와 묶음이 조금 다를 수 있다 → 다음 시작/스냅샷 빌드 때 정리된다
+# - 인덱스는 워커(프로세스)마다 따로다. add() 는 요청을 받은 워커만 고치고, 다른 워커는
+#   다음 시작 때(스냅샷 + extra 를 DB 에서 다시 빌드) 반영한다
+# - open_at 필터: 원본 점마다 요일별 운영시간 배열 + 레벨별 "원본 점 → 그 레벨 항목" 맵을 들고 있다가
+#   운영 중인 점만 bincount 로 다시 센다 (클러스터 위치는 그대로, 0개가 된 클러스터는 빠짐)
+
+import logging
+import math
+import pickle
+import threading
+import time
+from typing import Iterable
+
+import numpy as np
+
+from ..models.shelters_map import KIND_TO_TABLE
+from .hours import open_mask, parse as parse_hours
+from .shelter_export import EXPORT_WITH_HOURS, WORLD_BBOX
+
+log = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 3  # 2: 운영시간 배열 + 레벨별 leaf_map, 3: 증분 추가용 반경 파라미터
+
+
+def project(lats, lngs):
+    """위경도 → Web Mercator 단위 좌표 (x, y ∈ [0, 1])"""
+    lats = np.clip(np.asarray(lats, dtype=np.float64), -85.0511, 85.0511)
+    x = np.asarray(lngs, dtype=np.float64) / 360.0 + 0.5
+    s = np.sin(np.radians(lats))
+    y = 0.5 - 0.25 * np.log((1 + s) / (1 - s)) / math.pi
+    return x, y
+
+
+class _Level:
+    """줌 하나의 점/클러스터. x 오름차순으로 정렬해 둔다
+    leaf_map[원본 점] = 그 점이 들어 있는 이 레벨 항목 (unsorted_map 은 정렬 전 위치 기준)"""
+
+    def __init__(self, x, y, lat, lng, count, expansion, leaf, unsorted_map):
+        order = np.argsort(x, kind="stable")
+        self.x, self.y = x[order], y[order]
+        self.lat, self.lng = lat[order], lng[order]
+        self.count, self.expansion, self.leaf = count[order], expansion[order], leaf[order]
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        self.leaf_map = rank[unsorted_map]
+
+    def __len__(self):
+        return len(self.x)
+
+    def nearest(self, x, y, r) -> int:
+        """(x, y) 에서 반경 r 안 가장 가까운 항목 (없으면 -1)"""
+        idx = self.within(x - r, x + r, y - r, y + r)
+        if idx.size == 0:
+            return -1
+        d2 = (self.x[idx] - x) ** 2 + (self.y[idx] - y) ** 2
+        best = int(np.argmin(d2))
+        return int(idx[best]) if d2[best] <= r * r else -1
+
+    def with_point(self, x, y, lat, lng, leaf: int, target: int, expansion: int) -> "_Level":
+        """새 원본 점(leaf) 을 넣은 새 레벨. target 이 -1 이면 단독 점으로, 아니면 그 항목에 합친다"""
+        cx, cy, clat, clng = self.x.copy(), self.y.copy(), self.lat.copy(), self.lng.copy()
+        count, exp, leaves = self.count.copy(), self.expansion.copy(), self.leaf.copy()
+        if target < 0:
+            target = len(cx)
+            cx, cy, clat, clng = (np.append(a, v) for a, v in ((cx, x), (cy, y), (clat, lat), (clng, lng)))
+            count, exp = np.append(count, 1), np.append(exp, np.int16(-1))
+            leaves = np.append(leaves, leaf)
+        else:  # 가중 평균으로 중심 이동, 단독 점이었으면 2개짜리 클러스터가 된다
+            c = count[target]
+            for a, v in ((cx, x), (cy, y), (clat, lat), (clng, lng)):
+                a[target] = (a[target] * c + v) / (c + 1)
+            count[target] = c + 1
+            if leaves[target] >= 0:
+                leaves[target] = -1
+                exp[target] = expansion
+        return _Level(cx, cy, clat, clng, count, exp, leaves, np.append(self.leaf_map, target))
+
+    def within(self, x0, x1, y0, y1) -> np.ndarray:
+        lo = np.searchsorted(self.x, x0, side="left")
+        hi = np.searchsorted(self.x, x1, side="right")
+        idx = np.arange(lo, hi)
+        ys = self.y[lo:hi]
+        return idx[(ys >= y0) & (ys <= y1)]
+
+
+def _cluster(prev: _Level, zoom: int, r: float, min_points: int) -> _Level:
+    """zoom+1 레벨을 반경 r(단위 좌표) 로 묶어 zoom 레벨을 만든다 (탐욕적, 격자 버킷으로 이웃 탐색)"""
+    n = len(prev)
+    ci = np.floor(prev.x / r).astype(np.int64).tolist()
+    cj = np.floor(prev.y / r).astype(np.int64).tolist()
+    buckets: dict[tuple[int, int], list[int]] = {}
+    for i, key in enumerate(zip(ci, cj)):
+        buckets.setdefault(key, []).append(i)
+
+    xs, ys, counts = prev.x.tolist(), prev.y.tolist(), prev.count.tolist()
+    r2 = r * r
+    visited = bytearray(n)
+    out_idx, merged = [], []  # 그대로 넘기는 점 인덱스 / 새 클러스터 멤버 목록
+    for i in range(n):
+        if visited[i]:
+            continue
+        visited[i] = 1
+        xi, yi = xs[i], ys[i]
+        nb = []
+        for a in (ci[i] - 1, ci[i], ci[i] + 1):
+            for b in (cj[i] - 1, cj[i], cj[i] + 1):
+                for j in buckets.get((a, b), ()):
+                    if not visited[j] and (xs[j] - xi) ** 2 + (ys[j] - yi) ** 2 <= r2:
+                        nb.append(j)
+        if not nb or counts[i] + sum(counts[j] for j in nb) < min_points:
+            out_idx.append(i)
+            continue
+        for j in nb:
+            visited[j] = 1
+        merged.append([i] + nb)
+
+    keep = np.asarray(out_idx, dtype=np.int64)
+    remap = np.empty(n, dtype=np.int64)  # prev 항목 → 새 레벨의 정렬 전 위치
+    remap[keep] = np.arange(len(keep))
+    parts = [(prev.x[keep], prev.y[keep], prev.lat[keep], prev.lng[keep],
+              prev.count[keep], prev.expansion[keep], prev.leaf[keep])]
+    if merged:
+        m = len(merged)
+        owner = np.repeat(np.arange(m), [len(g) for g in merged])
+        members = np.fromiter((j for g in merged for j in g), dtype=np.int64, count=len(owner))
+        w = prev.count[members].astype(np.float64)
+        cnt = np.bincount(owner, weights=w, minlength=m)
+
+        def wmean(v):
+            return np.bincount(owner, weights=v[members] * w, minlength=m) / cnt
+
+        parts.append((wmean(prev.x), wmean(prev.y), wmean(prev.lat), wmean(prev.lng),
+                      cnt.astype(np.int64), np.full(m, zoom + 1, dtype=np.int16), np.full(m, -1, dtype=np.int64)))
+        remap[members] = len(keep) + owner
+    return _Level(*(np.concatenate(cols) for cols in zip(*parts)), remap[prev.leaf_map])
+
+
+def _hours_arrays(hours: list):
+    """운영시간 문자열 목록 → (opens, closes, unknown). opens/closes 는 (n, 7) 분, 쉬는 날 -1"""
+    n = len(hours)
+    opens = np.full((n, 7), -1, dtype=np.int16)
+    closes = np.full((n, 7), -1, dtype=np.int16)
+    unknown = np.ones(n, dtype=bool)
+    for i, text in enumerate(hours):
+        parsed = parse_hours(text)
+        if parsed is None:
+            continue
+        unknown[i] = False
+        for d, (o, c) in parsed.items():
+            opens[i, d], closes[i, d] = o, c
+    return opens, closes, unknown
+
+
+class KindClusters:
+    """kind 하나의 원본 점 + 줌별 레벨"""
+
+    def __init__(self, kind: str, ids: list, names: list, lats, lngs,
+                 min_zoom: int, max_zoom: int, radius_px: float, extent: int, min_points: int,
+                 hours: list | None = None):
+        self.kind = kind
+        self.ids, self.names = ids, names
+        self.hours = list(hours) if hours is not None else [None] * len(ids)
+        self.opens, self.closes, self.unknown = _hours_arrays(self.hours)
+        self.min_zoom, self.max_zoom = min_zoom, max_zoom
+        self.lats = lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = lngs = np.asarray(lngs, dtype=np.float64)
+        n = len(lats)
+        x, y = project(lats, lngs)
+        level = _Level(x, y, lats, lngs, np.ones(n, dtype=np.int64), np.full(n, -1, dtype=np.int16),
+                       np.arange(n, dtype=np.int64), np.arange(n, dtype=np.int64))
+        self.radius_px, self.extent, self.min_points = radius_px, extent, min_points
+        self.levels = {max_zoom + 1: level}
+        for z in range(max_zoom, min_zoom - 1, -1):
+            level = _cluster(level, z, radius_px / (extent * 2 ** z), min_points)
+            self.levels[z] = level
+
+    def with_point(self, sid, name, lat: float, lng: float, hours=None) -> "KindClusters":
+        """점 하나를 레벨마다 끼워 넣은 새 객체 (copy-on-write, 다시 묶지 않음)"""
+        new = object.__new__(KindClusters)
+        new.__dict__.update(self.__dict__)
+        leaf = len(self.ids)
+        new.ids, new.names, new.hours = self.ids + [sid], self.names + [name], self.hours + [hours]
+        o, c, u = _hours_arrays([hours])
+        new.opens, new.closes = np.vstack((self.opens, o)), np.vstack((self.closes, c))
+        new.unknown = np.append(self.unknown, u)
+        new.lats, new.lngs = np.append(self.lats, lat), np.append(self.lngs, lng)
+        (x,), (y,) = project([lat], [lng])
+        top = self.max_zoom + 1
+        new.levels = {top: self.levels[top].with_point(x, y, lat, lng, leaf, -1, -1)}
+        anchor = -1  # 합쳐진 뒤엔 같은 클러스터에 있던 기존 원본 점을 따라 내려간다
+        for z in range(self.max_zoom, self.min_zoom - 1, -1):
+            level = self.levels[z]
+            if anchor >= 0:
+                target = int(level.leaf_map[anchor])
+            else:
+                target = level.nearest(x, y, self.radius_px / (self.extent * 2 ** z))
+                if target >= 0 and level.count[target] + 1 < self.min_points:
+                    target = -1
+                if target >= 0:
+                    anchor = int(np.flatnonzero(level.leaf_map == target)[0])
+            new.levels[z] = level.with_point(x, y, lat, lng, leaf, target, z + 1)
+        return new
+
+    def query(self, bbox: dict, zoom: int, limit: int,
+              open_at: tuple[int, int] | None = None, include_unknown: bool = False) -> tuple[list[dict], bool]:
+        z = min(max(int(zoom), self.min_zoom), self.max_zoom + 1)
+        level = self.levels[z]
+        (x0, x1), (y1, y0) = project([bbox["min_lat"], bbox["max_lat"]], [bbox["min_lng"], bbox["max_lng"]])
+        idx = level.within(x0, x1, y0, y1)
+        count, leaf = level.count, level.leaf
+        if open_at is not None:  # 운영 중인 원본 점만 다시 세고, 1개 남은 클러스터는 그 점으로
+            open_leaves = np.flatnonzero(open_mask(self.opens, self.closes, self.unknown, *open_at, include_unknown))
+            entries = level.leaf_map[open_leaves]
+            count = np.bincount(entries, minlength=len(level))
+            leaf = np.full(len(level), -1, dtype=np.int64)
+            leaf[entries] = open_leaves
+            leaf[count != 1] = -1
+            idx = idx[count[idx] > 0]
+        truncated = len(idx) > limit
+        if truncated:  # 큰 클러스터부터
+            idx = idx[np.argsort(-count[idx], kind="stable")[:limit]]
+        out = []
+        for i, lat, lng, cnt, exp, leaf in zip(idx.tolist(), level.lat[idx].tolist(), level.lng[idx].tolist(),
+                                                count[idx].tolist(), level.expansion[idx].tolist(),
+                                                leaf[idx].tolist()):
+            if leaf >= 0:
+                lat, lng = self.lats[leaf].item(), self.lngs[leaf].item()
+                out.append({"type": "point", "kind": self.kind, "id": self.ids[leaf],
+                            "latitude": lat, "longitude": lng, "name": self.names[leaf]})
+            else:
+                out.append({"type": "cluster", "kind": self.kind, "latitude": lat, "longitude": lng,
+                            "count": cnt, "expansion_zoom": min(exp, self.max_zoom + 1)})
+        return out, truncated
+
+
+class ClusterIndex:
+    def __init__(self):
+        self.enabled = False
+        self.min_zoom, self.max_zoom = 0, 16
+        self.radius_px, self.extent, self.min_points = 60.0, 512, 2
+        self.snapshot_path = ""
+        self.built_at: float | None = None
+        self._kinds: dict[str, KindClusters] = {}
+        self._lock = threading.Lock()
+        self.added = 0
+
+    def init_app(self, app):
+        cfg = app.config
+        self.enabled = bool(cfg.get("CLUSTER_INDEX_ENABLED", False))
+        self.min_zoom = int(cfg.get("CLUSTER_MIN_ZOOM", 0))
+        self.max_zoom = int(cfg.get("CLUSTER_MAX_ZOOM", 16))
+        self.radius_px = float(cfg.get("CLUSTER_RADIUS_PX", 60))
+        self.extent = int(cfg.get("CLUSTER_EXTENT", 512))
+        self.snapshot_path = cfg.get("CLUSTER_SNAPSHOT_PATH", "")
+        if not self.enabled:
+            return
+        from ..db import db
+        with app.app_context():
+            try:
+                if self.snapshot_path and self.load_snapshot(self.snapshot_path):
+                    # 스냅샷 이후 /add_shelter 로 늘었을 수 있는 extra 만 DB 에서 다시
+                    self.build(db.engine, ["extra"])
+                else:
+                    self.build(db.engine)
+            except Exception as e:  # 인덱스 없이도 앱은 떠야 함 → /shelters/clusters 는 503
+                log.warning("cluster index build failed: %s", e)
+
+    @property
+    def params(self) -> tuple:
+        return self.min_zoom, self.max_zoom, self.radius_px, self.extent, self.min_points
+
+    def _make(self, kind: str, ids, names, lats, lngs, hours) -> KindClusters:
+        return KindClusters(kind, ids, names, lats, lngs, self.min_zoom, self.max_zoom,
+                            self.radius_px, self.extent, self.min_points, hours)
+
+    # ---- 빌드 ----
+    def _build_kind(self, conn, kind: str) -> KindClusters:
+        ids, names, lats, lngs, hours = [], [], [], [], []
+        for r in conn.execute(EXPORT_WITH_HOURS[kind], WORLD_BBOX).mappings():
+            try:
+                lat, lng = float(r["latitude"]), float(r["longitude"])
+            except (TypeError, ValueError):
+                continue
+            if math.isnan(lat) or math.isnan(lng):
+                continue
+            ids.append(r["id"]); names.append(r.get("name")); lats.append(lat); lngs.append(lng)
+            hours.append(r.get("hours"))
+        return self._make(kind, ids, names, lats, lngs, hours)
+
+    def build(self, engine, kinds: Iterable[str] | None = None):
+        """테이블에서 읽어 kind별 레벨을 (재)구성. 실패한 kind 는 빠진다"""
+        kinds = list(kinds) if kinds is not None else list(KIND_TO_TABLE)
+        started = time.perf_counter()
+        built = {}
+        with engine.connect() as conn:
+            for k in kinds:
+                try:
+                    built[k] = self._build_kind(conn, k)
+                except Exception as e:
+                    log.warning("cluster index: skip kind=%s (%s)", k, e)
+        with self._lock:
+            self._kinds.update(built)
+            self.built_at = time.time()
+        log.info("cluster index built %s in %.1fms",
+                 {k: len(c.ids) for k, c in built.items()}, (time.perf_counter() - started) * 1000)
+        return built
+
+    # ---- 스냅샷 (build_clusters 명령 ↔ 앱 시작) ----
+    def save_snapshot(self, path: str):
+        with open(path, "wb") as f:
+            pickle.dump({"version": SNAPSHOT_VERSION, "params": self.params,
+                         "built_at": self.built_at, "kinds": self._kinds}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_snapshot(self, path: str) -> bool:
+        """파라미터가 같은 스냅샷이면 적재. 없거나 다르면 False (→ DB 에서 빌드)"""
+        try:
+            with open(path, "rb") as f:
+                snap = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            log.warning("cluster snapshot %s unreadable: %s", path, e)
+            return False
+        if snap.get("version") != SNAPSHOT_VERSION or tuple(snap.get("params", ())) != self.params:
+            log.info("cluster snapshot %s built with other params, rebuilding", path)
+            return False
+        with self._lock:
+            self._kinds = dict(snap["kinds"])
+            self.built_at = snap["built_at"]
+        return True
+
+    # ---- 갱신 ----
+    def add(self, kind: str, sid, name, lat, lng, hours=None):
+        """/add_shelter 직후: 그 kind 에 점 하나를 증분으로 넣고 교체 (레벨마다 정렬 한 번, 다시 묶지 않음)"""
+        if not self.enabled or lat is None or lng is None:
+            return
+        with self._lock:
+            cur = self._kinds.get(kind)
+            if cur is None:
+                return
+            self._kinds[kind] = cur.with_point(sid, name, float(lat), float(lng), hours)
+            self.added += 1
+
+    # ---- 조회 ----
+    def ready(self, kinds: Iterable[str]) -> bool:
+        return self.enabled and all(k in self._kinds for k in kinds)
+
+    def query(self, kinds: Iterable[str], bbox: dict, zoom: int, limit: int,
+              open_at: tuple[int, int] | None = None, include_unknown: bool = False) -> tuple[list[dict], bool]:
+        items, truncated = [], False
+        for k in kinds:
+            part, cut = self._kinds[k].query(bbox, zoom, limit, open_at, include_unknown)
+            items.extend(part)
+            truncated |= cut
+        return items, truncated
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "built_at": self.built_at,
+            "kinds": {k: len(c.ids) for k, c in self._kinds.items()},
+            "added": self.added,
+        }
+
+
+cluster_index = ClusterIndex()
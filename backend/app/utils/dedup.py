@@ -0,0 +1,231 @@
+# backend/app/utils/dedup.py
+# 데이터셋 간 중복 쉼터 찾기 + nearby 결과 합치기
+# - 오프라인(build_canonical): 모든 kind 의 점을 격자(셀 한 변 ≥ 반경)에 넣고 이웃 셀끼리만 비교
+#   → 거리 DEDUP_RADIUS_M 이내 + 정규화한 이름 유사도 DEDUP_MIN_SCORE 이상(또는 도로명주소 일치)이면 같은 시설
+#   union-find 로 묶고 KIND_PRIORITY 가 가장 앞선 쉼터를 대표로 shelter_canonical 에 저장
+# - 요청 시: 매핑을 메모리 dict 로 들고 nearby 결과를 대표 기준으로 합친다 (DB 조회 없음)
+
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from difflib import SequenceMatcher
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+
+from ..models.shelter_canonical import ShelterCanonical
+from .geo import M_PER_DEG_LAT, haversine_m
+
+log = logging.getLogger(__name__)
+
+# 대표로 고를 순서 (앞일수록 정보가 많은 데이터셋)
+KIND_PRIORITY = ("heat", "climate", "finedust", "smart", "extra")
+
+ADDRESS_MATCH_SCORE = 0.9  # 이름이 달라도 도로명주소가 같으면 이 점수로 본다
+
+_canonical = ShelterCanonical.__table__
+_PUNCT = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def normalize(text) -> str:
+    """비교용 문자열: NFKC, 소문자, 공백/문장부호 제거 ("행당 한신(아) 경로당" → "행당한신아경로당")"""
+    if not text:
+        return ""
+    return _PUNCT.sub("", unicodedata.normalize("NFKC", str(text)).lower())
+
+
+def similarity(a: str, b: str) -> float:
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    if a in b or b in a:  # "OO경로당" ↔ "OO아파트OO경로당" 같은 접두/접미 차이
+        return max(0.9, SequenceMatcher(None, a, b).ratio())
+    return SequenceMatcher(None, a, b).ratio()
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_duplicates(points: list[dict], radius_m: float, min_score: float) -> list[dict]:
+    """points: [{kind, id, latitude, longitude, name, road_address}] → shelter_canonical 행 목록
+    다른 kind 끼리만 비교한다 (같은 데이터셋 안의 중복은 원본 문제라 여기서 합치지 않는다)"""
+    n = len(points)
+    if n == 0:
+        return []
+    lats = np.fromiter((p["latitude"] for p in points), dtype=np.float64, count=n)
+    lngs = np.fromiter((p["longitude"] for p in points), dtype=np.float64, count=n)
+    # 셀 한 변이 가로/세로 모두 반경 이상이 되도록 (경도는 가장 높은 위도의 cos 로)
+    cell_lat = radius_m / M_PER_DEG_LAT
+    cell_lng = radius_m / (M_PER_DEG_LAT * max(0.01, math.cos(math.radians(float(np.abs(lats).max())))))
+    ci = np.floor(lats / cell_lat).astype(np.int64).tolist()
+    cj = np.floor(lngs / cell_lng).astype(np.int64).tolist()
+    buckets: dict[tuple[int, int], list[int]] = {}
+    for i, key in enumerate(zip(ci, cj)):
+        buckets.setdefault(key, []).append(i)
+
+    names = [normalize(p.get("name")) for p in points]
+    addrs = [normalize(p.get("road_address")) for p in points]
+    kinds = [p["kind"] for p in points]
+    uf = _UnionFind(n)
+    best: dict[int, tuple[float, float]] = {}  # 점 → (score, distance) 가장 잘 맞은 짝 기준
+    pairs = 0
+    for (a, b), members in buckets.items():
+        # 같은 셀은 뒤쪽 점만, 이웃 셀은 "앞쪽" 4칸만 → 점 쌍을 한 번씩만 본다
+        forward = [j for da, db_ in ((0, 1), (1, -1), (1, 0), (1, 1))
+                   for j in buckets.get((a + da, b + db_), ())]
+        for pos, i in enumerate(members):
+            cand = [j for j in members[pos + 1:] + forward if kinds[j] != kinds[i]]
+            if not cand:
+                continue
+            idx = np.asarray(cand)
+            d = haversine_m(lats[i], lngs[i], lats[idx], lngs[idx])
+            for j, dist in zip(cand, d.tolist()):
+                if dist > radius_m:
+                    continue
+                pairs += 1
+                score = similarity(names[i], names[j])
+                if addrs[i] and addrs[i] == addrs[j]:
+                    # 주소는 번지 하나 차이로도 비율이 높게 나와서 유사도 대신 완전 일치만 본다
+                    score = max(score, ADDRESS_MATCH_SCORE)
+                if score < min_score:
+                    continue
+                uf.union(i, j)
+                for k in (i, j):
+                    if score > best.get(k, (0.0, 0.0))[0]:
+                        best[k] = (score, dist)
+    log.info("dedup: %d points, %d candidate pairs within %.0fm", n, pairs, radius_m)
+
+    groups: dict[int, list[int]] = {}
+    for i in best:
+        groups.setdefault(uf.find(i), []).append(i)
+    rank = {k: r for r, k in enumerate(KIND_PRIORITY)}
+    rows = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        head = min(members, key=lambda i: (rank.get(kinds[i], len(rank)), int(points[i]["id"])))
+        d = haversine_m(lats[head], lngs[head], lats[members], lngs[members]).tolist()
+        for i, dist in zip(members, d):
+            rows.append({
+                "shelter_type": kinds[i], "shelter_id": int(points[i]["id"]),
+                "canonical_type": kinds[head], "canonical_id": int(points[head]["id"]),
+                "distance_m": round(dist, 1), "score": 1.0 if i == head else round(best[i][0], 3),
+            })
+    return rows
+
+
+def replace_mapping(session, rows: list[dict]):
+    """shelter_canonical 을 통째로 교체 (같은 트랜잭션 안에서 delete + insert)"""
+    session.execute(delete(_canonical))
+    if rows:
+        session.execute(insert(_canonical), rows)
+
+
+class CanonicalMap:
+    """(kind, id) → "대표kind:대표id". 첫 요청 때 백그라운드 적재(시작 시 DB 연결 없음), max_age 가 지나면 재적재"""
+
+    def __init__(self):
+        self.enabled = False
+        self.default_on = True
+        self.overfetch = 2.0
+        self.max_age = 3600.0
+        self.loaded_at: float | None = None
+        self._map: dict[tuple[str, int], str] = {}
+        self._engine = None
+        self._reloading = False
+
+    def init_app(self, app):
+        self.enabled = bool(app.config.get("NEARBY_DEDUP_ENABLED", True))
+        self.default_on = bool(app.config.get("NEARBY_DEDUP_DEFAULT", True))
+        self.overfetch = float(app.config.get("NEARBY_DEDUP_OVERFETCH", 2.0))
+        self.max_age = float(app.config.get("NEARBY_DEDUP_RELOAD_SECONDS", 3600))
+
+    def load(self, engine):
+        self._engine = engine
+        with engine.connect() as conn:
+            rows = conn.execute(select(_canonical.c.shelter_type, _canonical.c.shelter_id,
+                                       _canonical.c.canonical_type, _canonical.c.canonical_id)).all()
+        self._map = {(t, i): f"{ct}:{cid}" for t, i, ct, cid in rows}  # 통째로 교체 (읽는 쪽 락 불필요)
+        self.loaded_at = time.time()
+        log.info("canonical map loaded: %d rows", len(self._map))
+
+    def _reload_async(self):
+        if self._engine is None or self._reloading:
+            return
+        self._reloading = True
+
+        def run():
+            try:
+                self.load(self._engine)
+            except Exception as e:  # 테이블이 아직 없거나 DB 가 안 될 때 → 합치지 않고 그대로, max_age 뒤 재시도
+                log.warning("canonical map load failed: %s", e)
+                self.loaded_at = time.time()
+            finally:
+                self._reloading = False
+
+        threading.Thread(target=run, name="canonical-map-reload", daemon=True).start()
+
+    @property
+    def active(self) -> bool:
+        if not self.enabled:
+            return False
+        if self._engine is None:
+            from ..db import db
+            self._engine = db.engine
+        if self.loaded_at is None or time.time() - self.loaded_at > self.max_age:
+            self._reload_async()  # 그동안은 기존 매핑으로 (처음엔 합치지 않음)
+        return bool(self._map)
+
+    def fetch_limit(self, limit: int, kinds) -> int:
+        """합치면 개수가 줄어드니 kind 가 둘 이상이면 넉넉히 가져온다"""
+        if len(kinds) < 2:
+            return limit
+        return int(math.ceil(limit * min(self.overfetch, len(kinds))))
+
+    def canonical_of(self, kind: str, sid) -> str | None:
+        try:
+            return self._map.get((kind, int(sid)))
+        except (TypeError, ValueError):  # id 컬럼이 없는 테이블(md5 id)
+            return None
+
+    def collapse(self, items: list[dict], limit: int) -> list[dict]:
+        """거리순 items → 같은 시설은 가장 가까운 항목 하나로 (kinds, duplicates 추가). 원본 dict 는 건드리지 않는다"""
+        out, seen = [], {}
+        for it in items:
+            key = self.canonical_of(it["kind"], it["id"])
+            head = seen.get(key) if key is not None else None
+            if head is not None:
+                head["kinds"].append(it["kind"])
+                head["duplicates"].append({"kind": it["kind"], "id": it["id"], "distance_m": it.get("distance_m")})
+                continue
+            if len(out) >= limit:
+                continue  # 뒤에 오는 항목도 앞쪽 대표의 중복일 수 있어 끝까지 본다
+            new = dict(it, kinds=[it["kind"]], duplicates=[])
+            if key is not None:
+                new["canonical"] = key
+                seen[key] = new
+            out.append(new)
+        return out
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "loaded_at": self.loaded_at, "rows": len(self._map)}
+
+
+canonical_map = CanonicalMap()
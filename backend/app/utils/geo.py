@@ -0,0 +1,27 @@
+# backend/app/utils/geo.py
+# 거리 계산 공용 헬퍼 (numpy 벡터화)
+
+import math
+import numpy as np
+
+# MySQL ST_Distance_Sphere 기본 반지름과 동일하게 맞춤 (SQL 경로와 거리값 일치)
+EARTH_RADIUS_M = 6_370_986.0
+M_PER_DEG_LAT = 111_320.0
+
+
+def bbox(lat: float, lng: float, radius_m: float):
+    """(min_lat, max_lat, min_lng, max_lng) 근사 사각형 (SQL 경로 prefilter 와 인메모리 인덱스가 같이 씀)"""
+    deg_lat = radius_m / M_PER_DEG_LAT
+    cos_lat = max(0.01, math.cos(math.radians(lat)))
+    deg_lng = radius_m / (M_PER_DEG_LAT * cos_lat)
+    return (lat - deg_lat, lat + deg_lat, lng - deg_lng, lng + deg_lng)
+
+
+def haversine_m(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """기준점 하나 → 좌표 배열 전체 거리(m)를 한 번에 계산"""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlng = np.radians(lngs) - math.radians(lng)
+    a = np.sin(dlat / 2.0) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
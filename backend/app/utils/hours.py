@@ -0,0 +1,135 @@
+# backend/app/utils/hours.py
+# 운영시간 자유 문자열("10:00~20:00", "평일 09:00~16:00", "24시간" 등) → 요일별 구간
+# - 적재 시(카탈로그 동기화) 한 번 파싱해서 shelters_all 의 요일별 open/close(분) 컬럼에 저장
+# - 자정을 넘기는 구간(22:00~06:00)은 close 를 1440 이상으로 저장 → 다음날 새벽은 전날 구간으로 판정
+# - 못 읽는 문자열/빈 값은 hours_unknown=1 (open_now 필터에서 기본 제외, include_unknown=1 이면 포함)
+# - 같은 요일에 구간이 여럿이면(점심시간 등) 가장 이른 open ~ 가장 늦은 close 하나로 합친다
+# - 쉬는 날 표기("09:00~18:00(토요일 휴무)", "매주 월요일 휴관", "주말 제외")는 그 요일을 구간에서 뺀다
+#   (요일이 없는 표기 — "점심시간 제외", "공휴일 휴무" — 는 요일별 구간으로 나타낼 수 없어 무시)
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from sqlalchemy import and_, false, or_, true
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")  # datetime.weekday() 순서
+DAY_MINUTES = 1440
+TZ = ZoneInfo("Asia/Seoul")
+
+_ALL = tuple(range(7))
+_DAY_WORDS = [  # 긴 표현부터
+    ("연중무휴", _ALL), ("매일", _ALL), ("상시", _ALL), ("평일", tuple(range(5))), ("주중", tuple(range(5))),
+    ("주말", (5, 6)), ("공휴일", ()), ("휴일", ()),
+]
+_DAY_CHARS = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
+_RANGE = re.compile(r"(\d{1,2})\s*[:시]\s*(\d{2})?\s*분?\s*[~\-–]\s*(\d{1,2})\s*[:시]\s*(\d{2})?")
+_DAY_SPAN = re.compile(r"([월화수목금토일])(?:요일)?\s*[~\-–]\s*([월화수목금토일])(?:요일)?")
+_DAY_LIST = re.compile(r"([월화수목금토일])(?:요일)?")
+_CLOSED = re.compile(r"([^\d():,/~\-–]*?)\s*(?:휴무|휴관|휴장|제외|미운영)")
+
+
+def _days_of(prefix: str):
+    """구간 앞의 요일 표현 → 요일 튜플. 요일 표현이 없으면 None (= 앞 구간의 요일 또는 매일)"""
+    for word, days in _DAY_WORDS:
+        if word in prefix:
+            return days
+    m = _DAY_SPAN.search(prefix)
+    if m:
+        a, b = _DAY_CHARS[m.group(1)], _DAY_CHARS[m.group(2)]
+        return tuple(range(a, b + 1)) if a <= b else tuple(range(a, 7)) + tuple(range(0, b + 1))
+    found = [_DAY_CHARS[c] for c in _DAY_LIST.findall(prefix)]
+    return tuple(dict.fromkeys(found)) or None
+
+
+def _ranges(s: str) -> dict[int, tuple[int, int]]:
+    """"HH:MM~HH:MM" 구간마다 앞의 요일 표현을 붙여 {요일: (open분, close분)}"""
+    out: dict[int, tuple[int, int]] = {}
+    last_end, days = 0, None
+    for m in _RANGE.finditer(s):
+        found = _days_of(s[last_end:m.start()])
+        days = found if found is not None else (days if days is not None else _ALL)
+        last_end = m.end()
+        h1, m1, h2, m2 = int(m.group(1)), int(m.group(2) or 0), int(m.group(3)), int(m.group(4) or 0)
+        if h1 > 24 or h2 > 24 or m1 > 59 or m2 > 59:
+            continue
+        open_, close = h1 * 60 + m1, h2 * 60 + m2
+        if close <= open_:
+            close += DAY_MINUTES  # 자정 넘김
+        for d in days:
+            cur = out.get(d)
+            out[d] = (open_, close) if cur is None else (min(cur[0], open_), max(cur[1], close))
+    return out
+
+
+@lru_cache(maxsize=4096)
+def parse(text) -> dict[int, tuple[int, int]] | None:
+    """문자열 → {요일: (open분, close분)}. 못 읽으면 None. 쉬는 요일은 키가 없다"""
+    if not text or not str(text).strip():
+        return None
+    s = str(text).strip()
+    closed: set[int] = set()
+    for m in _CLOSED.finditer(s):
+        closed.update(_days_of(m.group(1)) or ())
+    s = _CLOSED.sub(" ", s)  # 쉬는 날 표기의 요일이 다음 구간의 요일로 읽히지 않도록
+    if "24시간" in s or s.strip() in ("상시", "상시개방"):
+        out = {d: (0, DAY_MINUTES) for d in _ALL}
+    else:
+        out = _ranges(s)
+    for d in closed:
+        out.pop(d, None)
+    return out or None
+
+
+def columns(text) -> dict:
+    """shelters_all 의 hours_unknown + <요일>_open/<요일>_close 값 (쉬는 날은 NULL)"""
+    parsed = parse(text)
+    row = {"hours_unknown": parsed is None}
+    for d, name in enumerate(WEEKDAYS):
+        open_, close = (parsed or {}).get(d, (None, None))
+        row[f"{name}_open"], row[f"{name}_close"] = open_, close
+    return row
+
+
+def parse_open_at(args) -> tuple[int, int] | None:
+    """?open_now=1 또는 ?open_at=2026-07-01T14:30 (시간대 없으면 한국 시간) → (요일, 분). 없으면 None
+    형식이 틀리면 ValueError"""
+    if args.get("open_at"):
+        dt = datetime.fromisoformat(args["open_at"])
+        dt = dt.astimezone(TZ) if dt.tzinfo else dt
+    elif args.get("open_now") in ("1", "true"):
+        dt = datetime.now(TZ)
+    else:
+        return None
+    return dt.weekday(), dt.hour * 60 + dt.minute
+
+
+def open_clause(t, day: int, minute, include_unknown: bool = False):
+    """SQL 조건: 그날 구간 안이거나, 전날 구간이 자정을 넘겨 아직 안 끝났거나
+    minute 은 값 또는 bindparam (문장 재사용). t 는 shelters_all 테이블"""
+    today, prev = WEEKDAYS[day], WEEKDAYS[(day - 1) % 7]
+    cond = or_(
+        and_(t.c[f"{today}_open"] <= minute, t.c[f"{today}_close"] > minute),
+        t.c[f"{prev}_close"] > minute + DAY_MINUTES,
+    )
+    return or_(cond, t.c.hours_unknown == true()) if include_unknown else and_(cond, t.c.hours_unknown == false())
+
+
+def open_mask(opens: np.ndarray, closes: np.ndarray, unknown: np.ndarray, day: int, minute: int,
+              include_unknown: bool = False) -> np.ndarray:
+    """open_clause 의 numpy 판. opens/closes: (n, 7) 분 배열, 쉬는 날은 -1"""
+    prev = (day - 1) % 7
+    ok = ((opens[:, day] >= 0) & (opens[:, day] <= minute) & (closes[:, day] > minute)) \
+        | (closes[:, prev] > minute + DAY_MINUTES)
+    return ok | unknown if include_unknown else ok & ~unknown
+
+
+def is_open(text, day: int, minute: int, include_unknown: bool = False) -> bool:
+    """문자열 하나 판정 (카탈로그가 없을 때 nearby 후처리용)"""
+    parsed = parse(text)
+    if parsed is None:
+        return include_unknown
+    cur, prev = parsed.get(day), parsed.get((day - 1) % 7)
+    return bool((cur and cur[0] <= minute < cur[1]) or (prev and prev[1] > minute + DAY_MINUTES))
@@ -0,0 +1,195 @@
+# backend/app/utils/http_pipeline.py
+# 앱 공통 응답 파이프라인
+# - jsonify 경로: orjson 이 있으면 그것으로 인코딩 (Flask 기본 provider 와 같은 규칙: 키 정렬, 날짜는 HTTP date,
+#   Decimal/UUID 는 문자열). 인코딩 시간은 g 에 쌓아 metrics 가 가져간다
+# - 스트리밍 응답(/shelters/export)은 after_request 압축 대신 compress_stream 으로 chunk 단위 압축
+# - gzip/brotli: Accept-Encoding 협상, COMPRESS_MIN_BYTES 이상인 JSON/텍스트 응답만. 스트리밍 응답은 건드리지 않음
+# - @cacheable: 멱등 GET(쉼터 조회)에 ETag(본문 해시) + Cache-Control, If-None-Match 면 304
+
+import gzip
+import hashlib
+import json
+import time
+import zlib
+from functools import wraps
+
+from flask import g, has_request_context, make_response, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 Flask 기본 인코더
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip 만
+    brotli = None
+
+COMPRESSIBLE = ("application/json", "text/")
+
+
+def _add_encode_time(seconds: float):
+    if has_request_context():
+        g._metrics_encode_seconds = g.get("_metrics_encode_seconds", 0.0) + seconds
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson 기반 jsonify. 들여쓰기(debug) 응답이나 orjson 이 못 다루는 값은 기본 provider 로"""
+
+    use_orjson = orjson is not None
+
+    def response(self, *args, **kwargs):
+        started = time.perf_counter()
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        resp = None
+        if self.use_orjson and not pretty:
+            obj = self._prepare_response_obj(args, kwargs)
+            try:
+                data = orjson.dumps(obj, default=self.default, option=(
+                    orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                    | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE))
+                resp = self._app.response_class(data, mimetype=self.mimetype)
+            except (orjson.JSONEncodeError, TypeError):
+                resp = None
+        if resp is None:
+            resp = super().response(*args, **kwargs)
+        _add_encode_time(time.perf_counter() - started)
+        return resp
+
+
+def json_line(obj) -> bytes:
+    """NDJSON 한 줄 (끝에 개행). 스트리밍 응답용"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode()
+
+
+def _accepted(header: str) -> dict[str, float]:
+    """Accept-Encoding → {coding: q}"""
+    out = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        out[coding.strip().lower()] = q
+    return out
+
+
+def choose_encoding(header: str) -> str | None:
+    acc = _accepted(header or "")
+    star = acc.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:  # q 가 같으면 br 우선
+        q = acc.get(coding, star)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class ResponsePipeline:
+    def __init__(self):
+        self.compress = True
+        self.min_bytes = 1024
+        self.gzip_level = 6
+        self.br_quality = 4
+        self.max_age = 60
+
+    def init_app(self, app):
+        if app.config.get("JSON_FAST_ENCODER", True):
+            app.json = FastJSONProvider(app)
+        self.compress = bool(app.config.get("COMPRESS_ENABLED", True))
+        self.min_bytes = int(app.config.get("COMPRESS_MIN_BYTES", 1024))
+        self.gzip_level = int(app.config.get("COMPRESS_GZIP_LEVEL", 6))
+        self.br_quality = int(app.config.get("COMPRESS_BR_QUALITY", 4))
+        self.max_age = int(app.config.get("SHELTER_CACHE_MAX_AGE", 60))
+        if self.compress:
+            app.after_request(self._compress)
+
+    def _compress(self, response):
+        if (response.direct_passthrough or response.is_streamed or response.status_code < 200
+                or response.status_code in (204, 304) or "Content-Encoding" in response.headers
+                or not (response.mimetype or "").startswith(COMPRESSIBLE)):
+            return response
+        response.vary.add("Accept-Encoding")
+        data = response.get_data()
+        if len(data) < self.min_bytes:
+            return response
+        coding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if coding is None:
+            return response
+        started = time.perf_counter()
+        if coding == "br":
+            body = brotli.compress(data, quality=self.br_quality)
+        else:
+            body = gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+        if has_request_context():
+            g._metrics_compress_seconds = time.perf_counter() - started
+            g._metrics_uncompressed_bytes = len(data)
+        response.set_data(body)
+        response.headers["Content-Encoding"] = coding
+        # 본문 바이트가 달라졌으므로 강한 ETag → 약한 ETag (If-None-Match 는 약한 비교라 304 는 그대로 동작)
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def compress_stream(chunks, accept_encoding: str):
+    """chunk iterator → (압축된 iterator, Content-Encoding 또는 None)
+    chunk 마다 sync flush → 클라이언트는 받은 만큼 바로 풀 수 있다 (메모리는 압축기 상태만)"""
+    coding = choose_encoding(accept_encoding) if pipeline.compress else None
+    if coding is None:
+        return chunks, None
+
+    def gen():
+        if coding == "br":
+            comp = brotli.Compressor(quality=pipeline.br_quality)
+            for chunk in chunks:
+                out = comp.process(chunk) + comp.flush()
+                if out:
+                    yield out
+            yield comp.finish()
+        else:
+            comp = zlib.compressobj(pipeline.gzip_level, zlib.DEFLATED, 31)  # wbits 31 = gzip 헤더
+            for chunk in chunks:
+                out = comp.compress(chunk) + comp.flush(zlib.Z_SYNC_FLUSH)
+                if out:
+                    yield out
+            yield comp.flush()
+    return gen(), coding
+
+
+def cacheable(fn=None, *, max_age: int | None = None):
+    """멱등 GET 뷰: 200 응답에 ETag(본문 md5) + Cache-Control, If-None-Match 일치 시 304
+    Authorization 이 붙은 요청은 사용자별 응답일 수 있으니 private + Vary: Authorization"""
+    if fn is None:
+        return lambda f: cacheable(f, max_age=max_age)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        resp = make_response(fn(*args, **kwargs))
+        if request.method != "GET" or resp.status_code != 200 or resp.is_streamed:
+            return resp
+        if not resp.get_etag()[0]:
+            resp.set_etag(hashlib.md5(resp.get_data()).hexdigest())
+        age = pipeline.max_age if max_age is None else max_age
+        if request.headers.get("Authorization"):
+            resp.cache_control.private = True
+            resp.vary.add("Authorization")
+        else:
+            resp.cache_control.public = True
+        resp.cache_control.max_age = age
+        return resp.make_conditional(request)
+    return wrapper
+
+
+pipeline = ResponsePipeline()
@@ -0,0 +1,345 @@
+# backend/app/utils/metrics.py
+# 요청 단위 계측 + Prometheus 텍스트 /metrics
+# - 라우트(url_rule)별 지연 히스토그램, 상태코드별 요청 수
+# - 요청마다 SQL 문 개수/총 시간 (SQLAlchemy engine 이벤트, 실패한 문장도 handle_error 로 포함)
+# - 느린 쿼리는 문장만 샘플 보관 (바인드 값은 METRICS_SLOW_QUERY_PARAMS=1 일 때만)
+# - /metrics/slow, /metrics/profiles 는 METRICS_TOKEN 이 설정돼 있을 때만 열린다 (없으면 404)
+# - 캐시/인덱스 등 모듈 통계는 collector 로 붙인다 (register_collector)
+# - 선택: 요청 단위 cProfile (샘플링 비율 또는 X-Profile 헤더) → /metrics/profiles
+
+import cProfile
+import io
+import logging
+import pstats
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Callable
+
+from flask import Response, g, has_request_context, jsonify, request
+from sqlalchemy import event
+
+log = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+PREFIX = "safeon"
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, v: float):
+        for i, b in enumerate(self.buckets):
+            if v <= b:
+                self.counts[i] += 1
+                break
+        self.sum += v
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> list[str]:
+        out, acc = [], 0
+        sep = "," if labels else ""
+        for b, n in zip(self.buckets, self.counts):
+            acc += n
+            out.append(f'{name}_bucket{{{labels}{sep}le="{b}"}} {acc}')
+        out.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        out.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        out.append(f"{name}_count{{{labels}}} {self.count}")
+        return out
+
+
+def _label(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _labels(**kw) -> str:
+    return ",".join(f'{k}="{_label(v)}"' for k, v in kw.items())
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.slow_ms = 200.0
+        self.profile_rate = 0.0
+        self.profile_header = False
+        self.slow_params = False
+        self.token = None
+        self._lock = threading.Lock()
+        self._latency: dict[tuple, Histogram] = {}
+        self._queries: dict[tuple, Histogram] = {}
+        self._requests: dict[tuple, int] = defaultdict(int)
+        self._sql_seconds: dict[tuple, float] = defaultdict(float)
+        self._bytes: dict[tuple, Histogram] = {}       # 전송 바이트 (압축 후)
+        self._raw_bytes: dict[tuple, float] = defaultdict(float)  # 압축 전 바이트 합
+        self._encode_seconds: dict[tuple, float] = defaultdict(float)    # jsonify 인코딩
+        self._compress_seconds: dict[tuple, float] = defaultdict(float)  # gzip/br
+        self._sql_slow_total = 0
+        self._sql_errors_total = 0
+        self._slow: deque = deque(maxlen=50)
+        self._profiles: deque = deque(maxlen=20)
+        self._collectors: dict[str, Callable[[], dict]] = {}
+        self._engines: set[int] = set()
+
+    def init_app(self, app):
+        self.enabled = bool(app.config.get("METRICS_ENABLED", True))
+        if not self.enabled:
+            return
+        self.slow_ms = float(app.config.get("METRICS_SLOW_QUERY_MS", 200))
+        self.slow_params = bool(app.config.get("METRICS_SLOW_QUERY_PARAMS", False))
+        self._slow = deque(maxlen=int(app.config.get("METRICS_SLOW_QUERY_SAMPLES", 50)))
+        self.profile_rate = float(app.config.get("METRICS_PROFILE_SAMPLE_RATE", 0.0))
+        self.profile_header = bool(app.config.get("METRICS_PROFILE_HEADER", False))
+        self._profiles = deque(maxlen=int(app.config.get("METRICS_PROFILE_KEEP", 20)))
+        self.token = app.config.get("METRICS_TOKEN") or None
+
+        from ..db import db
+        with app.app_context():
+            for engine in db.engines.values():
+                self.instrument_engine(engine)
+
+        app.before_request(self._before)
+        app.after_request(self._after)
+        app.add_url_rule("/metrics", "metrics", self.prometheus_view, methods=["GET"])
+        app.add_url_rule("/metrics/slow", "metrics_slow", self.slow_view, methods=["GET"])
+        app.add_url_rule("/metrics/profiles", "metrics_profiles", self.profiles_view, methods=["GET"])
+
+    def register_collector(self, name: str, fn: Callable[[], dict]):
+        """fn() 의 숫자/불리언 값을 gauge 로 노출 (중첩 dict는 key 라벨로 펼침)"""
+        self._collectors[name] = fn
+
+    # ---- SQL ----
+    def instrument_engine(self, engine):
+        if id(engine) in self._engines:
+            return
+        self._engines.add(id(engine))
+        event.listen(engine, "before_cursor_execute", self._before_cursor)
+        event.listen(engine, "after_cursor_execute", self._after_cursor)
+        event.listen(engine, "handle_error", self._on_error)
+
+    # 시작 시각은 실행 컨텍스트에 (커넥션에 쌓아 두면 실패한 문장의 값이 남아 다음 문장 시간이 틀어진다)
+    @staticmethod
+    def _before_cursor(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_t0 = time.perf_counter()
+
+    def _after_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        t0 = getattr(context, "_metrics_t0", None)
+        if t0 is None:
+            return
+        self._record(time.perf_counter() - t0, statement, parameters, executemany)
+
+    def _on_error(self, exc_ctx):
+        """실패한 문장도 개수/시간에 포함하고 오류 수를 센다"""
+        with self._lock:
+            self._sql_errors_total += 1
+        t0 = getattr(exc_ctx.execution_context, "_metrics_t0", None)
+        if t0 is not None:
+            self._record(time.perf_counter() - t0, exc_ctx.statement or "", exc_ctx.parameters,
+                         getattr(exc_ctx.execution_context, "executemany", False), failed=True)
+
+    def _record(self, elapsed: float, statement: str, parameters, executemany: bool, failed: bool = False):
+        endpoint = "-"
+        if has_request_context():
+            g._metrics_sql_count = g.get("_metrics_sql_count", 0) + 1
+            g._metrics_sql_seconds = g.get("_metrics_sql_seconds", 0.0) + elapsed
+            endpoint = request.url_rule.rule if request.url_rule else "-"
+        if elapsed * 1000 >= self.slow_ms:
+            sample = {
+                "at": datetime.now().isoformat(timespec="seconds"),
+                "ms": round(elapsed * 1000, 2),
+                "endpoint": endpoint,
+                "statement": statement[:2000],
+                "executemany": executemany,
+                "failed": failed,
+            }
+            if self.slow_params:
+                sample["parameters"] = repr(parameters)[:1000]
+            with self._lock:
+                self._sql_slow_total += 1
+                self._slow.append(sample)
+
+    # ---- 요청 ----
+    def _before(self):
+        g._metrics_t0 = time.perf_counter()
+        g._metrics_sql_count = 0
+        g._metrics_sql_seconds = 0.0
+        if self._want_profile():
+            g._metrics_profiler = prof = cProfile.Profile()
+            prof.enable()
+
+    def _want_profile(self) -> bool:
+        if self.profile_header and request.headers.get("X-Profile") == "1":
+            return True
+        return self.profile_rate > 0 and random.random() < self.profile_rate
+
+    def _after(self, response):
+        t0 = g.pop("_metrics_t0", None)
+        if t0 is None:
+            return response
+        elapsed = time.perf_counter() - t0
+        rule = request.url_rule.rule if request.url_rule else "unmatched"
+        prof = g.pop("_metrics_profiler", None)
+        if prof is not None:
+            prof.disable()
+        if rule.startswith("/metrics"):
+            return response
+        if prof is not None:
+            response.headers["X-Profile-Id"] = self._keep_profile(prof, rule, elapsed)
+        n_sql = g.get("_metrics_sql_count", 0)
+        sql_s = g.get("_metrics_sql_seconds", 0.0)
+        encode_s = g.get("_metrics_encode_seconds", 0.0)
+        compress_s = g.get("_metrics_compress_seconds", 0.0)
+        size = response.calculate_content_length()
+        raw_size = g.get("_metrics_uncompressed_bytes", size)
+
+        key = (request.method, rule)
+        with self._lock:
+            self._requests[key + (response.status_code,)] += 1
+            self._latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            self._queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(n_sql)
+            self._sql_seconds[key] += sql_s
+            self._encode_seconds[key] += encode_s
+            self._compress_seconds[key] += compress_s
+            if size is not None:  # 스트리밍 응답은 길이를 모름
+                self._bytes.setdefault(key, Histogram(BYTES_BUCKETS)).observe(size)
+                self._raw_bytes[key] += raw_size
+        response.headers["Server-Timing"] = (f"app;dur={elapsed * 1000:.1f}, sql;dur={sql_s * 1000:.1f}, "
+                                             f"json;dur={encode_s * 1000:.1f}, compress;dur={compress_s * 1000:.1f}")
+        return response
+
+    def _keep_profile(self, prof, rule: str, elapsed: float) -> str:
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(40)
+        pid = f"{int(time.time() * 1000):x}{random.getrandbits(16):04x}"
+        entry = {"id": pid, "at": datetime.now().isoformat(timespec="seconds"), "method": request.method,
+                 "endpoint": rule, "path": request.full_path, "ms": round(elapsed * 1000, 2),
+                 "stats": buf.getvalue()}
+        with self._lock:
+            self._profiles.append(entry)
+        return pid
+
+    # ---- 노출 ----
+    def _allowed(self) -> bool:
+        """METRICS_TOKEN 이 있으면 Authorization: Bearer <token> 필요"""
+        return self.token is None or request.headers.get("Authorization") == f"Bearer {self.token}"
+
+    def _detail_allowed(self):
+        """느린 쿼리/프로파일 (SQL 문장, 요청 경로가 보임): 토큰이 없으면 엔드포인트 자체가 없는 것처럼 404"""
+        if self.token is None:
+            return jsonify({"error": "not found"}), 404
+        if not self._allowed():
+            return jsonify({"error": "forbidden"}), 403
+        return None
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            requests = dict(self._requests)
+            latency = {k: h for k, h in self._latency.items()}
+            queries = {k: h for k, h in self._queries.items()}
+            sql_seconds = dict(self._sql_seconds)
+            raw_bytes = dict(self._raw_bytes)
+            encode_seconds = dict(self._encode_seconds)
+            compress_seconds = dict(self._compress_seconds)
+            slow_total = self._sql_slow_total
+            errors_total = self._sql_errors_total
+
+            name = f"{PREFIX}_http_requests_total"
+            lines += [f"# HELP {name} HTTP requests by route and status", f"# TYPE {name} counter"]
+            for (method, rule, status), n in sorted(requests.items()):
+                lines.append(f"{name}{{{_labels(method=method, endpoint=rule, status=status)}}} {n}")
+
+            name = f"{PREFIX}_http_request_duration_seconds"
+            lines += [f"# HELP {name} Request latency by route", f"# TYPE {name} histogram"]
+            for (method, rule), h in sorted(latency.items()):
+                lines += h.lines(name, _labels(method=method, endpoint=rule))
+
+            name = f"{PREFIX}_http_response_bytes"
+            lines += [f"# HELP {name} Response body bytes on the wire (after compression)",
+                      f"# TYPE {name} histogram"]
+            for (method, rule), h in sorted(self._bytes.items()):
+                lines += h.lines(name, _labels(method=method, endpoint=rule))
+
+            name = f"{PREFIX}_sql_queries_per_request"
+            lines += [f"# HELP {name} SQL statements executed per request", f"# TYPE {name} histogram"]
+            for (method, rule), h in sorted(queries.items()):
+                lines += h.lines(name, _labels(method=method, endpoint=rule))
+
+        name = f"{PREFIX}_sql_duration_seconds_total"
+        lines += [f"# HELP {name} Total SQL time spent by route", f"# TYPE {name} counter"]
+        for (method, rule), s in sorted(sql_seconds.items()):
+            lines.append(f"{name}{{{_labels(method=method, endpoint=rule)}}} {s:.6f}")
+
+        for name, help_, values in (
+            ("http_response_uncompressed_bytes_total", "Response body bytes before compression", raw_bytes),
+            ("json_encode_seconds_total", "Time spent encoding JSON responses", encode_seconds),
+            ("compress_seconds_total", "Time spent compressing responses", compress_seconds),
+        ):
+            name = f"{PREFIX}_{name}"
+            lines += [f"# HELP {name} {help_}", f"# TYPE {name} counter"]
+            for (method, rule), v in sorted(values.items()):
+                lines.append(f"{name}{{{_labels(method=method, endpoint=rule)}}} {v:.6f}")
+
+        name = f"{PREFIX}_sql_slow_queries_total"
+        lines += [f"# HELP {name} SQL statements slower than the slow-query threshold",
+                  f"# TYPE {name} counter", f"{name} {slow_total}"]
+        name = f"{PREFIX}_sql_errors_total"
+        lines += [f"# HELP {name} SQL statements that raised", f"# TYPE {name} counter", f"{name} {errors_total}"]
+
+        for cname, fn in list(self._collectors.items()):
+            try:
+                values = fn()
+            except Exception as e:  # 통계 하나 실패로 /metrics 전체가 죽지 않게
+                log.warning("metrics collector %s failed: %s", cname, e)
+                continue
+            lines += self._gauge_lines(f"{PREFIX}_{cname}", values)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _gauge_lines(prefix: str, values: dict) -> list[str]:
+        out = []
+        for k, v in values.items():
+            if isinstance(v, bool):
+                v = int(v)
+            if isinstance(v, (int, float)):
+                out += [f"# TYPE {prefix}_{k} gauge", f"{prefix}_{k} {v}"]
+            elif isinstance(v, dict) and v and all(isinstance(x, (int, float)) for x in v.values()):
+                out.append(f"# TYPE {prefix}_{k} gauge")
+                out += [f'{prefix}_{k}{{key="{_label(sub)}"}} {x}' for sub, x in v.items()]
+        return out
+
+    def prometheus_view(self):
+        if not self._allowed():
+            return jsonify({"error": "forbidden"}), 403
+        return Response(self.render(), mimetype="text/plain; version=0.0.4")
+
+    def slow_view(self):
+        denied = self._detail_allowed()
+        if denied:
+            return denied
+        with self._lock:
+            return jsonify({"threshold_ms": self.slow_ms, "items": list(self._slow)[::-1]})
+
+    def profiles_view(self):
+        denied = self._detail_allowed()
+        if denied:
+            return denied
+        pid = request.args.get("id")
+        with self._lock:
+            items = [p for p in self._profiles if pid is None or p["id"] == pid]
+        if pid is None:
+            items = [{k: v for k, v in p.items() if k != "stats"} for p in items]
+        return jsonify({"items": items[::-1]})
+
+
+metrics = Metrics()
@@ -0,0 +1,218 @@
+# backend/app/utils/nearby_cache.py
+# /shelters/nearby 타일 캐시
+# - 키: 격자 타일(tile) + 타일 세대(generation) + kinds 조합
+# - 값: 타일 중심에서 (최대 반경 + 타일 반대각선) 안의 쉼터 superset
+# - 요청마다 superset을 정확한 lat/lng/radius/limit으로 다시 거른다
+# - /add_shelter 쓰기 시 그 좌표가 superset에 들어갈 수 있는 타일마다 세대를 1 올린다
+#   (kinds 조합별 키를 다 지우지 않고 타일당 한 번. 옛 세대 키는 TTL/LRU 로 빠진다)
+# - memory 백엔드는 워커(프로세스)마다 따로라 다른 워커의 무효화를 못 본다 → 워커가 여럿이면
+#   redis 를 쓴다 (운영 기본값은 backend/README.md 참고, memory 로 여러 워커가 뜨면 경고)
+
+import json
+import logging
+import math
+import os
+from collections import Counter
+from typing import Callable, Iterable
+
+import numpy as np
+
+from .geo import M_PER_DEG_LAT, bbox, haversine_m
+from .ttl_cache import TTLCache
+
+log = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """기본 백엔드: 프로세스 내 LRU/TTL"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._gens: dict[str, int] = {}
+
+    def get(self, key: str):
+        return self._cache.get(key)
+
+    def generation(self, tile_key: str) -> int:
+        return self._gens.get(tile_key, 0)
+
+    def bump(self, tile_keys: list[str]):
+        for k in tile_keys:
+            self._gens[k] = self._gens.get(k, 0) + 1
+
+    def set(self, key: str, value: dict):
+        self._cache.set(key, value)
+
+    def delete(self, keys: list[str]) -> int:
+        return self._cache.delete(*keys)
+
+    def clear(self):
+        self._cache.clear()
+        self._gens.clear()
+
+
+class RedisBackend:
+    """Redis 호환 서버(Redis/Valkey/KeyDB, 테스트용 fakeredis) 공용. TTL은 서버가 만료, LRU는 maxmemory-policy로"""
+
+    def __init__(self, client, ttl: float, prefix: str = "safeon:"):
+        self._r = client
+        self._ttl = max(1, int(ttl))
+        self._prefix = prefix
+
+    def get(self, key: str):
+        raw = self._r.get(self._prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: dict):
+        self._r.set(self._prefix + key, json.dumps(value, ensure_ascii=False, default=str), ex=self._ttl)
+
+    def delete(self, keys: list[str]) -> int:
+        return self._r.delete(*[self._prefix + k for k in keys]) if keys else 0
+
+    def generation(self, tile_key: str) -> int:
+        return int(self._r.get(self._prefix + tile_key) or 0)
+
+    def bump(self, tile_keys: list[str]):
+        pipe = self._r.pipeline(transaction=False)
+        for k in tile_keys:
+            pipe.incr(self._prefix + k)
+        pipe.execute()
+
+    def clear(self):
+        for k in self._r.scan_iter(match=self._prefix + "nearby:*"):
+            self._r.delete(k)
+
+
+def make_backend(config) -> object:
+    kind = config.get("NEARBY_CACHE_BACKEND", "memory")
+    ttl = float(config.get("NEARBY_CACHE_TTL_SECONDS", 300))
+    if kind == "memory":
+        return MemoryBackend(int(config.get("NEARBY_CACHE_MAX_TILES", 4096)), ttl)
+    if kind == "redis":
+        import redis  # 선택 의존성: redis 백엔드를 쓸 때만 필요
+        return RedisBackend(redis.Redis.from_url(config["NEARBY_CACHE_REDIS_URL"]), ttl)
+    if kind == "fakeredis":
+        import fakeredis  # 로컬/테스트용 Redis 대역
+        return RedisBackend(fakeredis.FakeRedis(), ttl)
+    raise ValueError(f"unknown NEARBY_CACHE_BACKEND: {kind}")
+
+
+class NearbyTileCache:
+    def __init__(self):
+        self.enabled = False
+        self.tile_deg = 0.01
+        self.max_radius_m = 3000.0
+        self.superset_limit = 2000
+        self.backend = None
+        self.counters = Counter()
+
+    def init_app(self, app):
+        c = app.config
+        self.enabled = bool(c.get("NEARBY_CACHE_ENABLED", False))
+        self.tile_deg = float(c.get("NEARBY_CACHE_TILE_DEG", 0.01))
+        self.max_radius_m = float(c.get("NEARBY_CACHE_MAX_RADIUS_M", 3000))
+        self.superset_limit = int(c.get("NEARBY_CACHE_SUPERSET_LIMIT", 2000))
+        self.backend = make_backend(c) if self.enabled else None
+        if isinstance(self.backend, MemoryBackend) and _worker_count() > 1:
+            log.warning("NEARBY_CACHE_BACKEND=memory with %d workers: each worker keeps its own tiles and "
+                        "misses other workers' invalidations (up to NEARBY_CACHE_TTL_SECONDS stale). "
+                        "Use NEARBY_CACHE_BACKEND=redis", _worker_count())
+
+    # ---- 타일 ----
+    def _tile(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.tile_deg), math.floor(lng / self.tile_deg)
+
+    def _tile_center(self, ti: int, tj: int) -> tuple[float, float]:
+        return (ti + 0.5) * self.tile_deg, (tj + 0.5) * self.tile_deg
+
+    def _superset_radius(self, center_lat: float) -> float:
+        # 타일 안 어느 점에서 max_radius를 그려도 superset 원 안에 들어가도록
+        half_lat = self.tile_deg / 2 * M_PER_DEG_LAT
+        half_lng = half_lat * math.cos(math.radians(center_lat))
+        return self.max_radius_m + math.hypot(half_lat, half_lng)
+
+    @staticmethod
+    def _gen_key(tile: tuple[int, int]) -> str:
+        return f"nearby:gen:{tile[0]}:{tile[1]}"
+
+    def _key(self, tile: tuple[int, int], kinds: Iterable[str]) -> str:
+        gen = self.backend.generation(self._gen_key(tile))
+        return f"nearby:{tile[0]}:{tile[1]}:g{gen}:{'+'.join(sorted(kinds))}"
+
+    # ---- 조회 ----
+    def get_nearby(self, kinds: list[str], user_lat: float, user_lng: float,
+                   radius_m: float, limit: int, fetch: Callable):
+        """캐시로 답할 수 있으면 결과 리스트, 아니면 None.
+        fetch(kinds, lat, lng, radius, limit)는 superset을 채울 때만 호출된다."""
+        if not self.enabled or radius_m > self.max_radius_m or not kinds:
+            self.counters["bypass"] += 1
+            return None
+        tile = self._tile(user_lat, user_lng)
+        key = self._key(tile, kinds)
+        c_lat, c_lng = self._tile_center(*tile)
+
+        entry = self.backend.get(key)
+        if entry is None:
+            self.counters["misses"] += 1
+            radius = self._superset_radius(c_lat)
+            items = fetch(kinds, c_lat, c_lng, radius, self.superset_limit)
+            # limit에 걸려 잘렸다면 마지막 항목 거리까지만 완전한 집합
+            covered = radius if len(items) < self.superset_limit else float(items[-1]["distance_m"])
+            entry = {"covered_m": covered, "items": items}
+            if getattr(items, "partial", False):  # parallel 모드에서 일부 kind가 timeout/error → 저장 안 함
+                self.counters["partial"] += 1
+            else:
+                self.backend.set(key, entry)
+        else:
+            self.counters["hits"] += 1
+
+        # 요청 원이 superset이 보장하는 원 안에 들어가야 정확하다
+        offset = float(haversine_m(c_lat, c_lng, np.array([user_lat]), np.array([user_lng]))[0])
+        if offset + radius_m > entry["covered_m"]:
+            self.counters["uncovered"] += 1
+            return None
+        return self._refilter(entry["items"], user_lat, user_lng, radius_m, limit)
+
+    @staticmethod
+    def _refilter(items: list[dict], lat: float, lng: float, radius_m: float, limit: int):
+        if not items:
+            return []
+        lats = np.fromiter((float(it["latitude"]) for it in items), dtype=np.float64, count=len(items))
+        lngs = np.fromiter((float(it["longitude"]) for it in items), dtype=np.float64, count=len(items))
+        d = haversine_m(lat, lng, lats, lngs)
+        idx = np.flatnonzero(d <= radius_m)
+        idx = idx[np.argsort(d[idx], kind="stable")][:max(limit, 0)]
+        return [dict(items[i], distance_m=float(d[i])) for i in idx]
+
+    # ---- 무효화 ----
+    def invalidate_point(self, kind: str, lat: float, lng: float) -> int:
+        """kind에 (lat, lng) 한 건이 추가됐을 때, 그 점을 superset에 담을 수 있는 타일의 세대를 올린다.
+        모든 kinds 조합이 같은 세대를 쓰므로 kind 와 상관없이 타일당 한 번. 올린 타일 수"""
+        if not self.enabled:
+            return 0
+        radius = self._superset_radius(lat)
+        min_lat, max_lat, min_lng, max_lng = bbox(lat, lng, radius)
+        i0, j0 = self._tile(min_lat, min_lng)
+        i1, j1 = self._tile(max_lat, max_lng)
+        tiles = [self._gen_key((i, j)) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+        self.backend.bump(tiles)
+        self.counters["invalidations"] += 1
+        return len(tiles)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, **self.counters}
+
+
+def _worker_count() -> int:
+    """gunicorn 워커 수 (WEB_CONCURRENCY, 모르면 1)"""
+    try:
+        return int(os.getenv("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        return 1
+
+
+nearby_cache = NearbyTileCache()
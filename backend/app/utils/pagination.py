@@ -0,0 +1,41 @@
+# backend/app/utils/pagination.py
+# (created_at, id) 키셋 커서 페이지네이션 헬퍼
+# - 커서는 마지막 항목의 created_at/id 를 base64로 감싼 불투명 문자열
+# - 정렬은 created_at DESC, id DESC 고정 → (…, created_at) 인덱스를 그대로 탄다
+
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: datetime, id_: int) -> str:
+    raw = f"{created_at.isoformat()}|{id_}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """잘못된 커서는 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, id_ = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(id_)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+
+
+def seek_after(created_col, id_col, cursor: str):
+    """DESC 정렬에서 커서 다음 항목들 조건"""
+    created_at, id_ = decode_cursor(cursor)
+    return or_(created_col < created_at, and_(created_col == created_at, id_col < id_))
+
+
+def keyset_page(query, created_col, id_col, cursor: str | None, size: int):
+    """(items, next_cursor). size+1개를 읽어 다음 페이지 존재 여부를 판단"""
+    if cursor:
+        query = query.filter(seek_after(created_col, id_col, cursor))
+    rows = query.order_by(created_col.desc(), id_col.desc()).limit(size + 1).all()
+    items = rows[:size]
+    has_more = len(rows) > size
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_more and items else None
+    return items, next_cursor
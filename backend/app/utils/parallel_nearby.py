@@ -0,0 +1,116 @@
+# backend/app/utils/parallel_nearby.py
+# nearby 를 kind(테이블)별 문장으로 나눠 동시에 실행하는 모드
+# - kind마다 풀에서 따로 커넥션을 잡아 실행 → 느린 테이블 하나가 나머지를 붙잡지 않는다
+# - 요청 예산(NEARBY_KIND_TIMEOUT_MS)은 job 이 풀 스레드에서 "시작한 뒤"부터 잰다
+#   → 풀 하나를 모든 요청 스레드가 나눠 쓰므로, 줄 서 있던 시간만으로 timeout 나지 않게
+# - 풀 대기는 따로 NEARBY_QUEUE_TIMEOUT_MS 까지. 넘기면 시작 전에 취소하고 queue_timeout
+# - 예산 안에 끝난 kind 결과만 distance_m 기준 k-way merge, 늦은/실패한 kind는 status 에
+#   timeout/queue_timeout/error 로 남기고 부분 결과를 돌려준다. status 에는 queue_ms(풀 대기)를 따로 적는다
+# - 이미 실행 중인 job 은 Future.cancel() 로 멈출 수 없다. 응답만 먼저 나가고 쿼리는 끝까지 돈다
+#   (MySQL 은 MAX_EXECUTION_TIME 힌트로 서버 쪽 실행이 같은 시간에 끊겨 풀 스레드/커넥션이 돌아온다)
+
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from operator import itemgetter
+from typing import Callable
+
+log = logging.getLogger(__name__)
+
+
+class KindResults(list):
+    """merge 된 결과 + kind별 status. partial 이면 nearby_cache 에 저장하지 않는다"""
+
+    def __init__(self, items, status: dict):
+        super().__init__(items)
+        self.status = status
+
+    @property
+    def partial(self) -> bool:
+        return any(s["status"] != "ok" for s in self.status.values())
+
+
+class ParallelNearby:
+    def __init__(self):
+        self.enabled = False
+        self.timeout_s = 0.8
+        self.queue_timeout_s = 1.0
+        self.max_workers = 8
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("NEARBY_EXEC_MODE", "union") == "parallel"
+        self.timeout_s = float(app.config.get("NEARBY_KIND_TIMEOUT_MS", 800)) / 1000
+        self.queue_timeout_s = float(app.config.get("NEARBY_QUEUE_TIMEOUT_MS", 1000)) / 1000
+        self.max_workers = int(app.config.get("NEARBY_PARALLEL_WORKERS", 8))
+
+    @property
+    def timeout_ms(self) -> int:
+        return max(1, int(self.timeout_s * 1000))
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="nearby")
+        return self._pool
+
+    @staticmethod
+    def _run_one(engine, stmt_for: Callable, kind: str, params: dict, started_at: dict):
+        started_at[kind] = started = time.perf_counter()
+        stmt = stmt_for(kind)
+        with engine.connect() as conn:
+            rows = [dict(r) for r in conn.execute(stmt, params).mappings()]
+        return rows, (time.perf_counter() - started) * 1000
+
+    def run(self, engine, kinds: list[str], stmt_for: Callable, params: dict, limit: int) -> KindResults:
+        """stmt_for(kind) 는 거리순 + limit 이 걸린 kind 하나짜리 SELECT"""
+        pool = self._executor()
+        started_at: dict[str, float] = {}  # kind → 풀 스레드에서 시작한 시각 (job 이 적는다)
+        submitted = time.perf_counter()
+        futures = {pool.submit(self._run_one, engine, stmt_for, k, params, started_at): k for k in kinds}
+
+        def deadline(fut):
+            s = started_at.get(futures[fut])
+            return submitted + self.queue_timeout_s if s is None else s + self.timeout_s
+
+        pending, expired = set(futures), set()
+        while pending:
+            now = time.perf_counter()
+            late = {f for f in pending if deadline(f) <= now}
+            expired |= late
+            pending -= late
+            if not pending:
+                break
+            done, _ = wait(pending, timeout=min(map(deadline, pending)) - now, return_when=FIRST_COMPLETED)
+            pending -= done
+
+        lists, status = [], {}
+        for fut, kind in futures.items():
+            s = started_at.get(kind)
+            queue_ms = round(((s if s is not None else time.perf_counter()) - submitted) * 1000, 1)
+            if fut in expired and not fut.done():
+                if fut.cancel():  # 풀에서 시작도 못 함
+                    status[kind] = {"status": "queue_timeout", "queue_ms": queue_ms}
+                else:  # 실행 중 — 멈출 수 없으니 결과만 버린다
+                    status[kind] = {"status": "timeout", "ms": self.timeout_ms, "queue_ms": queue_ms}
+                continue
+            try:
+                rows, ms = fut.result()
+            except Exception as e:
+                log.warning("nearby kind %s failed: %s", kind, e)
+                status[kind] = {"status": "error", "error": type(e).__name__, "queue_ms": queue_ms}
+                continue
+            lists.append(rows)
+            status[kind] = {"status": "ok", "count": len(rows), "ms": round(ms, 1), "queue_ms": queue_ms}
+
+        # 각 리스트가 이미 거리순이므로 merge 후 앞에서 limit개
+        items = list(islice(heapq.merge(*lists, key=itemgetter("distance_m")), max(limit, 0)))
+        return KindResults(items, status)
+
+
+parallel_nearby = ParallelNearby()
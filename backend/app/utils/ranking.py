@@ -0,0 +1,175 @@
+# backend/app/utils/ranking.py
+# nearby 후보 → 개인화 점수 순 top-k (/shelters/nearby?rank=1)
+# - 점수 = Σ 가중치 × 특성(0~1). 특성: 거리, 수용인원, 평균 평점, 쾌적도, 냉난방 가동, 건강 유형별 kind 선호
+# - 후보는 nearby 가 거리순으로 limit × RANKING_CANDIDATE_FACTOR 개 가져온 것. 추가 DB 는 리뷰 집계(kind별 IN) 한 번
+# - 특성은 후보 전체를 numpy 배열로 한꺼번에 계산, top-k 는 heapq.nlargest (동점이면 가까운 쪽)
+# - 리뷰가 적은 쉼터는 사전값 쪽으로 당긴다 (리뷰 1개짜리 5점이 맨 위로 오지 않게)
+# - explain=1 이면 항목마다 score_breakdown (특성별 가중치 × 값) → 가중치 튜닝용
+
+import heapq
+import json
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from ..models.shelter_review import Comfort, HVACStatus
+from .catalog import SOURCE_COLUMNS
+from .review_stats import ratings_for
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # 선택 의존성
+    _loads = json.loads
+
+FEATURES = ("distance", "capacity", "rating", "comfort", "hvac", "kind")
+DEFAULT_WEIGHTS = "distance=0.4,rating=0.2,comfort=0.1,hvac=0.1,capacity=0.1,kind=0.1"
+NEUTRAL = 0.5  # 값이 없는 특성 (수용인원 없는 kind 등)
+
+
+class Profile(NamedTuple):
+    """건강 유형별 이동 가능 거리(m, 이 거리에서 거리 점수 0) + kind 선호(0~1, 없는 kind 는 NEUTRAL)"""
+    reach_m: float
+    kinds: dict
+
+
+_RESPIRATORY = {"finedust": 1.0, "climate": 0.8}
+_ELDERLY = {"heat": 1.0, "climate": 0.8}
+_PREGNANT = {"climate": 1.0, "smart": 0.8, "finedust": 0.8}
+
+# users.health_type (회원가입 화면의 유형 A-1 ~ E, 거리는 화면에 안내하는 범위)
+HEALTH_PROFILES = {
+    1: Profile(1500, _RESPIRATORY),  # A-1 경증 장애
+    2: Profile(500, _RESPIRATORY),   # A-2 중증 장애
+    3: Profile(2000, _RESPIRATORY),  # B-1 경증 질환
+    4: Profile(2000, _RESPIRATORY),  # B-2 중증 질환
+    5: Profile(2500, _ELDERLY),      # C-1 65~79세
+    6: Profile(1500, _ELDERLY),      # C-2 80세 이상
+    7: Profile(2500, _PREGNANT),     # D-1 임신 초기
+    8: Profile(1500, _PREGNANT),     # D-2 임신 후기
+    9: Profile(3000, {}),            # E 해당 없음
+}
+DEFAULT_PROFILE = Profile(1500, {})
+
+
+def parse_weights(raw: str) -> dict[str, float]:
+    """"distance=0.4,rating=0.2" → {특성: 가중치}. 빠진 특성은 0, 모르는 이름은 ValueError"""
+    weights = dict.fromkeys(FEATURES, 0.0)
+    for part in filter(None, (p.strip() for p in raw.split(","))):
+        name, value = part.split("=", 1)
+        if name.strip() not in weights:
+            raise ValueError(f"unknown ranking feature: {name}")
+        weights[name.strip()] = float(value)
+    return weights
+
+
+def profile_for(health_type: int | None, age: int | None = None) -> Profile:
+    """health_type 이 없거나 '해당 없음'이면 나이로 노인 유형을 고른다. 1~9 밖이면 ValueError"""
+    if health_type is not None and health_type not in HEALTH_PROFILES:
+        raise ValueError(f"unknown health_type: {health_type}")
+    if health_type in (None, 9) and age is not None and age >= 65:
+        health_type = 6 if age >= 80 else 5
+    return HEALTH_PROFILES.get(health_type, DEFAULT_PROFILE)
+
+
+def _capacity(item) -> float:
+    """props 의 수용인원 (컬럼이 없는 kind 는 props 를 읽지 않고 nan)"""
+    col = SOURCE_COLUMNS.get(item.get("kind"), {}).get("capacity")
+    props = item.get("props") if col else None
+    if not props:
+        return math.nan
+    return _float((_loads(props) if isinstance(props, str) else props).get(col))
+
+
+def _float(v) -> float:
+    try:
+        return float(v) if v not in (None, "") else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class Ranker:
+    def __init__(self):
+        self.weights = parse_weights(DEFAULT_WEIGHTS)
+        self.candidate_factor = 4
+        self.max_candidates = 200
+        self.prior_reviews = 3.0
+        self.prior_rating = 3.5
+        self.capacity_ref = 100.0
+
+    def init_app(self, app):
+        cfg = app.config
+        self.weights = parse_weights(cfg.get("RANKING_WEIGHTS", DEFAULT_WEIGHTS))
+        self.candidate_factor = int(cfg.get("RANKING_CANDIDATE_FACTOR", 4))
+        self.max_candidates = int(cfg.get("RANKING_MAX_CANDIDATES", 200))
+        self.prior_reviews = float(cfg.get("RANKING_PRIOR_REVIEWS", 3))
+        self.prior_rating = float(cfg.get("RANKING_PRIOR_RATING", 3.5))
+        self.capacity_ref = float(cfg.get("RANKING_CAPACITY_REF", 100))
+
+    def candidates(self, limit: int) -> int:
+        """점수로 다시 고를 후보 수 (nearby 에 넘길 limit)"""
+        return max(limit, min(limit * self.candidate_factor, self.max_candidates))
+
+    def features(self, items: list[dict], ratings: dict, profile: Profile) -> np.ndarray:
+        """(len(FEATURES), n) 특성 행렬, 값은 0~1"""
+        n = len(items)
+        dist = np.fromiter((_float(it.get("distance_m")) for it in items), dtype=np.float64, count=n)
+        cap = np.fromiter((_capacity(it) for it in items), dtype=np.float64, count=n)
+        pref = np.fromiter((profile.kinds.get(it.get("kind"), NEUTRAL) for it in items), dtype=np.float64, count=n)
+        # 리뷰 집계: [개수, 평점합, 여유, 보통, 혼잡, on, off]
+        stats = np.zeros((n, 7))
+        for i, it in enumerate(items):
+            try:
+                r = ratings.get((it.get("kind"), int(it.get("id"))))
+            except (TypeError, ValueError):
+                r = None
+            if r:
+                c, h = r["comfort"], r["hvac"]
+                stats[i] = (r["count"], r["rating_sum"], c[Comfort.easy.value], c[Comfort.normal.value],
+                            c[Comfort.crowded.value], h[HVACStatus.on.value], h[HVACStatus.off.value])
+        m = self.prior_reviews
+        count, rating_sum, easy, normal, crowded, on, off = stats.T
+        return np.vstack((
+            np.nan_to_num(np.clip(1.0 - dist / profile.reach_m, 0.0, 1.0), nan=0.0),
+            np.nan_to_num(np.clip(np.log1p(np.maximum(cap, 0)) / math.log1p(self.capacity_ref), 0.0, 1.0),
+                          nan=NEUTRAL),
+            (rating_sum + self.prior_rating * m) / (count + m) / 5.0,
+            (easy + 0.5 * normal + NEUTRAL * m) / (easy + normal + crowded + m),
+            (on + NEUTRAL * m) / (on + off + m),
+            pref,
+        ))
+
+    def rank(self, session, items: list[dict], profile: Profile, k: int,
+             explain: bool = False, attach_ratings: bool = False) -> list[dict]:
+        """후보 → 점수 상위 k 개 (항목에 score, explain 이면 score_breakdown)"""
+        if not items:
+            return []
+        keys = []
+        for it in items:
+            try:
+                keys.append((it["kind"], int(it["id"])))
+            except (KeyError, TypeError, ValueError):
+                continue
+        ratings = ratings_for(session, keys)
+        w = np.array([self.weights[f] for f in FEATURES])
+        contrib = self.features(items, ratings, profile) * w[:, None]
+        scores = contrib.sum(axis=0).tolist()
+        top = heapq.nlargest(k, range(len(items)), key=scores.__getitem__)
+        out = []
+        for i in top:
+            it = dict(items[i], score=round(scores[i], 4))
+            if explain:
+                it["score_breakdown"] = {f: round(v, 4) for f, v in zip(FEATURES, contrib[:, i].tolist())}
+            if attach_ratings:
+                try:
+                    it["ratings"] = ratings.get((it["kind"], int(it["id"])))
+                except (KeyError, TypeError, ValueError):
+                    it["ratings"] = None
+            out.append(it)
+        return out
+
+    def describe(self, profile: Profile) -> dict:
+        return {"weights": dict(self.weights), "reach_m": profile.reach_m, "kind_preference": dict(profile.kinds)}
+
+
+ranker = Ranker()
@@ -1,18 +1,22 @@
 # backend/app/utils/repositories.py
 
-import math
+import json
+from functools import partial
 from typing import Iterable, List
-from sqlalchemy import Table, MetaData, select, func, and_, union_all, literal, cast, String, Float 
+from sqlalchemy import Table, select, func, and_, union_all, literal, cast, bindparam, String, Float, Integer
 from sqlalchemy.orm import Session
+from flask import current_app
 from ..models.shelters_map import KIND_TO_TABLE
+from .spatial_index import spatial_index
+from .schema_registry import schema_registry
+from .nearby_cache import nearby_cache
+from .parallel_nearby import parallel_nearby
+from .dedup import canonical_map
+from .catalog import SOURCE_COLUMNS, catalog, catalog_table
+from .hours import is_open, open_clause
+from .geo import bbox as _bbox
 from datetime import datetime
 
-def _bbox(lat: float, lng: float, radius_m: float):
-    deg_lat = radius_m / 111_320.0
-    cos_lat = max(0.01, math.cos(math.radians(lat)))
-    deg_lng = radius_m / (111_320.0 * cos_lat)
-    return (lat - deg_lat, lat + deg_lat, lng - deg_lng, lng + deg_lng)
-
 def _pick_col(t: Table, candidates: list[str]):
     cols = set(t.c.keys())
     for name in candidates:
@@ -70,7 +74,9 @@ def build_nearby_stmt_for_table(t: Table, kind: str, user_lat: float, user_lng:
     lng_f = cast(lng_col, Float)
 
     user_pt = func.ST_SRID(func.Point(user_lng, user_lat), 4326)
-    spot_pt = func.ST_SRID(func.Point(lng_f, lat_f), 4326)
+    # migrate_spatial 로 만든 geom(SPATIAL INDEX) 컬럼이 있으면 그걸 직접 사용
+    geom = _find_col_ci(t, ["geom"])
+    spot_pt = geom if geom is not None else func.ST_SRID(func.Point(lng_f, lat_f), 4326)
 
     # 거리 계산 
     distance = func.ST_Distance_Sphere(spot_pt, user_pt).label("distance_m")
@@ -87,13 +93,77 @@ def build_nearby_stmt_for_table(t: Table, kind: str, user_lat: float, user_lng:
         _props_json(t, exclude=exclude),
     ]
 
-    stmt = select(*cols).where(and_(
-        lat_f.between(min_lat, max_lat),
-        lng_f.between(min_lng, max_lng),
-        distance <= radius_m
-    ))
+    if geom is not None:
+        # bbox 사각형으로 공간 인덱스를 타고, 남은 후보만 정확한 거리로 거른다
+        envelope = func.ST_SRID(
+            func.ST_MakeEnvelope(func.Point(min_lng, min_lat), func.Point(max_lng, max_lat)), 4326
+        )
+        cond = and_(func.MBRContains(envelope, geom), distance <= radius_m)
+    else:
+        cond = and_(
+            lat_f.between(min_lat, max_lat),
+            lng_f.between(min_lng, max_lng),
+            distance <= radius_m
+        )
+    stmt = select(*cols).where(cond)
     return stmt
 
+# 요청마다 바뀌는 값은 바인드 파라미터로 → kinds 조합별 문장 하나를 계속 재사용
+_NEARBY_PARAMS = {
+    name: bindparam(name, type_=Float)
+    for name in ("user_lat", "user_lng", "radius_m", "min_lat", "max_lat", "min_lng", "max_lng")
+}
+
+def _build_nearby_union(tables: dict):
+    p = _NEARBY_PARAMS
+    subqueries = [
+        build_nearby_stmt_for_table(
+            t, k, p["user_lat"], p["user_lng"], p["radius_m"],
+            p["min_lat"], p["max_lat"], p["min_lng"], p["max_lng"]
+        )
+        for k, t in tables.items()
+    ]
+    u = union_all(*subqueries).subquery("u")
+    # 거리 오름차순 + limit
+    return select(u).order_by(u.c.distance_m.asc()).limit(bindparam("limit", type_=Integer))
+
+def _build_nearby_single(tables: dict, timeout_ms: int):
+    """parallel 모드용 kind 하나짜리 문장 (거리순 + limit, MySQL 은 서버 실행 시간도 제한)"""
+    (kind, t), = tables.items()
+    p = _NEARBY_PARAMS
+    stmt = build_nearby_stmt_for_table(
+        t, kind, p["user_lat"], p["user_lng"], p["radius_m"],
+        p["min_lat"], p["max_lat"], p["min_lng"], p["max_lng"]
+    )
+    return (stmt.order_by(stmt.selected_columns.distance_m.asc())
+            .limit(bindparam("limit", type_=Integer))
+            .prefix_with(f"/*+ MAX_EXECUTION_TIME({timeout_ms}) */", dialect="mysql"))
+
+def _build_nearby_catalog(_tables=None, open_day: int | None = None, include_unknown: bool = False):
+    """shelters_all 한 테이블에서 kinds 를 IN 으로: kind별 union 없이 문장 하나 (props 는 저장된 JSON 그대로)
+    open_day 가 있으면 그 요일의 운영시간 조건을 같은 WHERE 에 (시각은 open_minute 바인드)"""
+    p, t = _NEARBY_PARAMS, catalog_table
+    user_pt = func.ST_SRID(func.Point(p["user_lng"], p["user_lat"]), 4326)
+    distance = func.ST_Distance_Sphere(func.ST_SRID(func.Point(t.c.longitude, t.c.latitude), 4326), user_pt)
+    cond = [t.c.kind.in_(bindparam("kinds", expanding=True)),
+            t.c.latitude.between(p["min_lat"], p["max_lat"]),
+            t.c.longitude.between(p["min_lng"], p["max_lng"]),
+            distance <= p["radius_m"]]
+    if open_day is not None:
+        cond.append(open_clause(t, open_day, bindparam("open_minute", type_=Integer), include_unknown))
+    return (
+        select(cast(t.c.source_id, String).label("id"), t.c.kind, t.c.latitude, t.c.longitude,
+               distance.label("distance_m"), literal(None).label("name"), t.c.props)
+        .where(*cond)
+        .order_by(distance.asc())
+        .limit(bindparam("limit", type_=Integer))
+    )
+
+def nearby_params(user_lat: float, user_lng: float, radius_m: float, **extra) -> dict:
+    min_lat, max_lat, min_lng, max_lng = _bbox(user_lat, user_lng, radius_m)
+    return dict(user_lat=user_lat, user_lng=user_lng, radius_m=radius_m,
+                min_lat=min_lat, max_lat=max_lat, min_lng=min_lng, max_lng=max_lng, **extra)
+
 def get_nearby_multi_dynamic(
     session: Session,
     kinds: Iterable[str],
@@ -104,23 +174,86 @@ def get_nearby_multi_dynamic(
     if not kinds:
         return []
 
-    min_lat, max_lat, min_lng, max_lng = _bbox(user_lat, user_lng, radius_m)
     engine = session.get_bind()
-    md = MetaData()
-    subqueries = []
-    for k in kinds:
-        tname = KIND_TO_TABLE[k]
-        t = Table(tname, md, autoload_with=engine)
-        subqueries.append(
-            build_nearby_stmt_for_table(
-                t, k, user_lat, user_lng, radius_m, min_lat, max_lat, min_lng, max_lng
-            )
+    params = nearby_params(user_lat, user_lng, radius_m, limit=limit)
+    if parallel_nearby.enabled:
+        # kind별 동시 실행 + 마감 시간. 결과는 KindResults(list + kind별 status)
+        timeout_ms = parallel_nearby.timeout_ms
+        build = partial(_build_nearby_single, timeout_ms=timeout_ms)
+        return parallel_nearby.run(
+            engine, list(dict.fromkeys(kinds)),
+            lambda k: schema_registry.statement(engine, f"nearby_kind:{timeout_ms}", (k,), build),
+            params, limit,
         )
+    if catalog.covers(kinds):  # 통합 카탈로그: (kind, latitude, longitude) 인덱스, 문장 하나
+        stmt = schema_registry.statement(engine, "nearby_catalog", (), _build_nearby_catalog)
+        params["kinds"] = list(dict.fromkeys(kinds))
+        return [dict(r) for r in session.execute(stmt, params).mappings().all()]
+    stmt = schema_registry.statement(engine, "nearby", tuple(dict.fromkeys(kinds)), _build_nearby_union)
+    return [dict(r) for r in session.execute(stmt, params).mappings().all()]
 
-    u = union_all(*subqueries).subquery("u")
-    # 거리 오름차순 + limit
-    stmt = select(u).order_by(u.c.distance_m.asc()).limit(limit)
-    return [dict(r) for r in session.execute(stmt).mappings().all()]
+
+def _item_hours(item):
+    """nearby 항목 props 에서 원본 운영시간 문자열 (SQL 경로는 JSON 문자열, 인덱스 경로는 dict)"""
+    col = SOURCE_COLUMNS.get(item.get("kind"), {}).get("hours")
+    props = item.get("props")
+    if col is None or not props:
+        return None
+    if isinstance(props, str):
+        props = json.loads(props)
+    return props.get(col)
+
+
+def _nearby_open(session, kinds, user_lat, user_lng, radius_m, limit, open_at, include_unknown, fetch):
+    """지금(open_at) 운영 중인 쉼터만. 카탈로그가 있으면 운영시간 조건을 SQL 에 넣고,
+    없으면 NEARBY_OPEN_OVERFETCH 배수만큼 더 가져와서 원본 문자열로 거른다"""
+    day, minute = open_at
+    if catalog.covers(kinds):
+        engine = session.get_bind()
+        stmt = schema_registry.statement(
+            engine, f"nearby_catalog_open:{day}:{int(include_unknown)}", (),
+            partial(_build_nearby_catalog, open_day=day, include_unknown=include_unknown))
+        params = nearby_params(user_lat, user_lng, radius_m, limit=limit, kinds=kinds, open_minute=minute)
+        return [dict(r) for r in session.execute(stmt, params).mappings().all()]
+    overfetch = int(current_app.config.get("NEARBY_OPEN_OVERFETCH", 5))
+    items = fetch(kinds, user_lat, user_lng, radius_m, limit * overfetch)
+    return [it for it in items if is_open(_item_hours(it), day, minute, include_unknown)][:limit]
+
+
+def get_nearby(
+    session: Session,
+    kinds: Iterable[str],
+    user_lat: float, user_lng: float,
+    radius_m: float = 1500, limit: int = 20, status: dict | None = None, dedupe: bool = False,
+    open_at: tuple[int, int] | None = None, include_unknown: bool = False
+):
+    """인메모리 인덱스 → 타일 캐시 → SQL(union_all) 순서로 조회. 응답 형태는 모두 같다
+    status 에 dict를 넘기면 SQL을 parallel 모드로 실행했을 때 kind별 상태(ok/timeout/error)를 채운다
+    dedupe 면 데이터셋 간 중복을 대표 하나로 합친다 (항목에 kinds/duplicates, 묶음이면 canonical)
+    open_at=(요일, 분) 이면 그 시각에 운영 중인 쉼터만 (인덱스/캐시는 건너뛴다, 운영시간 모름은 include_unknown 일 때만)"""
+    kinds = list(dict.fromkeys(k.strip().lower() for k in kinds if k.strip().lower() in KIND_TO_TABLE))
+    dedupe = dedupe and canonical_map.active
+    want, limit = limit, (canonical_map.fetch_limit(limit, kinds) if dedupe else limit)
+    kind_status = {}
+
+    def fetch(ks, lat, lng, r, n):
+        res = get_nearby_multi_dynamic(session, ks, lat, lng, r, n)
+        kind_status.update(getattr(res, "status", {}))
+        return res
+
+    if open_at is not None:
+        items = _nearby_open(session, kinds, user_lat, user_lng, radius_m, limit, open_at, include_unknown, fetch)
+    else:
+        items = spatial_index.query(kinds, user_lat, user_lng, radius_m, limit)
+    if items is None:
+        items = nearby_cache.get_nearby(kinds, user_lat, user_lng, radius_m, limit, fetch=fetch)
+    if items is None:
+        items = fetch(kinds, user_lat, user_lng, radius_m, limit)
+    if status is not None:
+        status.update(kind_status)
+    if dedupe:
+        items = canonical_map.collapse(items, want)
+    return items
 
 
 # shelter_reviews 테이블에 리뷰를 삽입하는 함수 
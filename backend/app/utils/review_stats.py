@@ -0,0 +1,117 @@
+# backend/app/utils/review_stats.py
+# shelter_review_stats 집계 갱신/재계산/조회
+# - apply_reviews: 새 리뷰들을 (shelter_type, shelter_id)별 증분으로 묶어 upsert 한 번 (같은 트랜잭션)
+# - rebuild: shelter_reviews 전체를 GROUP BY 해서 다시 채움
+# - ratings_for: nearby/detail 의 include=ratings 용 (kind별 IN 쿼리 한 번)
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import case, delete, func, insert, select
+
+from ..models.shelter_review import Accessibility, Comfort, HVACStatus, ShelterReview, ShelterType
+from ..models.shelter_review_stats import ShelterReviewStats
+from .upsert import increment_stmt
+
+_stats = ShelterReviewStats.__table__
+KEY_COLS = ("shelter_type", "shelter_id")
+
+# 히스토그램 컬럼 ↔ (리뷰 컬럼, enum 값)
+HISTOGRAMS = {
+    "comfort": ("comfort", {Comfort.easy: "comfort_easy", Comfort.normal: "comfort_normal",
+                            Comfort.crowded: "comfort_crowded"}),
+    "accessibility": ("accessibility_rating", {Accessibility.high: "access_high",
+                                               Accessibility.mid: "access_mid",
+                                               Accessibility.low: "access_low"}),
+    "hvac": ("heating_cooling_status", {HVACStatus.on: "hvac_on", HVACStatus.off: "hvac_off"}),
+}
+COUNTER_COLS = ["review_count", "rating_sum"] + [
+    col for _, mapping in HISTOGRAMS.values() for col in mapping.values()
+]
+
+
+def _get(review, name):
+    return review.get(name) if isinstance(review, dict) else getattr(review, name)
+
+
+def deltas(reviews: Iterable) -> list[dict]:
+    """리뷰(ORM 객체 또는 dict) 묶음 → 쉼터별 증분 행"""
+    acc: dict[tuple, dict] = defaultdict(lambda: {c: 0 for c in COUNTER_COLS})
+    for r in reviews:
+        st = _get(r, "shelter_type")
+        st = st if isinstance(st, ShelterType) else ShelterType(st)
+        row = acc[(st, int(_get(r, "shelter_id")))]
+        row["review_count"] += 1
+        row["rating_sum"] += Decimal(str(_get(r, "rating")))
+        for attr, mapping in HISTOGRAMS.values():
+            col = mapping.get(_get(r, attr))
+            if col:
+                row[col] += 1
+    return [{"shelter_type": st, "shelter_id": sid, **vals} for (st, sid), vals in acc.items()]
+
+
+def apply_reviews(session, reviews: Iterable) -> int:
+    """호출한 세션의 트랜잭션 안에서 집계 증분 반영 (커밋은 호출부에서)"""
+    rows = deltas(reviews)
+    if not rows:
+        return 0
+    stmt = increment_stmt(_stats, session.get_bind().dialect.name, KEY_COLS, COUNTER_COLS)
+    session.execute(stmt, rows)
+    return len(rows)
+
+
+def rebuild(session) -> int:
+    """shelter_reviews 전체에서 다시 계산 (기존 집계는 지움)"""
+    r = ShelterReview
+    cols = [r.shelter_type, r.shelter_id, func.count(), func.coalesce(func.sum(r.rating), 0)]
+    names = ["shelter_type", "shelter_id", "review_count", "rating_sum"]
+    for attr, mapping in HISTOGRAMS.values():
+        for value, col in mapping.items():
+            cols.append(func.sum(case((getattr(r, attr) == value, 1), else_=0)))
+            names.append(col)
+    src = select(*cols).group_by(r.shelter_type, r.shelter_id)
+    session.execute(delete(_stats))
+    session.execute(insert(_stats).from_select(names, src))
+    return session.execute(select(func.count()).select_from(_stats)).scalar()
+
+
+def serialize(row) -> dict:
+    count = row.review_count or 0
+    return {
+        "count": count,
+        "rating_sum": float(row.rating_sum or 0),
+        "average": round(float(row.rating_avg), 2) if count and row.rating_avg is not None else None,
+        **{name: {value.value: getattr(row, col) for value, col in mapping.items()}
+           for name, (_, mapping) in HISTOGRAMS.items()},
+    }
+
+
+def ratings_for(session, keys: Iterable[tuple[str, int]]) -> dict[tuple[str, int], dict]:
+    """[(kind, id)] → {(kind, id): 집계}. 리뷰 대상이 아닌 kind(extra 등)는 빠진다"""
+    by_kind: dict[str, set[int]] = defaultdict(set)
+    for kind, sid in keys:
+        if kind in ShelterType.__members__:
+            by_kind[kind].add(int(sid))
+    out = {}
+    for kind, ids in by_kind.items():
+        rows = session.execute(
+            select(_stats).where(_stats.c.shelter_type == ShelterType(kind), _stats.c.shelter_id.in_(ids))
+        ).all()
+        for row in rows:
+            out[(kind, row.shelter_id)] = serialize(row)
+    return out
+
+
+def attach_ratings(session, items: list[dict]) -> list[dict]:
+    """nearby 응답 행들에 ratings 필드 추가 (리뷰 없으면 null)"""
+    keys = []
+    for it in items:
+        try:
+            keys.append((it["kind"], int(it["id"])))
+        except (TypeError, ValueError):
+            keys.append(None)
+    found = ratings_for(session, [k for k in keys if k is not None])
+    for it, k in zip(items, keys):
+        it["ratings"] = found.get(k) if k is not None else None
+    return items
@@ -0,0 +1,181 @@
+# backend/app/utils/review_writer.py
+# 리뷰 쓰기 버퍼 (REVIEW_WRITE_BEHIND=1 일 때 create_review 가 사용)
+# - 검증(CreateReviewSchema)은 요청 스레드에서 끝내고, 행만 큐에 넣는다
+# - 백그라운드 스레드가 REVIEW_BATCH_SIZE 개가 모이거나 첫 행이 REVIEW_FLUSH_MS 기다렸으면
+#   한 트랜잭션에서 multi-row INSERT + 집계(apply_reviews) 증분 → 커밋 한 번 (group commit)
+# - 응답 시점 (REVIEW_ACK):
+#     commit : 그 행이 들어간 배치가 커밋된 뒤 201 (지금과 같은 내구성, 동시 요청끼리 커밋을 나눠 씀)
+#     queued : 큐에 넣자마자 202 (커밋 전 프로세스가 죽으면 유실 가능)
+# - 배치가 실패하면 행마다 따로 다시 넣어 실패한 행만 에러로 돌려준다
+# - 큐가 REVIEW_QUEUE_MAX 를 넘으면 submit 이 None → 호출부가 기존 동기 경로로 쓴다
+# - 종료 시(atexit) 남은 행을 모두 쓰고 끝낸다
+# - 응답의 id: RETURNING 을 지원하는 DB(sqlite/postgres/mariadb)는 그대로 받고,
+#   MySQL 은 배치를 INSERT 한 문장(VALUES 여러 개)으로 넣고 LAST_INSERT_ID()(첫 행 id)부터
+#   auto_increment_increment 간격으로 계산한다. 행 수가 정해진 simple insert 라 InnoDB 는
+#   innodb_autoinc_lock_mode 0/1/2 모두 한 문장 안의 id 를 연속으로 준다
+# - 큐에 넣은 요청도 쓰기로 표시 → db/routing.py 의 read-your-writes 로 그 user 의 다음 읽기는 primary
+
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+from flask import g, has_request_context
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from ..models.shelter_review import ShelterReview
+from .review_stats import apply_reviews
+
+log = logging.getLogger(__name__)
+
+_reviews = ShelterReview.__table__
+
+
+class ReviewWriter:
+    def __init__(self):
+        self.enabled = False
+        self.ack = "commit"
+        self.batch_size = 100
+        self.flush_s = 0.005
+        self.ack_timeout_s = 5.0
+        self.queue_max = 10_000
+        self._app = None
+        self._buf: list[tuple[dict, Future]] = []
+        self._first_at: float | None = None
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.batches = self.rows = self.failed = self.fallbacks = 0
+        self.last_batch_ms = 0.0
+        self._id_step: int | None = None  # MySQL @@auto_increment_increment (첫 배치 때 한 번 읽음)
+
+    def init_app(self, app):
+        cfg = app.config
+        self.enabled = bool(cfg.get("REVIEW_WRITE_BEHIND", False))
+        self.ack = cfg.get("REVIEW_ACK", "commit")
+        if self.ack not in ("commit", "queued"):
+            raise ValueError(f"REVIEW_ACK must be commit or queued, got {self.ack!r}")
+        self.batch_size = int(cfg.get("REVIEW_BATCH_SIZE", 100))
+        self.flush_s = float(cfg.get("REVIEW_FLUSH_MS", 5)) / 1000
+        self.ack_timeout_s = float(cfg.get("REVIEW_ACK_TIMEOUT_MS", 5000)) / 1000
+        self.queue_max = int(cfg.get("REVIEW_QUEUE_MAX", 10_000))
+        self._app = app
+        if self.enabled:
+            atexit.register(self.close)
+
+    @property
+    def durable(self) -> bool:
+        return self.ack == "commit"
+
+    # ---- 요청 스레드 ----
+    def submit(self, row: dict) -> Future | None:
+        """검증된 리뷰 행 → Future (결과는 id 가 채워진 행). 꺼져 있거나 큐가 가득이면 None"""
+        if not self.enabled or self._closed:
+            return None
+        now = datetime.now()
+        row = dict(row, created_at=row.get("created_at") or now, updated_at=now)
+        fut: Future = Future()
+        with self._cond:
+            if len(self._buf) >= self.queue_max:
+                self.fallbacks += 1
+                return None
+            first = not self._buf
+            if first:
+                self._first_at = time.monotonic()
+            self._buf.append((row, fut))
+            if self._thread is None:  # 첫 리뷰 때 시작 (시작 시 스레드/DB 연결 없음)
+                self._thread = threading.Thread(target=self._run, name="review-writer", daemon=True)
+                self._thread.start()
+            if first or len(self._buf) >= self.batch_size:  # 빈 큐에서 기다리던 스레드가 마감 시각을 잡도록
+                self._cond.notify()
+        if has_request_context():  # 커밋은 백그라운드 스레드라 RoutingSession 이 못 본다
+            g._db_wrote = True
+        return fut
+
+    # ---- 백그라운드 ----
+    def _take(self) -> list[tuple[dict, Future]]:
+        """배치가 찼거나 기다릴 만큼 기다렸으면 꺼낸다 (닫는 중이면 남은 것 전부)"""
+        with self._cond:
+            while True:
+                if self._buf and (self._closed or len(self._buf) >= self.batch_size
+                                  or time.monotonic() - self._first_at >= self.flush_s):
+                    batch, self._buf = self._buf[:self.batch_size], self._buf[self.batch_size:]
+                    self._first_at = time.monotonic() if self._buf else None
+                    return batch
+                if self._closed:
+                    return []
+                timeout = None if not self._buf else max(0.0, self.flush_s - (time.monotonic() - self._first_at))
+                self._cond.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = self._take()
+            if not batch:
+                return
+            self._flush(batch)
+
+    def _write(self, session, rows: list[dict]) -> list[dict]:
+        dialect = session.get_bind().dialect
+        if dialect.insert_executemany_returning:  # sqlite/postgres/mariadb: id 를 같이 받는다
+            ids = session.execute(insert(_reviews).returning(_reviews.c.id, sort_by_parameter_order=True),
+                                  rows).scalars().all()
+        else:  # MySQL: 한 문장 multi-row INSERT → lastrowid(=LAST_INSERT_ID(), 첫 행)부터 연속
+            first_id = session.execute(insert(_reviews).values(rows)).lastrowid
+            if self._id_step is None:
+                self._id_step = int(session.execute(text("SELECT @@auto_increment_increment")).scalar() or 1)
+            ids = [first_id + i * self._id_step for i in range(len(rows))] if first_id else [None] * len(rows)
+        apply_reviews(session, rows)  # 집계도 같은 트랜잭션
+        return [dict(r, id=i) for r, i in zip(rows, ids)]
+
+    def _flush(self, batch: list[tuple[dict, Future]]):
+        from ..db import db
+        started = time.perf_counter()
+        rows = [r for r, _ in batch]
+        with self._app.app_context():
+            engine = db.engine
+            try:
+                with Session(engine) as session, session.begin():
+                    saved = self._write(session, rows)
+                for (_, fut), row in zip(batch, saved):
+                    fut.set_result(row)
+            except Exception as e:  # 행 하나가 배치 전체를 막지 않도록 하나씩 다시
+                log.warning("review batch of %d failed (%s), retrying one by one", len(batch), e)
+                for row, fut in batch:
+                    try:
+                        with Session(engine) as session, session.begin():
+                            fut.set_result(self._write(session, [row])[0])
+                    except Exception as row_error:
+                        self.failed += 1
+                        log.error("review insert failed: %s", row_error)
+                        fut.set_exception(row_error)
+        self.batches += 1
+        self.rows += len(batch)
+        self.last_batch_ms = (time.perf_counter() - started) * 1000
+
+    def close(self):
+        """남은 행을 모두 쓰고 스레드 종료 (atexit)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "durable": self.durable,
+            "queued": len(self._buf),
+            "batches": self.batches,
+            "rows": self.rows,
+            "avg_batch": round(self.rows / self.batches, 2) if self.batches else 0,
+            "last_batch_ms": round(self.last_batch_ms, 2),
+            "failed": self.failed,
+            "fallbacks": self.fallbacks,
+        }
+
+
+review_writer = ReviewWriter()
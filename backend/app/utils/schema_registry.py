@@ -0,0 +1,82 @@
+# backend/app/utils/schema_registry.py
+# 쉼터 테이블 스키마 캐시
+# - 테이블 리플렉션(information_schema 조회)은 테이블당 한 번만
+# - nearby SELECT 문은 kinds 조합별로 한 번만 만들고, lat/lng/radius 등은 바인드 파라미터로
+# - 스키마가 바뀌면 invalidate()로 비운다: 실행 중인 앱에서는 table_watch 가 틱마다
+#   reflected_columns() 와 실제 컬럼을 비교해 호출한다 (마이그레이션은 다른 프로세스라 직접 못 부름)
+
+import threading
+from collections import Counter
+from typing import Callable
+
+from sqlalchemy import MetaData, Table
+from sqlalchemy.engine import Engine
+
+from ..models.shelters_map import KIND_TO_TABLE
+
+
+class SchemaRegistry:
+    def __init__(self):
+        self._tables: dict[tuple[str, str], Table] = {}
+        self._stmts: dict[tuple, object] = {}
+        self._lock = threading.RLock()
+        # reflections가 요청 경로에서 더 이상 늘지 않는지 확인하는 용도
+        self.counters = Counter()
+
+    @staticmethod
+    def _key(engine: Engine) -> str:
+        return engine.url.render_as_string(hide_password=True)
+
+    def table(self, engine: Engine, kind: str) -> Table:
+        tname = KIND_TO_TABLE[kind]
+        key = (self._key(engine), tname)
+        t = self._tables.get(key)
+        if t is not None:
+            self.counters["table_hits"] += 1
+            return t
+        with self._lock:
+            t = self._tables.get(key)
+            if t is None:
+                t = Table(tname, MetaData(), autoload_with=engine)
+                self._tables[key] = t
+                self.counters["reflections"] += 1
+            return t
+
+    def statement(self, engine: Engine, name: str, kinds: tuple[str, ...],
+                  build: Callable[[dict[str, Table]], object]):
+        """(name, kinds) 조합별 문장 캐시. build는 {kind: Table}을 받아 SQL 구문을 만든다"""
+        key = (self._key(engine), name, kinds)
+        stmt = self._stmts.get(key)
+        if stmt is not None:
+            self.counters["stmt_hits"] += 1
+            return stmt
+        with self._lock:
+            stmt = self._stmts.get(key)
+            if stmt is None:
+                stmt = build({k: self.table(engine, k) for k in kinds})
+                self._stmts[key] = stmt
+                self.counters["stmt_builds"] += 1
+            return stmt
+
+    def reflected_columns(self, engine: Engine, kind: str) -> set[str] | None:
+        """캐시된 리플렉션의 컬럼 이름 (아직 안 읽었으면 None)"""
+        t = self._tables.get((self._key(engine), KIND_TO_TABLE[kind]))
+        return None if t is None else {c.name for c in t.c}
+
+    def invalidate(self, kind: str | None = None):
+        """kind 하나(또는 전체)의 리플렉션/문장 캐시 제거"""
+        with self._lock:
+            if kind is None:
+                self._tables.clear()
+                self._stmts.clear()
+            else:
+                tname = KIND_TO_TABLE.get(kind)
+                self._tables = {k: v for k, v in self._tables.items() if k[1] != tname}
+                self._stmts = {k: v for k, v in self._stmts.items() if kind not in k[2]}
+            self.counters["invalidations"] += 1
+
+    def stats(self) -> dict:
+        return {**self.counters, "tables": len(self._tables), "statements": len(self._stmts)}
+
+
+schema_registry = SchemaRegistry()
@@ -2,10 +2,29 @@
 import time
 import jwt
 from functools import wraps
+from typing import NamedTuple
 from flask import request, jsonify, g
+from sqlalchemy import event
 from ..models.user import User
 from ..db import db
-from ..config import JWT_SECRET, JWT_ALGORITHM, JWT_ACCESS_TTL_SECONDS, JWT_REFRESH_TTL_SECONDS
+from ..config import (JWT_SECRET, JWT_ALGORITHM, JWT_ACCESS_TTL_SECONDS, JWT_REFRESH_TTL_SECONDS,
+                      AUTH_CLAIMS_CACHE_TTL_SECONDS, AUTH_CLAIMS_CACHE_SIZE,
+                      AUTH_USER_CACHE_TTL_SECONDS, AUTH_USER_CACHE_SIZE, AUTH_ALWAYS_LOAD_USER)
+from .ttl_cache import TTLCache
+
+# 토큰 문자열 -> 디코딩된 claims (서명 검증은 처음 한 번만)
+_claims_cache = TTLCache(maxsize=AUTH_CLAIMS_CACHE_SIZE, ttl=AUTH_CLAIMS_CACHE_TTL_SECONDS)
+# user id -> CachedUser (User 수정/삭제 시 무효화)
+_user_cache = TTLCache(maxsize=AUTH_USER_CACHE_SIZE, ttl=AUTH_USER_CACHE_TTL_SECONDS)
+
+
+class CachedUser(NamedTuple):
+    """세션과 무관하게 캐시할 수 있는 User 스냅샷"""
+    id: int
+    email: str
+    age: int
+    health_type: int
+
 
 def create_access_token(user_id: int):
     now = int(time.time())
@@ -20,37 +39,96 @@ def create_refresh_token(user_id: int):
 def decode_token(token: str):
     return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
 
+def decode_token_cached(token: str):
+    """decode_token + 짧은 캐시. 만료 시각을 넘겨 캐시하지 않는다"""
+    payload = _claims_cache.get(token)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        _claims_cache.delete(token)
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    payload = decode_token(token)
+    ttl = min(AUTH_CLAIMS_CACHE_TTL_SECONDS, payload.get("exp", 0) - time.time())
+    if ttl > 0:
+        _claims_cache.set(token, payload, ttl=ttl)
+    return payload
+
 def get_token_from_header():
     auth = request.headers.get("Authorization", "")
     if not auth.startswith("Bearer "):
         return None
     return auth.split(" ", 1)[1].strip()
 
-def require_auth(fn):
+def load_user(user_id: int) -> CachedUser | None:
+    user = _user_cache.get(user_id)
+    if user is None:
+        row = db.session.get(User, user_id)
+        if row is None:
+            return None
+        user = CachedUser(row.id, row.email, row.age, row.health_type)
+        _user_cache.set(user_id, user)
+    return user
+
+def invalidate_user(user_id: int):
+    _user_cache.delete(user_id)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _on_user_change(mapper, connection, target):
+    invalidate_user(target.id)
+
+def user_id_from_request():
+    """Authorization 헤더의 access 토큰 → user id (없거나 잘못되면 None). DB 조회 없음"""
+    token = get_token_from_header()
+    if not token:
+        return None
+    try:
+        payload = decode_token_cached(token)
+        if payload.get("type") != "access":
+            return None
+        return int(payload["sub"])
+    except (jwt.InvalidTokenError, KeyError, TypeError, ValueError):
+        return None
+
+def require_auth(fn=None, *, load_user_row: bool = True):
+    """
+    @require_auth                       → g.current_user(CachedUser)까지 채움 (캐시 미스 때만 DB)
+    @require_auth(load_user_row=False)  → user id만 필요한 라우트. DB를 전혀 안 탐
+                                          (AUTH_ALWAYS_LOAD_USER=1 이면 항상 User 확인)
+    """
+    if fn is None:
+        return lambda f: require_auth(f, load_user_row=load_user_row)
+
     @wraps(fn)
     def wrapper(*args, **kwargs):
         token = get_token_from_header()
         if not token:
             return jsonify({"error": "unauthorized", "message": "Missing Bearer token"}), 401
         try:
-            payload = decode_token(token)
+            payload = decode_token_cached(token)
             if payload.get("type") != "access":
                 return jsonify({"error": "unauthorized", "message": "Invalid token type"}), 401
             user_id = int(payload["sub"])
-            user = db.session.get(User, user_id)
-            if not user:
-                return jsonify({"error": "unauthorized", "message": "User not found"}), 401
-            # 요청 수명 동안 접근 가능
-            g.current_user = user
-            return fn(*args, **kwargs)
         except jwt.ExpiredSignatureError:
             return jsonify({"error": "token_expired"}), 401
         except jwt.InvalidTokenError:
             return jsonify({"error": "invalid_token"}), 401
+        # 요청 수명 동안 접근 가능
+        g.current_user_id = user_id
+        if load_user_row or AUTH_ALWAYS_LOAD_USER:
+            user = load_user(user_id)
+            if not user:
+                return jsonify({"error": "unauthorized", "message": "User not found"}), 401
+            g.current_user = user
+        return fn(*args, **kwargs)
     return wrapper
 
 def get_current_user_id():
     # reviews 라우터에서 사용
-    from flask import g
+    return getattr(g, "current_user_id", None)
+
+def get_current_user() -> CachedUser | None:
     user = getattr(g, "current_user", None)
-    return user.id if user else None
+    if user is None and getattr(g, "current_user_id", None) is not None:
+        user = g.current_user = load_user(g.current_user_id)
+    return user
@@ -0,0 +1,131 @@
+# backend/app/utils/shelter_details.py
+# 쉼터 상세/요약 조회
+# - 테이블별 응답 컬럼(projection)을 여기 한 곳에 선언하고, kind마다 IN 쿼리 한 번으로 가져온다
+# - DETAIL: /shelters/detail, /shelters/details 응답 / SUMMARY: 즐겨찾기 목록의 shelter 필드
+# - 상세 행은 프로세스 내 TTL 캐시 (원본 데이터는 적재 때만 바뀜 → 반복 조회는 DB를 안 탄다)
+#   적재(ingest)는 다른 프로세스라 캐시를 지울 수 없으므로 TTL 을 HTTP max-age(SHELTER_CACHE_MAX_AGE)와
+#   같게 둔다 → 적재 후 옛 상세가 보이는 시간은 브라우저 캐시와 같은 한도. 없는 쉼터는 캐시하지 않는다
+# - 통합 카탈로그(shelters_all)가 해당 kind 들을 덮으면 kind 가 섞여도 (kind, id) IN 쿼리 한 번,
+#   응답 모양은 같은 projection 으로 카탈로그의 props 에서 다시 만든다
+
+from sqlalchemy import and_, bindparam, column, or_, select, table
+
+from ..config import DETAIL_CACHE_SIZE, DETAIL_CACHE_TTL_SECONDS
+from ..models.shelters_map import KIND_TO_TABLE
+from .catalog import catalog, catalog_table, props_of
+from .ttl_cache import TTLCache
+
+
+class Projection:
+    """kind 하나의 응답 컬럼. columns: "컬럼" 또는 ("컬럼", "응답 키")"""
+
+    def __init__(self, kind: str, *columns):
+        self.kind = kind
+        self.columns = tuple((c, c) if isinstance(c, str) else tuple(c) for c in columns)
+        t = table(KIND_TO_TABLE[kind], *[column(src) for src in dict.fromkeys(s for s, _ in self.columns)])
+        self.stmt = (select(*[t.c[src].label(key) for src, key in self.columns])
+                     .where(t.c.id.in_(bindparam("ids", expanding=True))))
+
+    def fetch(self, session, ids) -> dict[int, dict]:
+        ids = list(ids)
+        if not ids:
+            return {}
+        rows = session.execute(self.stmt, {"ids": ids}).mappings().all()
+        return {int(r["id"]): dict(r) for r in rows}
+
+    def from_props(self, data: dict) -> dict:
+        """카탈로그 props(원본 컬럼 dict) → fetch 와 같은 모양"""
+        return {key: data.get(src) for src, key in self.columns}
+
+
+DETAIL = {p.kind: p for p in (
+    Projection("heat", "id", "facility_type_2", "shelter_name", "road_address", "capacity", "latitude", "longitude"),
+    Projection("smart", "id", "facility_name", "detailed_address", "latitude", "longitude"),
+    Projection("finedust", "id", "shelter_name", "road_address", "capacity", ("time", "openclose"),
+               "latitude", "longitude"),
+    Projection("climate", "id", "facility_name", "shelter_name", "road_address", ("time", "openclose"),
+               "latitude", "longitude"),
+    Projection("extra", "id", "shelter_name", "road_address", "facility_type", "time", "capacity",
+               "latitude", "longitude", "note"),
+)}
+
+# 즐겨찾기 응답의 shelter 필드: 키는 모든 kind 공통(SUMMARY_KEYS), 테이블에 없는 값은 null
+SUMMARY_KEYS = ("id", "name", "road_address", "lot_address", "capacity", "latitude", "longitude",
+                "facility_type_1", "facility_type_2")
+SUMMARY = {p.kind: p for p in (
+    Projection("heat", "id", ("shelter_name", "name"), "road_address", "lot_address", "capacity",
+               "latitude", "longitude", "facility_type_1", "facility_type_2"),
+    Projection("climate", "id", ("shelter_name", "name"), "road_address", "latitude", "longitude"),
+    Projection("finedust", "id", ("shelter_name", "name"), "road_address", "capacity", "latitude", "longitude"),
+    Projection("smart", "id", ("facility_name", "name"), ("detailed_address", "road_address"),
+               "latitude", "longitude"),
+    Projection("extra", "id", ("shelter_name", "name"), "road_address", "capacity", "latitude", "longitude"),
+)}
+
+_detail_cache = TTLCache(maxsize=DETAIL_CACHE_SIZE, ttl=DETAIL_CACHE_TTL_SECONDS)
+
+def _fetch_catalog(session, ids_by_kind: dict) -> dict[tuple[str, int], dict]:
+    """{kind: ids} → {(kind, id): 원본 컬럼 dict}. kind 가 섞여도 한 번
+    (kind, id) 행 값 IN 대신 kind 별 OR — SQLite 는 행 값 IN 이면 PK 를 못 타고 전체 스캔한다"""
+    t = catalog_table
+    conds = [and_(t.c.kind == kind, t.c.source_id.in_(list(ids))) for kind, ids in ids_by_kind.items() if ids]
+    if not conds:
+        return {}
+    rows = session.execute(
+        select(t.c.kind, t.c.source_id, t.c.latitude, t.c.longitude, t.c.props).where(or_(*conds))
+    ).mappings().all()
+    return {(r["kind"], int(r["source_id"])): props_of(r) for r in rows}
+
+
+def _fetch(session, projections: dict, ids_by_kind: dict) -> dict[str, dict[int, dict]]:
+    """{kind: ids} → {kind: {id: projection 모양}}. 카탈로그가 덮으면 한 쿼리, 아니면 kind별 IN 쿼리"""
+    out = {kind: {} for kind in ids_by_kind}
+    if len(ids_by_kind) > 1 and catalog.covers(ids_by_kind):
+        found = _fetch_catalog(session, ids_by_kind)
+        for (kind, sid), data in found.items():
+            out[kind][sid] = projections[kind].from_props(data)
+        return out
+    for kind, ids in ids_by_kind.items():
+        out[kind] = projections[kind].fetch(session, ids)
+    return out
+
+
+def parse_key(key: str) -> tuple[str, int] | None:
+    """"heat:12" → ("heat", 12). 형식이 틀리거나 모르는 kind 면 None"""
+    kind, sep, sid = str(key).strip().partition(":")
+    kind = kind.strip().lower()
+    if not sep or kind not in DETAIL:
+        return None
+    try:
+        return kind, int(sid)
+    except ValueError:
+        return None
+
+
+def fetch_details(session, keys) -> dict[tuple[str, int], dict]:
+    """[(kind, id)] → {(kind, id): 상세}. 캐시에 없는 것만 kind별 IN 쿼리 한 번. 없는 쉼터는 빠진다"""
+    out, missing = {}, {}
+    for kind, sid in keys:
+        row = _detail_cache.get((kind, sid))
+        if row is not None:
+            out[(kind, sid)] = row
+        else:
+            missing.setdefault(kind, set()).add(sid)
+    for kind, rows in _fetch(session, DETAIL, missing).items():
+        for sid, row in rows.items():
+            _detail_cache.set((kind, sid), row)
+            out[(kind, sid)] = row
+    return out
+
+
+def fetch_summaries(session, kind: str, ids) -> dict[int, dict]:
+    """즐겨찾기용 요약. SUMMARY_KEYS 모양으로 맞춰 돌려준다"""
+    return fetch_summaries_multi(session, {kind: ids}).get(kind, {})
+
+
+def fetch_summaries_multi(session, ids_by_kind: dict) -> dict[str, dict[int, dict]]:
+    """{kind: ids} → {kind: {id: 요약}}. 모르는 kind 는 빈 dict"""
+    known = {k: set(ids) for k, ids in ids_by_kind.items() if k in SUMMARY and ids}
+    rows = _fetch(session, SUMMARY, known)
+    return {kind: {sid: {k: row.get(k) for k in SUMMARY_KEYS} for sid, row in rows.get(kind, {}).items()}
+            for kind in ids_by_kind}
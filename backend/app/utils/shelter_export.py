@@ -0,0 +1,133 @@
+# backend/app/utils/shelter_export.py
+# 뷰포트(bbox) 안의 쉼터 전체를 스트리밍으로 내보내기 (/shelters/export)
+# - kind별 SELECT 를 서버 사이드 커서(stream_results)로 열고 yield_per 행씩 꺼내 바로 흘려보낸다
+#   → 일치하는 행이 몇 개든 서버 메모리는 배치 하나 크기
+# - ndjson: 한 줄에 쉼터 하나 {"kind","id","latitude","longitude","name","road_address"}
+# - packed: 배치 하나가 한 줄(frame). 좌표는 1e-6도 정수 델타 배열, 문자열은 frame 안의 사전 인덱스
+#   마지막 줄은 {"done": true, "count": N, "kinds": {kind: n}}
+# - open_at 이 있으면 운영 중인 쉼터만: 카탈로그가 있으면 shelters_all 에 운영시간 조건,
+#   없으면 원본 운영시간 문자열을 함께 읽어 배치마다 거른다
+
+from functools import lru_cache
+
+from sqlalchemy import bindparam, column, select, table, Float, Integer
+
+from ..models.shelters_map import KIND_TO_TABLE
+from .catalog import SOURCE_COLUMNS, catalog_table
+from .hours import is_open, open_clause
+from .shelter_details import SUMMARY
+
+EXPORT_FIELDS = ("id", "latitude", "longitude", "name", "road_address")
+STRING_FIELDS = ("name", "road_address")
+COORD_SCALE = 1_000_000  # 1e-6도 ≈ 0.1m
+WORLD_BBOX = dict(min_lat=-90.0, max_lat=90.0, min_lng=-180.0, max_lng=180.0)  # 전체 적재용
+
+
+def _bbox_cond(t):
+    return (t.c.latitude.between(bindparam("min_lat", type_=Float), bindparam("max_lat", type_=Float)),
+            t.c.longitude.between(bindparam("min_lng", type_=Float), bindparam("max_lng", type_=Float)))
+
+
+def _export_stmt(kind: str, with_hours: bool = False):
+    """SUMMARY projection 에서 내보낼 컬럼만 골라 bbox + id 순 SELECT
+    with_hours 면 원본 운영시간 문자열도 hours 로 (없는 kind 는 그대로)"""
+    cols = [(src, key) for src, key in SUMMARY[kind].columns if key in EXPORT_FIELDS]
+    if with_hours and SOURCE_COLUMNS[kind].get("hours"):
+        cols.append((SOURCE_COLUMNS[kind]["hours"], "hours"))
+    t = table(KIND_TO_TABLE[kind], *[column(src) for src in dict.fromkeys(s for s, _ in cols)])
+    return select(*[t.c[src].label(key) for src, key in cols]).where(*_bbox_cond(t)).order_by(t.c.id)
+
+
+EXPORT = {kind: _export_stmt(kind) for kind in SUMMARY}
+EXPORT_WITH_HOURS = {kind: _export_stmt(kind, with_hours=True) for kind in SUMMARY}
+
+
+@lru_cache(maxsize=None)
+def _catalog_open_stmt(day: int, include_unknown: bool):
+    """shelters_all 에서 kind 하나 + bbox + 그 요일 운영시간 조건 ((kind, latitude, longitude) 인덱스 범위 안에서 거름)"""
+    t = catalog_table
+    return (select(t.c.source_id.label("id"), t.c.latitude, t.c.longitude, t.c.name, t.c.road_address)
+            .where(t.c.kind == bindparam("kind"), *_bbox_cond(t),
+                   open_clause(t, day, bindparam("open_minute", type_=Integer), include_unknown))
+            .order_by(t.c.source_id))
+
+
+def parse_bbox(raw: str) -> dict:
+    """"minLng,minLat,maxLng,maxLat" (GeoJSON 순서) → 바인드 파라미터. 형식이 틀리면 ValueError"""
+    min_lng, min_lat, max_lng, max_lat = (float(v) for v in raw.split(","))
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+        raise ValueError("bbox 범위 오류")
+    return dict(min_lat=min_lat, max_lat=max_lat, min_lng=min_lng, max_lng=max_lng)
+
+
+def iter_batches(session, kinds, bbox: dict, yield_per: int,
+                 open_at: tuple[int, int] | None = None, include_unknown: bool = False, indexed: bool = False):
+    """(kind, [행 dict, ...]) 를 yield_per 개씩. kind 하나가 끝나야 다음 kind 커서를 연다
+    open_at=(요일, 분) 이면 운영 중인 것만. indexed(카탈로그 동기화됨)면 SQL 조건, 아니면 배치마다 거름"""
+    for kind in kinds:
+        post_filter = open_at is not None and not indexed
+        if open_at is None:
+            stmt, params = EXPORT[kind], bbox
+        elif indexed:
+            stmt, params = _catalog_open_stmt(open_at[0], include_unknown), dict(bbox, kind=kind, open_minute=open_at[1])
+        else:
+            stmt, params = EXPORT_WITH_HOURS[kind], bbox
+        result = session.execute(stmt, params,
+                                 execution_options={"stream_results": True, "yield_per": yield_per})
+        try:
+            for part in result.mappings().partitions():
+                if post_filter:
+                    part = [r for r in part if is_open(r.get("hours"), *open_at, include_unknown)]
+                if part:
+                    yield kind, part
+        finally:
+            result.close()
+
+
+def _row(kind: str, r) -> dict:
+    return {"kind": kind, **{k: r.get(k) for k in EXPORT_FIELDS}}
+
+
+def ndjson_lines(batches, dumps):
+    """배치마다 줄들을 합쳐 bytes 하나로 (chunk 수를 줄여 압축/전송 오버헤드를 낮춘다)"""
+    for kind, rows in batches:
+        yield b"".join(dumps(_row(kind, r)) for r in rows)
+
+
+def _delta(values) -> list[int]:
+    out, prev = [], 0
+    for v in values:
+        cur = round(float(v) * COORD_SCALE) if v is not None else prev
+        out.append(cur - prev)
+        prev = cur
+    return out
+
+
+def packed_frames(batches, dumps):
+    """배치 하나 → frame 한 줄. 사전은 frame 안에서만 유효 (스트림 전체 사전을 들고 있지 않는다)"""
+    total, per_kind = 0, {}
+    for kind, rows in batches:
+        strings, index = [], {}
+
+        def ref(v):
+            if v is None:
+                return -1
+            i = index.get(v)
+            if i is None:
+                i = index[v] = len(strings)
+                strings.append(v)
+            return i
+
+        frame = {
+            "kind": kind,
+            "n": len(rows),
+            "id": [r["id"] for r in rows],
+            "lat": _delta(r["latitude"] for r in rows),
+            "lng": _delta(r["longitude"] for r in rows),
+            **{f: [ref(r.get(f)) for r in rows] for f in STRING_FIELDS},
+            "strings": strings,
+        }
+        total += len(rows)
+        per_kind[kind] = per_kind.get(kind, 0) + len(rows)
+        yield dumps(frame)
+    yield dumps({"done": True, "count": total, "kinds": per_kind, "scale": COORD_SCALE})
@@ -0,0 +1,299 @@
+# backend/app/utils/spatial_index.py
+# /shelters/nearby 용 인메모리 공간 인덱스
+# - kind(테이블)별로 좌표를 numpy 배열에 올리고 격자(grid) 버킷으로 후보를 좁힌다
+# - 후보 거리 계산은 벡터화 haversine, 상위 limit개는 힙으로 선택
+# - 꺼져 있거나 오래된(stale) 경우 query()가 None을 돌려주고, 호출부는 SQL로 폴백한다
+# - 인덱스는 워커(프로세스)마다 따로 있다. add()는 자기 워커만 고치므로, 다른 워커가 쓴 변경은
+#   table_watch(백그라운드 스레드)가 TABLE_WATCH_SECONDS 마다 읽는 MAX(id) 로 알아챈다:
+#   적재 때 값과 다르면 그 kind 를 stale 로 표시(SQL 폴백) + 백그라운드 재적재
+#   → 다른 워커에서 추가한 쉼터가 보이기까지 최대 감시 주기 + 재적재 시간 (요청은 DB 도장을 읽지 않는다)
+# - MAX(id) 로 못 잡는 변경(기존 행 수정/삭제)은 SPATIAL_INDEX_MAX_AGE_SECONDS 마다 전체 재적재로 반영
+
+import decimal
+import hashlib
+import heapq
+import json
+import logging
+import math
+import threading
+import time
+from datetime import date, datetime
+from typing import Iterable
+
+import numpy as np
+from sqlalchemy import func, select
+
+from ..models.shelters_map import KIND_TO_TABLE
+from .geo import bbox, haversine_m
+from .schema_registry import schema_registry
+
+log = logging.getLogger(__name__)
+
+# repositories.build_nearby_stmt_for_table 의 props 제외 컬럼과 동일
+PROPS_EXCLUDE = {"latitude", "longitude", "lat", "lng", "x", "y", "location", "geom", "shape"}
+LAT_NAMES = ["latitude", "lat", "y", "위도"]
+LNG_NAMES = ["longitude", "lng", "x", "경도"]
+
+
+def _pick_name(keys: Iterable[str], candidates: list[str]):
+    m = {k.lower(): k for k in keys}
+    for name in candidates:
+        if name.lower() in m:
+            return m[name.lower()]
+    return None
+
+
+def _json_default(v):
+    if isinstance(v, decimal.Decimal):
+        return float(v)
+    if isinstance(v, (datetime, date)):
+        return v.isoformat(sep=" ") if isinstance(v, datetime) else v.isoformat()
+    return str(v)
+
+
+def props_json(row: dict) -> str:
+    """MySQL json_object(...)와 같은 내용을 JSON 문자열로 (응답 형태 유지)"""
+    props = {k: v for k, v in row.items() if k.lower() not in PROPS_EXCLUDE}
+    return json.dumps(props, ensure_ascii=False, default=_json_default)
+
+
+def make_item(kind: str, row: dict, lat_key: str, lng_key: str):
+    """테이블 row(dict) → nearby 응답 항목(distance_m 제외). 좌표가 없으면 None"""
+    try:
+        lat = float(row[lat_key]); lng = float(row[lng_key])
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(lat) or math.isnan(lng):
+        return None
+    id_key = _pick_name(row.keys(), ["id"])
+    if id_key is not None:
+        sid = str(row[id_key])
+    else:
+        sid = hashlib.md5(f"{kind}:{row[lng_key]}:{row[lat_key]}".encode()).hexdigest()
+    return {
+        "id": sid,
+        "kind": kind,
+        "latitude": lat,
+        "longitude": lng,
+        "name": row.get("name"),
+        "props": props_json(row),
+    }
+
+
+class _KindGrid:
+    """kind 하나의 좌표 배열 + 격자 버킷. 변경 시 새 객체를 만들어 교체(copy-on-write)"""
+
+    def __init__(self, kind: str, items: list[dict], cell_deg: float):
+        self.kind = kind
+        self.cell_deg = cell_deg
+        self.items = items
+        self.lats = np.fromiter((it["latitude"] for it in items), dtype=np.float64, count=len(items))
+        self.lngs = np.fromiter((it["longitude"] for it in items), dtype=np.float64, count=len(items))
+        self.buckets = self._build_buckets()
+
+    def _cells(self, lats, lngs):
+        return (np.floor(lats / self.cell_deg).astype(np.int64),
+                np.floor(lngs / self.cell_deg).astype(np.int64))
+
+    def _build_buckets(self) -> dict:
+        if not self.items:
+            return {}
+        ci, cj = self._cells(self.lats, self.lngs)
+        order = np.lexsort((cj, ci))
+        ci, cj = ci[order], cj[order]
+        # 같은 셀이 연속되도록 정렬한 뒤 경계에서 자른다
+        cut = np.flatnonzero((np.diff(ci) != 0) | (np.diff(cj) != 0)) + 1
+        starts = np.concatenate(([0], cut))
+        ends = np.concatenate((cut, [len(order)]))
+        return {(int(ci[s]), int(cj[s])): order[s:e] for s, e in zip(starts, ends)}
+
+    def with_item(self, item: dict) -> "_KindGrid":
+        g = object.__new__(_KindGrid)
+        g.kind, g.cell_deg = self.kind, self.cell_deg
+        g.items = self.items + [item]
+        g.lats = np.append(self.lats, item["latitude"])
+        g.lngs = np.append(self.lngs, item["longitude"])
+        g.buckets = dict(self.buckets)
+        key = (int(math.floor(item["latitude"] / self.cell_deg)),
+               int(math.floor(item["longitude"] / self.cell_deg)))
+        idx = len(g.items) - 1
+        old = g.buckets.get(key)
+        g.buckets[key] = np.array([idx]) if old is None else np.append(old, idx)
+        return g
+
+    def candidates(self, min_lat, max_lat, min_lng, max_lng) -> np.ndarray:
+        i0, i1 = math.floor(min_lat / self.cell_deg), math.floor(max_lat / self.cell_deg)
+        j0, j1 = math.floor(min_lng / self.cell_deg), math.floor(max_lng / self.cell_deg)
+        # 반경이 너무 커서 셀이 버킷 수보다 많으면 전체 스캔이 더 싸다
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self.buckets):
+            return np.arange(len(self.items))
+        parts = [self.buckets[(i, j)]
+                 for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)
+                 if (i, j) in self.buckets]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def within(self, lat, lng, radius_m):
+        """반경 안의 (거리 배열, 인덱스 배열)"""
+        idx = self.candidates(*bbox(lat, lng, radius_m))
+        if idx.size == 0:
+            return idx.astype(np.float64), idx
+        d = haversine_m(lat, lng, self.lats[idx], self.lngs[idx])
+        mask = d <= radius_m
+        return d[mask], idx[mask]
+
+
+class SpatialIndex:
+    def __init__(self):
+        self.enabled = False
+        self.max_age = 3600.0
+        self.cell_deg = 0.01
+        self.loaded_at: float | None = None
+        self._grids: dict[str, _KindGrid] = {}
+        self._stale: set[str] = set()
+        self._lock = threading.Lock()
+        self._engine = None
+        self._reloading = False
+        self._stamps: dict[str, int | None] = {}  # kind → 적재 시점 MAX(id)
+
+    def init_app(self, app):
+        self.enabled = bool(app.config.get("SPATIAL_INDEX_ENABLED", False))
+        self.max_age = float(app.config.get("SPATIAL_INDEX_MAX_AGE_SECONDS", 3600))
+        self.cell_deg = float(app.config.get("SPATIAL_INDEX_CELL_DEG", 0.01))
+        if not self.enabled:
+            return
+        from ..db import db
+        from .table_watch import table_watch
+        table_watch.subscribe(self.on_tables)
+        with app.app_context():
+            try:
+                self.load(db.engine)
+            except Exception as e:  # DB가 잠깐 안 될 때도 앱은 떠야 함 → SQL 폴백
+                log.warning("spatial index load failed, falling back to SQL: %s", e)
+
+    # ---- 적재 ----
+    def _load_kind(self, engine, conn, kind: str) -> tuple[_KindGrid, int | None]:
+        t = schema_registry.table(engine, kind)
+        # 행보다 먼저 → 읽는 사이 들어온 행은 다음 감시 틱에 다시 적재
+        stamp = conn.execute(select(func.max(t.c.id))).scalar() if "id" in t.c else None
+        keys = [c.name for c in t.c]
+        lat_key, lng_key = _pick_name(keys, LAT_NAMES), _pick_name(keys, LNG_NAMES)
+        if lat_key is None or lng_key is None:
+            raise ValueError(f"[{t.name}] 위도/경도 컬럼을 찾지 못했습니다. columns={keys}")
+        items = []
+        for r in conn.execute(select(t)).mappings():
+            it = make_item(kind, dict(r), lat_key, lng_key)
+            if it is not None:
+                items.append(it)
+        return _KindGrid(kind, items, self.cell_deg), stamp
+
+    def load(self, engine, kinds: Iterable[str] | None = None):
+        """kinds를 테이블에서 읽어 인덱스를 (재)구성. 실패한 kind는 인덱스에서 빠져 SQL로 폴백"""
+        self._engine = engine
+        kinds = list(kinds) if kinds is not None else list(KIND_TO_TABLE)
+        started = time.perf_counter()
+        grids, stamps = {}, {}
+        with engine.connect() as conn:
+            for k in kinds:
+                try:
+                    grids[k], stamps[k] = self._load_kind(engine, conn, k)
+                except Exception as e:
+                    log.warning("spatial index: skip kind=%s (%s)", k, e)
+        with self._lock:
+            for k in kinds:
+                self._grids.pop(k, None)
+                self._stamps.pop(k, None)
+            self._grids.update(grids)
+            self._stamps.update(stamps)
+            self._stale.difference_update(grids)
+            if len(kinds) == len(KIND_TO_TABLE) or self.loaded_at is None:
+                self.loaded_at = time.time()
+        log.info("spatial index loaded %s in %.1fms",
+                 {k: len(g.items) for k, g in grids.items()}, (time.perf_counter() - started) * 1000)
+
+    def _reload_async(self, kinds: Iterable[str] | None = None):
+        with self._lock:
+            if self._engine is None or self._reloading:
+                return
+            self._reloading = True
+
+        def run():
+            try:
+                self.load(self._engine, kinds)
+            except Exception as e:
+                log.warning("spatial index reload failed: %s", e)
+            finally:
+                with self._lock:
+                    self._reloading = False
+
+        threading.Thread(target=run, name="spatial-index-reload", daemon=True).start()
+
+    # ---- 갱신 ----
+    def add(self, kind: str, row: dict):
+        """쓰기 직후 한 건 반영 (/add_shelter)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            grid = self._grids.get(kind)
+            if grid is None:
+                return
+            keys = list(row.keys())
+            item = make_item(kind, row, _pick_name(keys, LAT_NAMES) or "latitude",
+                             _pick_name(keys, LNG_NAMES) or "longitude")
+            if item is None:
+                return
+            self._grids[kind] = grid.with_item(item)
+            if kind in self._stamps:  # 자기 쓰기로는 재적재하지 않도록 도장도 같이 올린다
+                try:
+                    self._stamps[kind] = max(self._stamps[kind] or 0, int(item["id"]))
+                except ValueError:
+                    pass
+
+    def mark_stale(self, kinds: Iterable[str] | None = None):
+        with self._lock:
+            self._stale.update(kinds if kinds is not None else self._grids.keys())
+
+    def on_tables(self, conn, max_ids: dict, schema_changed: set):
+        """table_watch 틱 (백그라운드 스레드): 적재 때와 MAX(id)/컬럼이 다른 kind 는 stale + 재적재"""
+        with self._lock:
+            changed = [k for k, stamp in self._stamps.items()
+                       if (k in max_ids and max_ids[k] != stamp) or k in schema_changed]
+        if changed:
+            log.info("spatial index: %s changed in DB, reloading", changed)
+            self.mark_stale(changed)
+            self._reload_async(changed)  # 이미 재적재 중이면 다음 틱에 다시 걸린다
+
+    # ---- 조회 ----
+    def usable(self, kinds: Iterable[str]) -> bool:
+        if not self.enabled or self.loaded_at is None:
+            return False
+        if time.time() - self.loaded_at > self.max_age:
+            self._reload_async()
+            return False
+        return all(k in self._grids and k not in self._stale for k in kinds)
+
+    def query(self, kinds: Iterable[str], user_lat: float, user_lng: float,
+              radius_m: float = 1500, limit: int = 20):
+        """get_nearby_multi_dynamic 과 같은 형태의 리스트. 인덱스를 못 쓰면 None"""
+        kinds = [k.strip().lower() for k in kinds if k.strip().lower() in KIND_TO_TABLE]
+        if not kinds:
+            return []
+        if not self.usable(kinds):
+            return None
+        grids = [self._grids[k] for k in kinds]
+        found = []
+        for g in grids:
+            d, idx = g.within(user_lat, user_lng, radius_m)
+            found.extend(zip(d.tolist(), [g] * len(idx), idx.tolist()))
+        top = heapq.nsmallest(max(limit, 0), found, key=lambda t: t[0])
+        return [dict(g.items[i], distance_m=d) for d, g, i in top]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "loaded_at": self.loaded_at,
+            "kinds": {k: len(g.items) for k, g in self._grids.items()},
+            "stale": sorted(self._stale),
+        }
+
+
+spatial_index = SpatialIndex()
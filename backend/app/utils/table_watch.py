@@ -0,0 +1,128 @@
+# backend/app/utils/table_watch.py
+# 쉼터 테이블 변경 감시 (워커마다 백그라운드 스레드 하나 → 요청 경로에서는 DB 를 읽지 않는다)
+# - TABLE_WATCH_SECONDS 마다 kind별 MAX(id) 를 읽는다 (PK 인덱스 끝 한 번 → InnoDB 에서도 스캔 없음)
+#   새 행(다른 워커의 /add_shelter, ingest)은 잡고, 기존 행 수정·중간 id 삭제는 못 잡는다
+#   → 그건 구독자 각자의 주기 재적재(SPATIAL_INDEX_MAX_AGE_SECONDS 등)에 맡긴다
+# - 같은 틱에 실제 컬럼 목록(SELECT * ... WHERE 1 = 0 의 결과 컬럼)을 schema_registry 의 리플렉션과 비교해
+#   다르면 schema_registry.invalidate(kind) → migrate_spatial 의 geom 추가, ALTER 로 붙인 컬럼을
+#   재시작 없이 다음 요청부터 반영 (다시 리플렉션은 이 스레드가 MAX(id) 를 읽으며 먼저 한다)
+# - 구독자는 subscribe(fn) 로 등록하고, 매 틱 fn(conn, max_ids, schema_changed) 를 받는다
+#   (conn 은 감시 스레드의 커넥션, schema_changed 는 이번 틱에 무효화한 kind)
+# - 스레드는 첫 요청 때 시작 (gunicorn 이 fork 하기 전에 만든 스레드는 워커에 없다)
+
+import logging
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import func, select
+
+from ..models.shelters_map import KIND_TO_TABLE
+from .schema_registry import schema_registry
+
+log = logging.getLogger(__name__)
+
+
+class TableWatch:
+    def __init__(self):
+        self.interval = 5.0
+        self.max_ids: dict[str, int | None] = {}
+        self.checked_at: float | None = None
+        self.ticks = self.errors = self.schema_changes = 0
+        self.last_ms = 0.0
+        self._listeners: list[Callable] = []
+        self._app = None
+        self._thread: threading.Thread | None = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.interval = float(app.config.get("TABLE_WATCH_SECONDS", 5))
+        self._app = app
+        app.before_request(self.ensure_started)
+
+    def subscribe(self, fn: Callable):
+        """fn(conn, max_ids, schema_changed) — 감시 스레드에서 호출되므로 빨리 끝내고, 오래 걸리는 일은 자기 스레드로"""
+        if fn not in self._listeners:
+            self._listeners.append(fn)
+
+    def ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="table-watch", daemon=True)
+                self._thread.start()
+
+    def poke(self):
+        """다음 틱을 기다리지 않고 바로 확인 (sync 직후 등)"""
+        self._wake.set()
+
+    # ---- 백그라운드 ----
+    def _check_schema(self, conn) -> set[str]:
+        """리플렉션해 둔 컬럼과 실제 컬럼이 다른 kind 를 schema_registry 에서 지운다"""
+        from ..db import db
+        q = db.engine.dialect.identifier_preparer.quote
+        changed = set()
+        for kind, tname in KIND_TO_TABLE.items():
+            have = schema_registry.reflected_columns(db.engine, kind)
+            if have is None:  # 아직 안 읽었으면 처음 쓸 때 최신 스키마로 읽는다
+                continue
+            try:
+                cols = set(conn.exec_driver_sql(f"SELECT * FROM {q(tname)} WHERE 1 = 0").keys())
+            except Exception:  # 테이블이 잠깐 없음 (재생성 중) → 다음 틱에
+                continue
+            if cols != have:
+                log.info("table watch: %s columns changed, invalidating cached schema", tname)
+                schema_registry.invalidate(kind)
+                changed.add(kind)
+        return changed
+
+    def _max_ids(self, conn) -> dict[str, int | None]:
+        from ..db import db
+        out = {}
+        for kind in KIND_TO_TABLE:
+            try:
+                t = schema_registry.table(db.engine, kind)
+            except Exception:  # 없는 테이블(smart/extra 미적재 등)은 감시 대상에서 빠진다
+                continue
+            if "id" in t.c:
+                out[kind] = conn.execute(select(func.max(t.c.id))).scalar()
+        return out
+
+    def check(self):
+        """한 틱: MAX(id) 를 읽고 구독자에게 알린다 (테스트/시작 시 직접 불러도 된다)"""
+        from ..db import db
+        started = time.perf_counter()
+        try:
+            with self._app.app_context(), db.engine.connect() as conn:
+                schema_changed = self._check_schema(conn)
+                self.schema_changes += len(schema_changed)
+                self.max_ids = self._max_ids(conn)
+                for fn in self._listeners:
+                    try:
+                        fn(conn, self.max_ids, schema_changed)
+                    except Exception as e:
+                        log.warning("table watch listener %s failed: %s", getattr(fn, "__qualname__", fn), e)
+            self.checked_at = time.time()
+        except Exception as e:  # DB 가 잠깐 안 되면 다음 틱에 다시
+            self.errors += 1
+            log.warning("table watch check failed: %s", e)
+        self.ticks += 1
+        self.last_ms = (time.perf_counter() - started) * 1000
+
+    def _run(self):
+        while True:
+            self.check()
+            if self.interval <= 0:  # 0 이면 첫 요청 때 한 번만
+                return
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def stats(self) -> dict:
+        return {"interval_s": self.interval, "checked_at": self.checked_at, "ticks": self.ticks,
+                "errors": self.errors, "schema_changes": self.schema_changes,
+                "last_ms": round(self.last_ms, 2), "max_ids": dict(self.max_ids)}
+
+
+table_watch = TableWatch()
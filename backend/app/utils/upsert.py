@@ -0,0 +1,42 @@
+# backend/app/utils/upsert.py
+# 방언(MySQL/SQLite)별 upsert / insert-ignore 구문 헬퍼
+# conn.execute(stmt, rows) 로 executemany 하면 pymysql이 다중 행 INSERT로 묶어 보낸다
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, sqlite
+
+
+def upsert_stmt(table: Table, dialect_name: str, key_cols, update_cols=None):
+    """key_cols(유니크 키) 충돌 시 update_cols를 새 값으로 덮어쓰는 INSERT"""
+    key_cols = list(key_cols)
+    if update_cols is None:
+        update_cols = [c.name for c in table.c if c.name not in key_cols and not c.primary_key]
+    if dialect_name == "mysql":
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_cols})
+    if dialect_name == "sqlite":
+        stmt = sqlite.insert(table)
+        return stmt.on_conflict_do_update(index_elements=key_cols,
+                                          set_={c: stmt.excluded[c] for c in update_cols})
+    raise NotImplementedError(f"upsert not supported for dialect {dialect_name}")
+
+
+def insert_ignore_stmt(table: Table, dialect_name: str):
+    """유니크 키 충돌 행은 조용히 건너뛰는 INSERT"""
+    if dialect_name == "mysql":
+        return mysql.insert(table).prefix_with("IGNORE")
+    if dialect_name == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    raise NotImplementedError(f"insert ignore not supported for dialect {dialect_name}")
+
+
+def increment_stmt(table: Table, dialect_name: str, key_cols, inc_cols):
+    """key_cols 충돌 시 inc_cols를 기존 값 + 새 값으로 누적하는 INSERT (카운터/합계 테이블용)"""
+    if dialect_name == "mysql":
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in inc_cols})
+    if dialect_name == "sqlite":
+        stmt = sqlite.insert(table)
+        return stmt.on_conflict_do_update(index_elements=list(key_cols),
+                                          set_={c: table.c[c] + stmt.excluded[c] for c in inc_cols})
+    raise NotImplementedError(f"increment upsert not supported for dialect {dialect_name}")
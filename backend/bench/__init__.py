@@ -0,0 +1 @@
+# backend/bench
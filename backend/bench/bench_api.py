@@ -0,0 +1,292 @@
+"""Flask API 엔드투엔드 벤치마크 (create_app() + 합성 데이터)
+
+- 로컬 DB(기본: 임시 SQLite + 공간 함수 대역, 또는 --database-url 로 컨테이너 MySQL)에
+  쉼터/사용자/리뷰/즐겨찾기를 지정한 양만큼 채우고 create_app() 으로 앱을 띄운다
+- 시나리오(엔드포인트)마다 고정 동시성으로 요청을 보내 처리량, p50/p95/p99 지연, 요청당 쿼리 수를 잰다
+  (요청은 스레드마다 test_client 로 프로세스 안에서 보낸다 → 네트워크 제외, 앱 + DB 비용만)
+- 결과는 JSON (커밋 간 비교용). --output 이 없으면 stdout
+
+사용법 (repo 루트에서):
+    python -m backend.bench.bench_api
+    python -m backend.bench.bench_api --shelters 50000 --reviews 200000 --concurrency 16 --requests 2000
+    python -m backend.bench.bench_api --scenarios nearby detail --output bench.json
+    python -m backend.bench.bench_api --database-url mysql+pymysql://root:pw@127.0.0.1:3306/safe_on_bench
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_SQLITE = Path(tempfile.gettempdir()) / "safeon_bench.db"
+
+
+# ---- 시나리오: (rng, ctx) → (method, path, kwargs) ----
+def _nearby(rng, ctx):
+    lat, lng = ctx["point"](rng)
+    kinds = ",".join(ctx["kinds"])
+    return "GET", f"/shelters/nearby?lat={lat:.6f}&lng={lng:.6f}&radius={ctx['radius']}&limit=20&kinds={kinds}", {}
+
+
+def _nearby_ratings(rng, ctx):
+    method, path, kw = _nearby(rng, ctx)
+    return method, path + "&include=ratings", kw
+
+
+def _detail(rng, ctx):
+    kind = rng.choice(ctx["kinds"])
+    return "GET", f"/shelters/detail/{kind}/{ctx['shelter_id'](rng, kind)}", {}
+
+
+def _details_batch(rng, ctx):
+    keys = []
+    for _ in range(20):
+        kind = rng.choice(ctx["kinds"])
+        keys.append(f"{kind}:{ctx['shelter_id'](rng, kind)}")
+    return "GET", f"/shelters/details?keys={','.join(keys)}", {}
+
+
+def _export(rng, ctx):
+    lat, lng = ctx["point"](rng)
+    d = 0.02  # 약 2km 사각형
+    kinds = ",".join(ctx["kinds"])
+    return "GET", f"/shelters/export?bbox={lng - d:.6f},{lat - d:.6f},{lng + d:.6f},{lat + d:.6f}&kinds={kinds}", {}
+
+
+def _reviews_list(rng, ctx):
+    kind = rng.choice(ctx["kinds"])
+    return "GET", f"/shelters/{kind}/{ctx['shelter_id'](rng, kind)}/reviews?size=10", {}
+
+
+def _reviews_cursor(rng, ctx):
+    kind = rng.choice(ctx["kinds"])
+    return "GET", f"/shelters/{kind}/{ctx['shelter_id'](rng, kind)}/reviews?size=10&cursor=", {}
+
+
+def _reviews_create(rng, ctx):
+    kind = rng.choice(ctx["kinds"])
+    body = {"rating": rng.choice([1, 2, 3, 4, 5]), "review_text": "bench", "comfort": "보통"}
+    return "POST", f"/shelters/{kind}/{ctx['shelter_id'](rng, kind)}/reviews", {
+        "json": body, "headers": ctx["auth"](rng)}
+
+
+def _favorites_list(rng, ctx):
+    return "GET", "/favorites?limit=20", {"headers": ctx["auth"](rng)}
+
+
+def _favorites_sync(rng, ctx):
+    items = []
+    for _ in range(20):
+        kind = rng.choice(ctx["kinds"])
+        items.append({"op": rng.choice(["add", "add", "remove"]), "shelter_type": kind,
+                      "shelter_id": ctx["shelter_id"](rng, kind)})
+    return "POST", "/favorites/sync", {"json": {"items": items}, "headers": ctx["auth"](rng)}
+
+
+def _auth_me(rng, ctx):
+    return "GET", "/auth/me", {"headers": ctx["auth"](rng)}
+
+
+SCENARIOS = {
+    "nearby": _nearby,
+    "nearby_ratings": _nearby_ratings,
+    "detail": _detail,
+    "details_batch": _details_batch,
+    "export": _export,
+    "reviews_list": _reviews_list,
+    "reviews_cursor": _reviews_cursor,
+    "reviews_create": _reviews_create,
+    "favorites_sync": _favorites_sync,
+    "favorites_list": _favorites_list,
+    "auth_me": _auth_me,
+}
+
+
+# ---- 쿼리 카운터 (요청은 스레드 하나에서 끝나므로 스레드별로 센다) ----
+class QueryCounter:
+    def __init__(self):
+        self._local = threading.local()
+
+    def install(self, engine):
+        from sqlalchemy import event
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self._local.n = getattr(self._local, "n", 0) + 1
+
+    def take(self) -> int:
+        n = getattr(self._local, "n", 0)
+        self._local.n = 0
+        return n
+
+
+def _pct(values, q):
+    return round(float(np.percentile(values, q)), 3) if len(values) else None
+
+
+def run_scenario(app, name, make, ctx, counter, requests, concurrency, warmup, seed):
+    """requests 개를 concurrency 개 스레드로 나눠 보낸다"""
+    per_worker = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker(i):
+        rng = random.Random(seed * 1000 + i)
+        client = app.test_client()
+        for _ in range(warmup):
+            method, path, kw = make(rng, ctx)
+            client.open(path, method=method, **kw)
+        counter.take()
+        lat, queries, errors, codes = [], [], 0, {}
+        barrier.wait()
+        for _ in range(per_worker[i]):
+            method, path, kw = make(rng, ctx)
+            t0 = time.perf_counter()
+            resp = client.open(path, method=method, **kw)
+            resp.get_data()
+            lat.append((time.perf_counter() - t0) * 1000)
+            queries.append(counter.take())
+            codes[resp.status_code] = codes.get(resp.status_code, 0) + 1
+            errors += resp.status_code >= 500
+        return lat, queries, errors, codes
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(worker, i) for i in range(concurrency)]
+        barrier.wait()
+        started = time.perf_counter()
+        results = [f.result() for f in futures]
+        elapsed = time.perf_counter() - started
+
+    lat = [x for r in results for x in r[0]]
+    queries = [x for r in results for x in r[1]]
+    codes = {}
+    for r in results:
+        for code, n in r[3].items():
+            codes[str(code)] = codes.get(str(code), 0) + n
+    return {
+        "scenario": name,
+        "requests": len(lat),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(lat) / elapsed, 2) if elapsed else None,
+        "latency_ms": {"mean": round(float(np.mean(lat)), 3) if lat else None,
+                       "p50": _pct(lat, 50), "p95": _pct(lat, 95), "p99": _pct(lat, 99),
+                       "max": round(max(lat), 3) if lat else None},
+        "queries_per_request": {"mean": round(float(np.mean(queries)), 3) if queries else None,
+                                "max": max(queries) if queries else None},
+        "errors": sum(r[2] for r in results),
+        "status_codes": codes,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Flask API 엔드투엔드 벤치마크")
+    ap.add_argument("--database-url", default=None,
+                    help=f"기본: sqlite:///{DEFAULT_SQLITE} (공간 함수 대역 등록)")
+    ap.add_argument("--fresh", action="store_true", help="기본 SQLite 파일을 지우고 새로 채움")
+    ap.add_argument("--shelters", type=int, default=20_000, help="kind별 쉼터 수")
+    ap.add_argument("--users", type=int, default=1_000)
+    ap.add_argument("--reviews", type=int, default=50_000)
+    ap.add_argument("--favorites", type=int, default=20_000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--scenarios", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS))
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=1_000, help="시나리오별 측정 요청 수")
+    ap.add_argument("--warmup", type=int, default=20, help="스레드별 워밍업 요청 수 (측정 제외)")
+    ap.add_argument("--radius", type=int, default=1500)
+    ap.add_argument("--output", type=Path, help="결과 JSON 파일 (없으면 stdout)")
+    ap.add_argument("--log-errors", action="store_true", help="5xx 트레이스백을 그대로 출력 (기본은 개수만 집계)")
+    args = ap.parse_args(argv)
+
+    url = args.database_url or f"sqlite:///{DEFAULT_SQLITE}"
+    if args.fresh and args.database_url is None and DEFAULT_SQLITE.exists():
+        DEFAULT_SQLITE.unlink()
+    # config 는 import 시점에 DATABASE_URL 을 읽으므로 앱 모듈보다 먼저 설정
+    os.environ["DATABASE_URL"] = url
+
+    from sqlalchemy import create_engine
+    from . import seed
+
+    if url.startswith("sqlite"):
+        seed.install_sqlite_spatial()
+
+    vol = seed.Volumes(args.shelters, args.users, args.reviews, args.favorites)
+    t0 = time.perf_counter()
+    engine = create_engine(url)
+    max_ids = seed.seed_shelters(engine, vol.shelters, args.seed)
+    engine.dispose()
+
+    from ..app.app import create_app
+    from ..app.db import db
+    from ..app.utils.security import create_access_token
+
+    app = create_app()
+    app.logger.disabled = not args.log_errors
+    with app.app_context():
+        seeded = seed.seed_app_data(db.session, vol, max_ids, args.seed)
+        counter = QueryCounter()
+        counter.install(db.engine)
+    seed_seconds = time.perf_counter() - t0
+
+    user_ids = seeded["user_ids"]
+    tokens = [{"Authorization": f"Bearer {create_access_token(uid)}"} for uid in user_ids[:200]]
+    kinds = [k for k, n in max_ids.items() if n]
+    ctx = {
+        "kinds": kinds,
+        "radius": args.radius,
+        "point": lambda rng: (rng.uniform(*seed.LAT_RANGE), rng.uniform(*seed.LNG_RANGE)),
+        # 리뷰가 몰린 낮은 id 쪽을 더 자주 (seed_app_data 분포와 같게)
+        "shelter_id": lambda rng, kind: 1 + int((rng.random() ** 3) * max_ids[kind]),
+        "auth": lambda rng: rng.choice(tokens),
+    }
+
+    results = []
+    for name in args.scenarios:
+        r = run_scenario(app, name, SCENARIOS[name], ctx, counter, args.requests,
+                         args.concurrency, args.warmup, args.seed)
+        print(f"[{name}] {r['throughput_rps']} req/s  p50={r['latency_ms']['p50']}ms "
+              f"p95={r['latency_ms']['p95']}ms p99={r['latency_ms']['p99']}ms "
+              f"queries/req={r['queries_per_request']['mean']} errors={r['errors']}", file=sys.stderr)
+        results.append(r)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "dialect": url.split(":", 1)[0],
+            "volumes": seeded["volumes"],
+            "seed": args.seed,
+            "seed_seconds": round(seed_seconds, 2),
+            "config": {k: app.config.get(k) for k in ("SPATIAL_INDEX_ENABLED", "NEARBY_CACHE_ENABLED")},
+        },
+        "results": results,
+    }
+    out = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(out + "\n", encoding="utf-8")
+    else:
+        print(out)
+    return 0 if all(r["errors"] == 0 for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
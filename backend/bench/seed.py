@@ -0,0 +1,192 @@
+# backend/bench/seed.py
+# 벤치마크용 합성 데이터 적재 + SQLite 공간 함수 대역
+# - 쉼터 테이블은 ingest.ensure_table 로 운영과 같은 컬럼/자연키로 만든다
+# - users/reviews/favorites 는 create_app() 이 만든 모델 테이블에 넣는다 (created_at은 명시적으로)
+# - 같은 seed 값이면 같은 데이터 → 커밋 간 비교 가능
+
+import hashlib
+import json
+import math
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, event, func, insert, select
+from sqlalchemy.engine import Engine
+
+from ..app.db.ingest import SOURCES, ensure_table
+from ..app.models.shelters_map import KIND_TO_TABLE
+from ..app.utils.catalog import catalog_table, ensure_catalog_table, sync_kind
+from ..app.utils.upsert import insert_ignore_stmt
+
+# 서울 대략 범위 (nearby 요청 좌표도 여기서 뽑는다)
+LAT_RANGE = (37.45, 37.70)
+LNG_RANGE = (126.80, 127.15)
+REVIEW_KINDS = ("heat", "climate", "finedust", "smart")
+EARTH_RADIUS_M = 6_370_986.0
+
+
+@dataclass
+class Volumes:
+    shelters: int = 20_000   # kind별
+    users: int = 1_000
+    reviews: int = 50_000
+    favorites: int = 20_000  # 전체 (user, shelter) 쌍
+
+
+# ---- SQLite 공간 함수 대역 (repositories 의 SQL 이 그대로 돌도록) ----
+def _point(x, y):
+    return None if x is None or y is None else json.dumps([float(x), float(y)])
+
+
+def _distance_sphere(a, b):
+    if a is None or b is None:
+        return None
+    (x1, y1), (x2, y2) = json.loads(a), json.loads(b)
+    p1, p2 = math.radians(y1), math.radians(y2)
+    h = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(x2 - x1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(1.0, h)))
+
+
+def register_sqlite_spatial(dbapi_conn, _record=None):
+    dbapi_conn.create_function("Point", 2, _point, deterministic=True)
+    dbapi_conn.create_function("ST_SRID", 2, lambda p, srid: p, deterministic=True)
+    dbapi_conn.create_function("ST_Distance_Sphere", 2, _distance_sphere, deterministic=True)
+    dbapi_conn.create_function("md5", 1, lambda s: hashlib.md5(str(s).encode()).hexdigest(), deterministic=True)
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")  # 읽기/쓰기 동시 실행
+    cur.execute("PRAGMA busy_timeout=10000")
+    cur.close()
+
+
+def install_sqlite_spatial():
+    """이후 만들어지는 모든 sqlite 연결에 대역 함수 등록"""
+    @event.listens_for(Engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        if type(dbapi_conn).__module__.startswith("sqlite3"):
+            register_sqlite_spatial(dbapi_conn)
+
+
+# ---- 쉼터 ----
+def _rand_point(rng: random.Random):
+    return rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)
+
+
+def _shelter_row(kind: str, i: int, rng: random.Random) -> dict:
+    lat, lng = _rand_point(rng)
+    row = {"latitude": lat, "longitude": lng, "shelter_name": f"{kind} 쉼터 {i}",
+           "road_address": f"서울특별시 벤치구 {i}길 {rng.randint(1, 300)}"}
+    cols = SOURCES[kind].columns
+    for name in cols:
+        if name in row:
+            continue
+        if name == "capacity":
+            row[name] = rng.randint(10, 300)
+        elif name == "time":
+            row[name] = "09:00~18:00"
+        elif cols[name] is Float:
+            row[name] = None
+        else:
+            row[name] = f"{name}-{i % 50}"
+    return row
+
+
+def _ensure_smart(engine: Engine) -> Table:
+    md = MetaData()
+    t = Table(KIND_TO_TABLE["smart"], md,
+              Column("id", Integer, primary_key=True, autoincrement=True),
+              Column("facility_name", String(225)), Column("detailed_address", String(225)),
+              Column("latitude", Float), Column("longitude", Float))
+    md.create_all(engine)
+    return t
+
+
+def seed_shelters(engine: Engine, n: int, seed: int = 0, batch: int = 5000) -> dict[str, int]:
+    """kind별 n행. 이미 n행 이상 있으면 건너뛴다. {kind: 최대 id}"""
+    rng = random.Random(seed)
+    out = {}
+    for kind in REVIEW_KINDS:
+        t = _ensure_smart(engine) if kind == "smart" else ensure_table(engine, kind, SOURCES[kind])
+        with engine.begin() as conn:
+            have = conn.execute(select(func.count()).select_from(t)).scalar()
+            for start in range(have, n, batch):
+                if kind == "smart":
+                    rows = []
+                    for i in range(start, min(n, start + batch)):
+                        lat, lng = _rand_point(rng)
+                        rows.append({"facility_name": f"스마트쉼터 {i}", "detailed_address": f"벤치구 {i}",
+                                     "latitude": lat, "longitude": lng})
+                else:
+                    rows = [_shelter_row(kind, i, rng) for i in range(start, min(n, start + batch))]
+                conn.execute(insert(t), rows)
+            out[kind] = conn.execute(select(func.max(t.c.id))).scalar() or 0
+            total = conn.execute(select(func.count()).select_from(t)).scalar()
+        # 통합 카탈로그(shelters_all)도 원본과 행 수가 다르면 다시 동기화
+        ensure_catalog_table(engine)
+        with engine.connect() as conn:
+            synced = conn.execute(select(func.count()).select_from(catalog_table)
+                                  .where(catalog_table.c.kind == kind)).scalar()
+        if synced != total:
+            sync_kind(engine, kind, batch)
+    return out
+
+
+# ---- 사용자/리뷰/즐겨찾기 (app context 안에서) ----
+def seed_app_data(session, vol: Volumes, max_ids: dict[str, int], seed: int = 0, batch: int = 5000) -> dict:
+    from ..app.models.favorite import Favorite
+    from ..app.models.shelter_review import Accessibility, Comfort, HVACStatus, ShelterReview, ShelterType
+    from ..app.models.user import User
+    from ..app.utils.review_stats import rebuild
+
+    rng = random.Random(seed + 1)
+    users, reviews, favs = User.__table__, ShelterReview.__table__, Favorite.__table__
+    have = session.execute(select(func.count()).select_from(users)).scalar()
+    if have < vol.users:
+        session.execute(insert(users), [
+            {"email": f"bench{i}@example.com", "password": "bench", "age": 20 + i % 60, "health_type": i % 4}
+            for i in range(have, vol.users)
+        ])
+    user_ids = session.execute(select(users.c.id).order_by(users.c.id)).scalars().all()[:vol.users]
+    kinds = [k for k in REVIEW_KINDS if max_ids.get(k)]
+    base = datetime(2024, 1, 1)
+
+    have = session.execute(select(func.count()).select_from(reviews)).scalar()
+    for start in range(have, vol.reviews, batch):
+        rows = []
+        for i in range(start, min(vol.reviews, start + batch)):
+            kind = rng.choice(kinds)
+            ts = base + timedelta(seconds=i * 37)
+            rows.append({
+                "user_id": rng.choice(user_ids), "shelter_type": ShelterType(kind),
+                # 인기 쉼터에 리뷰가 몰리도록 낮은 id 쪽으로 치우치게
+                "shelter_id": 1 + int((rng.random() ** 3) * max_ids[kind]),
+                "rating": rng.choice([1, 2, 3, 3.5, 4, 4.5, 5]), "review_text": "bench",
+                "comfort": rng.choice(list(Comfort)), "accessibility_rating": rng.choice(list(Accessibility)),
+                "heating_cooling_status": rng.choice(list(HVACStatus)),
+                "created_at": ts, "updated_at": ts,
+            })
+        session.execute(insert(reviews), rows)
+    if vol.reviews:
+        rebuild(session)
+
+    fav_insert = insert_ignore_stmt(favs, session.get_bind().dialect.name)  # 재실행 시 기존 행과 겹쳐도 무시
+    have = session.execute(select(func.count()).select_from(favs)).scalar()
+    seen, rows = set(), []
+    for i in range(have, vol.favorites):
+        for _ in range(10):  # 유니크 (user, type, id) 충돌 시 몇 번 다시 뽑기
+            key = (rng.choice(user_ids), rng.choice(kinds))
+            key = key + (1 + rng.randrange(max_ids[key[1]]),)
+            if key not in seen:
+                break
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append({"user_id": key[0], "shelter_type": key[1], "shelter_id": key[2],
+                     "created_at": base + timedelta(seconds=i * 53)})
+        if len(rows) >= batch:
+            session.execute(fav_insert, rows)
+            rows = []
+    if rows:
+        session.execute(fav_insert, rows)
+    session.commit()
+    return {"user_ids": user_ids, "volumes": asdict(vol)}
@@ -0,0 +1,72 @@
+"""워커 준비 시간 측정: 새 파이썬 프로세스에서 import → create_app() → 첫 요청까지
+
+매 실행을 별도 프로세스로 돌려 콜드 스타트를 잰다 (모듈 캐시/커넥션 풀 재사용 없음).
+결과는 단계별 중앙값/최댓값 JSON.
+
+사용법 (repo 루트에서):
+    python -m backend.bench.startup                       # wsgi 모드 (create_all 없음)
+    python -m backend.bench.startup --mode dev --runs 10  # run.py 와 같은 개발 모드
+    python -m backend.bench.startup --database-url sqlite:////tmp/safeon_bench.db --path /shelters/detail/heat/1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from backend.app.app import create_app
+t1 = time.perf_counter()
+app = create_app(json.loads(sys.argv[1]))
+t2 = time.perf_counter()
+status = app.test_client().get(sys.argv[2]).status_code
+t3 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "create_app_s": t2 - t1, "first_request_s": t3 - t2,
+                  "ready_s": t2 - t0, "total_s": t3 - t0, "status": status}))
+"""
+
+
+def measure_once(overrides: dict, path: str, env: dict) -> dict:
+    out = subprocess.run([sys.executable, "-c", _CHILD, json.dumps(overrides), path],
+                         capture_output=True, text=True, cwd=REPO_ROOT, env=env, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="앱 콜드 스타트 시간 측정")
+    ap.add_argument("--mode", choices=["wsgi", "dev"], default="wsgi")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--path", default="/metrics", help="첫 요청 경로")
+    ap.add_argument("--database-url", default=None, help="없으면 현재 환경(DATABASE_URL/.env)")
+    ap.add_argument("--output", type=Path)
+    args = ap.parse_args(argv)
+
+    env = dict(os.environ)
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+    overrides = {"DB_CREATE_ALL": False} if args.mode == "wsgi" else {}
+
+    runs = [measure_once(overrides, args.path, env) for _ in range(args.runs)]
+    summary = {}
+    for key in ("import_s", "create_app_s", "first_request_s", "ready_s", "total_s"):
+        values = [r[key] for r in runs]
+        summary[key] = {"median": round(statistics.median(values), 4), "max": round(max(values), 4)}
+    report = {"mode": args.mode, "runs": args.runs, "path": args.path,
+              "status": sorted({r["status"] for r in runs}), "summary": summary}
+    out = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(out + "\n", encoding="utf-8")
+    else:
+        print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+# backend/tests/conftest.py
+# 공용 fixture: 임시 SQLite 파일에 합성 쉼터/사용자/리뷰를 채우고 create_app(overrides) 로 앱을 띄운다
+# (bench 와 같은 seed 와 공간 함수 대역 → repositories 의 SQL 이 그대로 돈다)
+
+import pytest
+from sqlalchemy import create_engine
+
+from backend.bench import seed
+
+SHELTERS_PER_KIND = 200
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('db') / 'safeon.db'}"
+    seed.install_sqlite_spatial()
+    engine = create_engine(url)
+    max_ids = seed.seed_shelters(engine, SHELTERS_PER_KIND)
+    engine.dispose()
+
+    from backend.app.app import create_app
+    from backend.app.db import db
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": url, "SQLALCHEMY_ENGINE_OPTIONS": {}, "TESTING": True})
+    with app.app_context():
+        seeded = seed.seed_app_data(db.session, seed.Volumes(SHELTERS_PER_KIND, 20, 300, 50), max_ids)
+    app.config["TEST_USER_IDS"] = seeded["user_ids"]
+    return app
+
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture()
+def auth(app):
+    from backend.app.utils.security import create_access_token
+    uid = app.config["TEST_USER_IDS"][0]
+    return {"Authorization": f"Bearer {create_access_token(uid)}"}
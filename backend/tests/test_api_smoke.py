@@ -0,0 +1,50 @@
+# create_app + SQLite 로 nearby / detail / favorites sync 를 끝까지 돌려보는 smoke test
+import pytest
+
+from backend.bench.seed import LAT_RANGE, LNG_RANGE
+
+CENTER = ((LAT_RANGE[0] + LAT_RANGE[1]) / 2, (LNG_RANGE[0] + LNG_RANGE[1]) / 2)
+
+
+def test_nearby_sorted_within_radius(client):
+    r = client.get(f"/shelters/nearby?lat={CENTER[0]}&lng={CENTER[1]}&radius=8000&kinds=heat,climate&limit=15")
+    assert r.status_code == 200
+    items = r.get_json()["items"]
+    assert 0 < len(items) <= 15
+    dist = [i["distance_m"] for i in items]
+    assert dist == sorted(dist) and dist[-1] <= 8000
+    assert {i["kind"] for i in items} <= {"heat", "climate"}
+
+
+def test_nearby_validation(client):
+    assert client.get("/shelters/nearby?lat=x&lng=127").status_code == 400
+
+
+def test_detail(client):
+    r = client.get("/shelters/detail/heat/1")
+    assert r.status_code == 200
+    body = r.get_json()
+    assert body["id"] == 1 and "shelter_name" in body
+    assert client.get("/shelters/detail/heat/99999999").status_code == 404
+    assert client.get("/shelters/detail/nope/1").status_code == 400
+
+
+def test_favorites_sync(client, auth):
+    items = [
+        {"op": "add", "shelter_type": "heat", "shelter_id": 11},
+        {"op": "add", "shelter_type": "climate", "shelter_id": "12"},
+        {"op": "add", "shelter_type": "heat", "shelter_id": True},
+        {"op": "add", "shelter_type": "heat", "shelter_id": 99999999},
+        {"op": "remove", "shelter_type": "climate", "shelter_id": 12},
+        {"op": "remove", "shelter_type": "finedust", "shelter_id": 13},
+    ]
+    r = client.post("/favorites/sync", json={"items": items}, headers=auth)
+    assert r.status_code == 200
+    statuses = [x["status"] for x in r.get_json()["results"]]
+    assert statuses == ["added", "superseded", "invalid", "not_found", "absent", "absent"]
+
+    r = client.post("/favorites/sync", json={"items": [{"op": "add", "shelter_type": "heat", "shelter_id": 11},
+                                                       {"op": "remove", "shelter_type": "heat", "shelter_id": 11}]},
+                    headers=auth)
+    assert [x["status"] for x in r.get_json()["results"]] == ["superseded", "removed"]
+    assert client.post("/favorites/sync", json={"items": items}).status_code == 401
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from backend.app.utils import batch_nearby
+from backend.app.utils.batch_nearby import densify, nearby_along_route
+from backend.app.utils.geo import haversine_m
+
+ROUTE = [(37.5000, 127.0000), (37.5000, 127.0200), (37.5150, 127.0200)]
+
+
+def _dist(a, b):
+    return float(haversine_m(a[0], a[1], np.array([b[0]]), np.array([b[1]]))[0])
+
+
+@pytest.mark.parametrize("step", [50, 200, 1000])
+def test_densify_keeps_vertices_and_spacing(step):
+    pts = densify(ROUTE, step)
+    assert pts[0] == ROUTE[0] and pts[-1] == ROUTE[-1]
+    for v in ROUTE:
+        assert v in pts
+    assert max(_dist(a, b) for a, b in zip(pts, pts[1:])) <= step + 1e-6
+
+
+def test_route_offset_orders_by_progress(monkeypatch):
+    shelters = [  # 경로 진행 순서: b(첫 구간 중간) → a(모서리 근처) → c(둘째 구간), d 는 통로 밖
+        {"id": "a", "kind": "heat", "latitude": 37.5003, "longitude": 127.0199},
+        {"id": "b", "kind": "heat", "latitude": 37.4998, "longitude": 127.0100},
+        {"id": "c", "kind": "climate", "latitude": 37.5100, "longitude": 127.0202},
+        {"id": "d", "kind": "heat", "latitude": 37.5100, "longitude": 127.0100},
+    ]
+    monkeypatch.setattr(batch_nearby, "get_nearby", lambda session, kinds, lat, lng, r, cap: list(shelters))
+    items, truncated = nearby_along_route(None, ["heat", "climate"], ROUTE, corridor_m=100, limit=10,
+                                          max_group_m=5000, candidate_cap=100)
+    assert not truncated
+    assert [i["id"] for i in items] == ["b", "a", "c"]
+    first_leg = _dist(ROUTE[0], ROUTE[1])
+    b, a, c = items
+    assert b["route_offset_m"] == pytest.approx(_dist(ROUTE[0], (37.5, 127.01)), rel=0.01)
+    assert a["route_offset_m"] == pytest.approx(first_leg, abs=40)
+    assert c["route_offset_m"] == pytest.approx(first_leg + _dist(ROUTE[1], (37.51, 127.02)), rel=0.01)
+    assert all(i["distance_m"] <= 100 for i in items)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from backend.app.utils.cluster_index import KindClusters
+
+PARAMS = dict(min_zoom=0, max_zoom=16, radius_px=60, extent=512, min_points=2)
+SEOUL = {"min_lat": 37.0, "max_lat": 38.0, "min_lng": 126.0, "max_lng": 128.0}
+
+
+def _points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 37.45 + rng.random(n) * 0.25, 126.8 + rng.random(n) * 0.35
+
+
+def _build(lats, lngs, hours=None):
+    n = len(lats)
+    return KindClusters("heat", list(range(n)), [f"s{i}" for i in range(n)], lats, lngs, hours=hours, **PARAMS)
+
+
+def _check_levels(kc, n):
+    for z, level in kc.levels.items():
+        assert level.count.sum() == n, z
+        assert np.array_equal(np.bincount(level.leaf_map, minlength=len(level)), level.count), z
+        single = level.leaf >= 0
+        assert np.all(level.count[single] == 1)
+        assert np.array_equal(level.leaf_map[level.leaf[single]], np.flatnonzero(single))
+        assert np.all(np.diff(level.x) >= 0)
+
+
+def test_levels_conserve_points_and_shrink_with_zoom():
+    lats, lngs = _points(2000)
+    kc = _build(lats, lngs)
+    _check_levels(kc, 2000)
+    sizes = [len(kc.levels[z]) for z in range(0, 18)]
+    assert sizes == sorted(sizes) and sizes[-1] == 2000 and sizes[0] < 10
+
+
+def test_query_max_zoom_returns_points_and_low_zoom_clusters():
+    lats, lngs = _points(500)
+    kc = _build(lats, lngs)
+    items, truncated = kc.query(SEOUL, 17, limit=10_000)
+    assert not truncated and len(items) == 500 and all(i["type"] == "point" for i in items)
+    items, _ = kc.query(SEOUL, 3, limit=10_000)
+    assert sum(i.get("count", 1) for i in items) == 500 and items[0]["type"] == "cluster"
+
+
+@pytest.mark.parametrize("zoom", [0, 8, 12, 14, 17])
+def test_incremental_add_keeps_totals(zoom):
+    lats, lngs = _points(1000, seed=1)
+    kc = _build(lats[:950], lngs[:950])
+    for i in range(950, 1000):
+        kc = kc.with_point(i, f"s{i}", lats[i], lngs[i])
+    _check_levels(kc, 1000)
+    full, _ = _build(lats, lngs).query(SEOUL, zoom, 10_000)
+    inc, _ = kc.query(SEOUL, zoom, 10_000)
+    assert sum(i.get("count", 1) for i in inc) == sum(i.get("count", 1) for i in full) == 1000
+
+
+def test_open_at_recounts_clusters():
+    lats, lngs = _points(300, seed=2)
+    hours = ["09:00~18:00" if i % 3 else "평일 22:00~23:00" for i in range(300)]
+    kc = _build(lats, lngs, hours)
+    items, _ = kc.query(SEOUL, 5, 10_000, open_at=(0, 600))
+    assert sum(i.get("count", 1) for i in items) == 200
@@ -0,0 +1,35 @@
+from backend.app.utils.dedup import find_duplicates, normalize
+
+
+def _pt(kind, id_, lat, lng, name, road_address=None):
+    return {"kind": kind, "id": id_, "latitude": lat, "longitude": lng, "name": name, "road_address": road_address}
+
+
+def test_normalize():
+    assert normalize("행당 한신(아) 경로당") == "행당한신아경로당"
+    assert normalize(None) == ""
+
+
+def test_groups_same_facility_across_kinds_with_priority_head():
+    points = [
+        _pt("climate", 7, 37.55000, 127.03000, "행당한신아경로당"),
+        _pt("heat", 3, 37.55005, 127.03004, "행당 한신(아) 경로당"),
+        _pt("finedust", 9, 37.55003, 127.03001, "전혀 다른 시설", "서울 성동구 행당로 1"),
+        _pt("smart", 1, 37.55002, 127.03002, "스마트쉼터", "서울 성동구 행당로 1"),
+        _pt("heat", 4, 37.60000, 127.10000, "행당한신아경로당"),  # 이름은 같지만 멀다
+    ]
+    rows = find_duplicates(points, radius_m=50, min_score=0.8)
+    groups = {}
+    for r in rows:
+        groups.setdefault((r["canonical_type"], r["canonical_id"]), set()).add((r["shelter_type"], r["shelter_id"]))
+    assert groups == {
+        ("heat", 3): {("heat", 3), ("climate", 7)},
+        ("finedust", 9): {("finedust", 9), ("smart", 1)},  # 이름이 달라도 도로명주소 일치
+    }
+    head = next(r for r in rows if (r["shelter_type"], r["shelter_id"]) == ("heat", 3))
+    assert head["score"] == 1.0 and head["distance_m"] == 0.0
+
+
+def test_same_kind_is_not_merged():
+    points = [_pt("heat", 1, 37.5, 127.0, "경로당"), _pt("heat", 2, 37.5, 127.0, "경로당")]
+    assert find_duplicates(points, radius_m=50, min_score=0.8) == []
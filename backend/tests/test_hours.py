@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from backend.app.utils.catalog import catalog_table
+from backend.app.utils.hours import WEEKDAYS, columns, is_open, open_clause, open_mask, parse
+
+NINE_TO_SIX = (540, 1080)
+
+
+@pytest.mark.parametrize("text, days, span", [
+    ("10:00~20:00", range(7), (600, 1200)),
+    ("평일 09:00~16:00", range(5), (540, 960)),
+    ("24시간", range(7), (0, 1440)),
+    ("22:00~06:00", range(7), (1320, 1800)),  # 자정 넘김 → close 1440 이상
+    ("09:00~18:00(토요일 휴무)", (0, 1, 2, 3, 4, 6), NINE_TO_SIX),
+    ("매주 월요일 휴관 09:00~18:00", range(1, 7), NINE_TO_SIX),
+    ("평일 09:00~18:00, 주말 및 공휴일 휴무", range(5), NINE_TO_SIX),
+    ("09:00~18:00 점심시간 제외", range(7), NINE_TO_SIX),
+])
+def test_parse(text, days, span):
+    assert parse(text) == {d: span for d in days}
+
+
+@pytest.mark.parametrize("text", [None, "", "   ", "문의 바람", "토·일 휴무"])
+def test_parse_unknown(text):
+    assert parse(text) is None
+    assert columns(text)["hours_unknown"] is True
+
+
+HOURS = ["10:00~20:00", "평일 09:00~16:00", "22:00~06:00", "09:00~18:00(토요일 휴무)", "24시간", None, "토 10:00~14:00"]
+PROBES = [(d, m) for d in range(7) for m in (0, 300, 599, 600, 959, 960, 1199, 1380)]
+
+
+def _arrays(rows):
+    opens = np.array([[r[f"{w}_open"] if r[f"{w}_open"] is not None else -1 for w in WEEKDAYS] for r in rows])
+    closes = np.array([[r[f"{w}_close"] if r[f"{w}_close"] is not None else -1 for w in WEEKDAYS] for r in rows])
+    return opens, closes, np.array([r["hours_unknown"] for r in rows])
+
+
+@pytest.mark.parametrize("include_unknown", [False, True])
+def test_open_mask_matches_sql_clause(include_unknown):
+    engine = create_engine("sqlite://")
+    catalog_table.create(engine)
+    rows = [{"kind": "extra", "source_id": i, "latitude": 37.5, "longitude": 127.0, "props": "{}",
+             "hours": text, **columns(text)} for i, text in enumerate(HOURS)]
+    with engine.begin() as conn:
+        conn.execute(insert(catalog_table), rows)
+    opens, closes, unknown = _arrays(rows)
+    t = catalog_table
+    with engine.connect() as conn:
+        for day, minute in PROBES:
+            sql = set(conn.execute(select(t.c.source_id).where(open_clause(t, day, minute, include_unknown)))
+                      .scalars())
+            mask = set(np.flatnonzero(open_mask(opens, closes, unknown, day, minute, include_unknown)).tolist())
+            py = {i for i, text in enumerate(HOURS) if is_open(text, day, minute, include_unknown)}
+            assert sql == mask == py, (day, minute)
+
+
+def test_overnight_range_counts_for_next_morning():
+    assert is_open("22:00~06:00", day=1, minute=300)  # 화요일 05:00 ← 월요일 22:00~06:00
+    assert not is_open("평일 22:00~06:00", day=5, minute=700)
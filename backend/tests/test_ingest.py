@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import create_engine
+
+from backend.app.db.ingest import SOURCES, NaturalKeyConflict, ensure_table, natural_key_conflicts
+
+
+@pytest.fixture()
+def legacy(tmp_path):
+    """자연키 유니크 인덱스 없이 만들어진 기존 heat 테이블 (중복 2묶음 + NULL 키 1행)"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE shelters_heat (id INTEGER PRIMARY KEY, shelter_name VARCHAR(225), "
+                             "road_address VARCHAR(225), capacity INTEGER)")
+        conn.exec_driver_sql("INSERT INTO shelters_heat (id, shelter_name, road_address) VALUES "
+                             "(1, 'a', 'x'), (2, 'b', 'y'), (3, 'a', 'x'), (4, 'c', NULL), (5, 'c', ''), (6, 'a', 'x')")
+    return engine
+
+
+def _count(engine):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("SELECT COUNT(*) FROM shelters_heat").scalar()
+
+
+def test_conflicts_list_ids(legacy):
+    c = natural_key_conflicts(legacy, "shelters_heat", SOURCES["heat"].natural_key)
+    assert c == {"groups": [{"key": ["a", "x"], "ids": [1, 3, 6]}, {"key": ["c", ""], "ids": [4, 5]}],
+                 "null_rows": 1}
+
+
+def test_refuses_without_opt_in(legacy):
+    with pytest.raises(NaturalKeyConflict):
+        ensure_table(legacy, "heat", SOURCES["heat"])
+    assert _count(legacy) == 6
+
+
+def test_dedupe_existing(legacy):
+    ensure_table(legacy, "heat", SOURCES["heat"], dedupe_existing=True)
+    with legacy.connect() as conn:
+        rows = conn.exec_driver_sql("SELECT id, road_address FROM shelters_heat ORDER BY id").all()
+    assert rows == [(1, "x"), (2, "y"), (4, "")]
+    assert natural_key_conflicts(legacy, "shelters_heat", SOURCES["heat"].natural_key)["groups"] == []
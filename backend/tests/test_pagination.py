@@ -0,0 +1,21 @@
+from datetime import datetime
+
+import pytest
+
+from backend.app.utils.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize("created_at, id_", [
+    (datetime(2026, 7, 1, 14, 30, 5), 1),
+    (datetime(2026, 7, 1, 14, 30, 5, 123456), 987654321),
+])
+def test_cursor_round_trip(created_at, id_):
+    cursor = encode_cursor(created_at, id_)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, id_)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(datetime(2026, 1, 1), 1)[:-3] + "!!!"])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
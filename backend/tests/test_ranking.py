@@ -0,0 +1,62 @@
+import pytest
+
+from backend.app.utils import ranking
+from backend.app.utils.ranking import (DEFAULT_PROFILE, FEATURES, HEALTH_PROFILES, Ranker, parse_weights,
+                                       profile_for)
+
+
+def test_parse_weights():
+    w = parse_weights("distance=0.6, rating=0.4")
+    assert set(w) == set(FEATURES)
+    assert w["distance"] == 0.6 and w["rating"] == 0.4 and w["capacity"] == 0.0
+    assert parse_weights("") == dict.fromkeys(FEATURES, 0.0)
+    with pytest.raises(ValueError):
+        parse_weights("speed=1")
+    with pytest.raises(ValueError):
+        parse_weights("distance")
+
+
+def test_profile_for():
+    assert profile_for(2) is HEALTH_PROFILES[2]
+    assert profile_for(None) is DEFAULT_PROFILE
+    assert profile_for(None, age=70) is HEALTH_PROFILES[5]
+    assert profile_for(9, age=85) is HEALTH_PROFILES[6]
+    assert profile_for(3, age=85) is HEALTH_PROFILES[3]  # 유형이 있으면 나이보다 우선
+    for bad in (0, 10, 42, -1):
+        with pytest.raises(ValueError):
+            profile_for(bad)
+
+
+@pytest.mark.parametrize("health_type, status", [(42, 400), (0, 400), (3, 200)])
+def test_nearby_health_type_range(client, health_type, status):
+    r = client.get(f"/shelters/nearby?lat=37.5&lng=127&kinds=heat&rank=1&health_type={health_type}")
+    assert r.status_code == status
+
+
+def _item(id_, kind, distance_m):
+    return {"id": str(id_), "kind": kind, "distance_m": distance_m, "props": None}
+
+
+@pytest.fixture()
+def no_reviews(monkeypatch):
+    monkeypatch.setattr(ranking, "ratings_for", lambda session, keys: {})
+
+
+def test_rank_orders_by_weighted_score(no_reviews):
+    r = Ranker()
+    r.weights = parse_weights("distance=1")
+    items = [_item(1, "heat", 900), _item(2, "heat", 100), _item(3, "heat", 500)]
+    out = r.rank(None, items, HEALTH_PROFILES[9], k=2, explain=True)
+    assert [i["id"] for i in out] == ["2", "3"]
+    for it in out:
+        assert it["score"] == pytest.approx(sum(it["score_breakdown"].values()), abs=1e-3)
+        assert it["score_breakdown"]["distance"] == pytest.approx(1 - it["distance_m"] / 3000, abs=1e-4)
+
+
+def test_rank_kind_preference_follows_profile(no_reviews):
+    r = Ranker()
+    r.weights = parse_weights("distance=0.1,kind=0.9")
+    items = [_item(1, "heat", 100), _item(2, "finedust", 300)]
+    assert r.rank(None, items, HEALTH_PROFILES[1], k=1)[0]["kind"] == "finedust"  # 호흡기 → 미세먼지 쉼터
+    assert r.rank(None, items, HEALTH_PROFILES[5], k=1)[0]["kind"] == "heat"      # 고령 → 무더위 쉼터
+    assert r.rank(None, [], HEALTH_PROFILES[5], k=3) == []
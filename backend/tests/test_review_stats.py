@@ -0,0 +1,57 @@
+import random
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from backend.app.db import db
+from backend.app.models.shelter_review import Accessibility, Comfort, HVACStatus, ShelterReview, ShelterType
+from backend.app.utils.review_stats import _stats, apply_reviews, deltas, ratings_for, rebuild
+
+
+def _snapshot():
+    return {tuple(r[:2]): tuple(r[2:]) for r in db.session.execute(select(_stats).order_by(*_stats.primary_key))}
+
+
+def test_deltas_groups_by_shelter():
+    rows = deltas([
+        {"shelter_type": "heat", "shelter_id": 1, "rating": 4.5, "comfort": Comfort.easy,
+         "accessibility_rating": None, "heating_cooling_status": HVACStatus.on},
+        {"shelter_type": ShelterType.heat, "shelter_id": "1", "rating": 3, "comfort": Comfort.crowded,
+         "accessibility_rating": Accessibility.low, "heating_cooling_status": None},
+    ])
+    assert len(rows) == 1
+    r = rows[0]
+    assert (r["review_count"], r["rating_sum"]) == (2, Decimal("7.5"))
+    assert (r["comfort_easy"], r["comfort_crowded"], r["access_low"], r["hvac_on"]) == (1, 1, 1, 1)
+
+
+def test_increment_matches_rebuild(app):
+    rng = random.Random(8)
+    with app.app_context():
+        rebuild(db.session)
+        db.session.commit()
+        for _ in range(5):  # 리뷰 작성 경로와 같이: 리뷰 insert + 같은 트랜잭션에서 증분
+            batch = [ShelterReview(
+                shelter_type=rng.choice(list(ShelterType)), shelter_id=rng.randint(1, 5),
+                user_id=rng.randint(1, 20), rating=Decimal(str(rng.choice([1, 2.5, 3, 4.5, 5]))),
+                comfort=rng.choice([None, *Comfort]), accessibility_rating=rng.choice([None, *Accessibility]),
+                heating_cooling_status=rng.choice([None, *HVACStatus]),
+            ) for _ in range(rng.randint(1, 30))]
+            db.session.add_all(batch)
+            apply_reviews(db.session, batch)
+            db.session.commit()
+        incremental = _snapshot()
+        rebuild(db.session)
+        db.session.commit()
+        assert _snapshot() == incremental
+
+
+def test_average_is_not_truncated(app):
+    with app.app_context():
+        batch = [ShelterReview(shelter_type=ShelterType.heat, shelter_id=9001, user_id=1, rating=Decimal(r))
+                 for r in ("4", "5")]
+        db.session.add_all(batch)
+        apply_reviews(db.session, batch)
+        db.session.commit()
+        stats = ratings_for(db.session, [("heat", 9001)])[("heat", 9001)]
+        assert (stats["count"], stats["rating_sum"], stats["average"]) == (2, 9.0, 4.5)
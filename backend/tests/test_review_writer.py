@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.app.db import db
+from backend.app.models.shelter_review import ShelterReview, ShelterType
+from backend.app.utils.review_writer import ReviewWriter
+
+
+def _row(i, **kw):
+    return dict(shelter_type=ShelterType.climate, shelter_id=1 + i % 3, user_id=1, rating=Decimal("4.0"),
+                review_text=f"writer {i}", **kw)
+
+
+@pytest.fixture()
+def writer(app):
+    w = ReviewWriter()
+    w.enabled, w._app = True, app
+    w.batch_size, w.flush_s = 10, 0.05
+    yield w
+    w.close()
+
+
+def _count(app, text_like):
+    with app.app_context():
+        return db.session.execute(select(func.count()).select_from(ShelterReview)
+                                  .where(ShelterReview.review_text.like(text_like))).scalar()
+
+
+def test_batches_rows_and_returns_ids(app, writer):
+    futures = [writer.submit(_row(i)) for i in range(25)]
+    saved = [f.result(timeout=10) for f in futures]
+    ids = [s["id"] for s in saved]
+    assert None not in ids and len(set(ids)) == 25
+    assert [s["review_text"] for s in saved] == [f"writer {i}" for i in range(25)]
+    assert writer.rows == 25 and writer.batches < 25  # 한 행씩이 아니라 묶어서
+    assert _count(app, "writer %") == 25
+
+
+def test_bad_row_fails_alone(app, writer):
+    futures = [writer.submit(_row(i, review_name=f"batch-{i}")) for i in range(4)]
+    futures.append(writer.submit(dict(_row(99), review_text="bad row", rating=None)))  # NOT NULL 위반
+    assert [f.result(timeout=10)["id"] is not None for f in futures[:4]] == [True] * 4
+    with pytest.raises(Exception):
+        futures[-1].result(timeout=10)
+    assert writer.failed == 1
+    assert _count(app, "bad row") == 0
+
+
+def test_full_queue_and_disabled_fall_back_to_sync_path(writer):
+    writer.queue_max = 0
+    assert writer.submit(_row(0)) is None and writer.fallbacks == 1
+    writer.queue_max, writer.enabled = 10, False
+    assert writer.submit(_row(0)) is None
@@ -0,0 +1,59 @@
+import pytest
+from flask import Flask, g
+from sqlalchemy import create_engine, event, text
+
+from backend.app.db import routing
+
+
+@pytest.fixture()
+def engine():
+    e = create_engine("sqlite://")
+    event.listen(e, "before_cursor_execute", routing._on_statement)
+    event.listen(e, "commit", routing._on_commit)
+    with e.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+    return e
+
+
+@pytest.mark.parametrize("sql, wrote", [
+    ("SELECT x FROM t", False),
+    ("  select 1", False),
+    ("INSERT INTO t VALUES (1)", True),
+    ("UPDATE t SET x = 2", True),
+    ("DELETE FROM t", True),
+])
+@pytest.mark.parametrize("driver_sql", [False, True])
+def test_non_select_statement_marks_write(engine, sql, wrote, driver_sql):
+    with Flask(__name__).test_request_context():
+        with engine.connect() as conn:  # 커밋 없이 닫힘 (롤백)
+            conn.exec_driver_sql(sql) if driver_sql else conn.execute(text(sql))
+        assert g.get("_db_wrote", False) is wrote
+
+
+def test_commit_marks_write(engine):
+    with Flask(__name__).test_request_context():
+        with engine.begin() as conn:
+            conn.exec_driver_sql("SELECT 1")
+        assert g.get("_db_wrote") is True
+
+
+def test_redis_writers_shared_between_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    a = routing.RedisWriters(fakeredis.FakeRedis(server=server), ttl=5)
+    b = routing.RedisWriters(fakeredis.FakeRedis(server=server), ttl=5)
+    a.mark(7)
+    assert b.recent(7) and not b.recent(8)
+
+
+def test_sticky_lookup_failure_reads_primary(monkeypatch):
+    class Down:
+        def recent(self, uid):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(routing, "_writers", Down())
+    monkeypatch.setattr(routing, "_replica_enabled", True)
+    monkeypatch.setattr(routing, "_request_user_id", lambda: 1)
+    view = routing.read_replica(lambda: g.get("_db_route"))
+    with Flask(__name__).test_request_context():
+        assert view() is None
@@ -0,0 +1,8 @@
+# backend/wsgi.py
+# 운영 WSGI 진입점: gunicorn "backend.wsgi:app"
+# - 앱은 워커마다 여기서 한 번만 만든다 (backend.app.app 은 import 시 앱을 만들지 않음)
+# - 시작 시 DDL(create_all) 없음 → 스키마는 배포 단계에서 `python -m backend.app.db.create_schema`
+# - DB 연결은 첫 요청 때 맺는다 (DB가 잠깐 안 돼도 워커는 뜬다)
+from .app.app import create_app
+
+app = create_app({"DB_CREATE_ALL": False})